@@ -1,6 +1,8 @@
 # ruff: noqa: SLF001
+import json
 import re
-from fnmatch import fnmatch
+from copy import deepcopy
+from fnmatch import translate
 from functools import lru_cache
 from typing import NamedTuple
 
@@ -19,18 +21,6 @@ def instance_finder(v):
     )
 
 
-def seperate_hashable_dict(d: dict):
-    non_hashable = {k: v for k, v in d.items() if instance_finder(v)}
-    hashable = {k: v for k, v in d.items() if k not in non_hashable}
-    return hashable, non_hashable
-
-
-def get_or_create_meta(instance):
-    if not hasattr(instance._meta, "dal"):
-        instance._meta.dal = MetaDataContainer()
-    return instance
-
-
 def get_model_name(instance):
     return f"{instance._meta.app_label}.{instance.__class__.__name__}"
 
@@ -47,6 +37,35 @@ def _make_search(item):
     return Search(type="plain", value=splits[0])
 
 
+class ScopeMatcher:
+    """
+    Matches candidate strings against a scope of plain, glob and regex search
+    strings, compiled once instead of being parsed for every candidate.
+    """
+
+    def __init__(self, scope: list):
+        self.plain = set()
+        globs, regexes = [], []
+        for item in scope:
+            search = _make_search(item)
+            if search.type == "plain":
+                self.plain.add(search.value.lower())
+            elif search.type == "glob":
+                globs.append(translate(search.value.lower()))
+            elif search.type == "regex":
+                regexes.append(f"(?:{search.value})")
+        self.glob = re.compile("|".join(globs)) if globs else None
+        self.regex = re.compile("|".join(regexes), re.IGNORECASE) if regexes else None
+
+    def matches(self, candidate: str) -> bool:
+        lowered = candidate.lower()
+        return (
+            lowered in self.plain
+            or bool(self.glob and self.glob.match(lowered))
+            or bool(self.regex and self.regex.match(candidate))
+        )
+
+
 def candidate_in_scope(
     candidate: str, scope: list, is_application: bool = False
 ) -> bool:
@@ -59,51 +78,119 @@ def candidate_in_scope(
     :param scope: List of Search
     :return: valid?
     """
-    search_candidate = candidate
     if is_application:
         splits = candidate.split(".")
         if len(splits) == 2:  # noqa: PLR2004
-            app_label, model_name = splits
-            search_candidate = app_label
+            candidate = splits[0]
+    return ScopeMatcher(scope).matches(candidate)
 
-    for item in scope:
-        match = False
-        search = _make_search(item)
-        if search.type == "glob":
-            match = fnmatch(search_candidate.lower(), search.value.lower())
-        if search.type == "plain":
-            match = search_candidate.lower() == search.value.lower()
-        if search.type == "regex":
-            match = bool(re.match(search.value, search_candidate, re.IGNORECASE))
 
-        if match:
-            return True
-
-    return False
+@lru_cache
+def get_exclude_matchers() -> tuple[ScopeMatcher, ScopeMatcher]:
+    """
+    Returns the matchers of the excluded applications and models, compiled
+    from the settings on first use.
+    """
+    return (
+        ScopeMatcher(settings.AUDIT_LOG["globals"]["exclude"]["applications"]),
+        ScopeMatcher(settings.AUDIT_LOG["models"]["exclude"]["models"]),
+    )
 
 
 @lru_cache
 def exclude_model(model_name):
-    if candidate_in_scope(
-        model_name,
-        settings.AUDIT_LOG["globals"]["exclude"]["applications"],
-        is_application=True,
-    ):
-        return True
-
-    return bool(
-        candidate_in_scope(
-            model_name, settings.AUDIT_LOG["models"]["exclude"]["models"]
-        )
+    applications, models = get_exclude_matchers()
+    app_label = model_name.split(".")[0] if model_name.count(".") == 1 else model_name
+    return applications.matches(app_label) or models.matches(model_name)
+
+
+@lru_cache
+def get_tracked_fields(model) -> tuple[str, ...]:
+    return tuple(field.attname for field in model._meta.concrete_fields)
+
+
+def copy_values(values: dict) -> dict:
+    return {
+        name: deepcopy(value) if instance_finder(value) else value
+        for name, value in values.items()
+    }
+
+
+def get_values(instance) -> dict:
+    """
+    Returns the values of the fields of the instance that are loaded, copied
+    so that later changes do not alter them.
+    """
+    values = instance.__dict__
+    return copy_values(
+        {
+            name: values[name]
+            for name in get_tracked_fields(type(instance))
+            if name in values
+        }
     )
 
 
-class MetaDataContainer(dict):
-    def __getattr__(self, item):
-        return self[item]
+class Digest(NamedTuple):
+    value: str
+
+
+def _encode(value):
+    if isinstance(value, set):
+        return sorted(value, key=repr)
+    return str(value)
 
-    def __setattr__(self, key, value):
-        self[key] = value
+
+def get_digest(value):
+    """
+    Returns a digest of a mutable value that is equal for equal values,
+    serializing it being much cheaper than copying it. The values that cannot
+    be serialized are copied instead.
+    """
+    try:
+        return Digest(json.dumps(value, sort_keys=True, default=_encode))
+    except (TypeError, ValueError):
+        return deepcopy(value)
+
+
+def take_snapshot(instance) -> dict:
+    """
+    Returns what the loaded fields of the instance are compared against on
+    save: the immutable values themselves and a digest of the mutable ones,
+    as most of the instances loaded are never saved.
+    """
+    values = instance.__dict__
+    return {
+        name: get_digest(values[name])
+        if instance_finder(values[name])
+        else values[name]
+        for name in get_tracked_fields(type(instance))
+        if name in values
+    }
+
+
+def get_snapshot_changes(snapshot: dict, instance, fields=None) -> dict:
+    """
+    Returns the fields of the instance, among `fields` when given, that have
+    changed since the snapshot was taken.
+    """
+    values = instance.__dict__
+    changes = {}
+    for name in fields or get_tracked_fields(type(instance)):
+        if name not in values:
+            continue
+        value = values[name]
+        if name not in snapshot:
+            changes[name] = value
+            continue
+        previous = snapshot[name]
+        if isinstance(previous, Digest):
+            changed = not instance_finder(value) or get_digest(value) != previous
+        else:
+            changed = previous != value
+        if changed:
+            changes[name] = value
+    return changes
 
 
 class LogJsonEncoder(JSONEncoder):
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:06
+
+from django.db import migrations, models
+
+import care.audit_log.helpers
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditLogEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_date", models.DateTimeField(db_index=True)),
+                ("request_id", models.CharField(max_length=255)),
+                ("actor_id", models.BigIntegerField(null=True)),
+                ("actor", models.CharField(max_length=255, null=True)),
+                (
+                    "operation",
+                    models.CharField(
+                        choices=[
+                            ("insert", "insert"),
+                            ("update", "update"),
+                            ("delete", "delete"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("model", models.CharField(max_length=255)),
+                ("entity_id", models.CharField(max_length=255)),
+                (
+                    "changes",
+                    models.JSONField(
+                        default=dict, encoder=care.audit_log.helpers.LogJsonEncoder
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["model", "entity_id"],
+                        name="audit_log_a_model_0a933c_idx",
+                    )
+                ],
+            },
+        ),
+    ]
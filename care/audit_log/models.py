@@ -0,0 +1,27 @@
+from django.db import models
+
+from care.audit_log.enums import DjangoOperations
+from care.audit_log.helpers import LogJsonEncoder
+
+
+class AuditLogEntry(models.Model):
+    """
+    Append only table of the audit log, written in batches by the
+    DatabaseSink. The actor is not a foreign key so that entries outlive the
+    users and never block their deletion.
+    """
+
+    created_date = models.DateTimeField(db_index=True)
+    request_id = models.CharField(max_length=255)
+    actor_id = models.BigIntegerField(null=True)
+    actor = models.CharField(max_length=255, null=True)
+    operation = models.CharField(max_length=10, choices=DjangoOperations)
+    model = models.CharField(max_length=255)
+    entity_id = models.CharField(max_length=255)
+    changes = models.JSONField(default=dict, encoder=LogJsonEncoder)
+
+    class Meta:
+        indexes = [models.Index(fields=["model", "entity_id"])]
+
+    def __str__(self) -> str:
+        return f"{self.operation} {self.model} {self.entity_id}"
@@ -1,25 +1,24 @@
 # ruff: noqa: SLF001
-import json
 import logging
 from typing import NamedTuple
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
-from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 from care.audit_log.enums import Operation
 from care.audit_log.helpers import (
-    LogJsonEncoder,
+    copy_values,
     exclude_model,
     get_model_name,
-    get_or_create_meta,
-    remove_non_member_fields,
-    seperate_hashable_dict,
+    get_snapshot_changes,
+    get_values,
+    take_snapshot,
 )
 from care.audit_log.middleware import AuditLogMiddleware
+from care.audit_log.sinks import AuditRecord, audit_queue
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +30,24 @@ class Event(NamedTuple):
     changes: dict
 
 
-@receiver(pre_delete, weak=False)
+def is_audited(instance) -> bool:
+    return (
+        settings.AUDIT_LOG_ENABLED
+        and AuditLogMiddleware.is_request()
+        and not exclude_model(get_model_name(instance))
+    )
+
+
+@receiver(post_init, weak=False)
+def post_init_signal(sender, instance, **kwargs) -> None:
+    # the fields are compared against the values loaded, on save, the mutable
+    # ones by a digest as most of the instances loaded are never saved
+    if is_audited(instance):
+        instance._audit_log_snapshot = take_snapshot(instance)
+
+
 @receiver(pre_save, weak=False)
-@transaction.atomic
-def pre_save_signal(sender, instance, **kwargs) -> None:
+def pre_save_signal(sender, instance, update_fields=None, **kwargs) -> None:
     if not settings.AUDIT_LOG_ENABLED:
         return
 
@@ -47,41 +60,20 @@ def pre_save_signal(sender, instance, **kwargs) -> None:
         logger.debug("%s ignored as per settings", model_name)
         return
 
-    get_or_create_meta(instance)
-    instance._meta.dal.event = None
-
-    operation = Operation.UPDATE
-    try:
-        pre = sender.objects.get(pk=instance.pk)
-    except ObjectDoesNotExist:
-        # __dict__ is used on pre, therefore we need to create a function
-        # that uses __dict__ too, but returns nothing.
-
-        pre = lambda _: None  # noqa: E731
-        operation = Operation.INSERT
+    instance._audit_log_event = None
 
     changes = {}
-
-    if operation not in {Operation.INSERT, Operation.DELETE}:
-        old, new = (
-            remove_non_member_fields(pre.__dict__),
-            remove_non_member_fields(instance.__dict__),
-        )
-
-        try:
-            changes = dict(set(new.items()).difference(old.items()))
-        except TypeError:  # handle non-hashable types
-            old_hashable, old_non_hashable = seperate_hashable_dict(old)
-            new_hashable, new_non_hashable = seperate_hashable_dict(new)
-
-            changes = dict(set(new_hashable.items()).difference(old_hashable.items()))
-            changes.update(
-                {
-                    k: v
-                    for k, v in new_non_hashable.items()
-                    if v != old_non_hashable.get(k)
-                }
+    if not instance._state.adding:
+        snapshot = getattr(instance, "_audit_log_snapshot", None)
+        if snapshot is None:
+            # loaded before auditing applied to it, compared to the database
+            snapshot = take_snapshot(
+                sender._base_manager.filter(pk=instance.pk).first() or sender()
             )
+        fields = update_fields and {
+            sender._meta.get_field(name).attname for name in update_fields
+        }
+        changes = get_snapshot_changes(snapshot, instance, fields)
 
         excluded_fields = settings.AUDIT_LOG["models"]["exclude"]["fields"].get(
             model_name, []
@@ -96,7 +88,7 @@ def pre_save_signal(sender, instance, **kwargs) -> None:
 
     current_user = AuditLogMiddleware.get_current_user()
 
-    instance._meta.dal.event = Event(
+    instance._audit_log_event = Event(
         model=model_name,
         actor=current_user,
         entity_id=instance.pk,
@@ -105,33 +97,28 @@ def pre_save_signal(sender, instance, **kwargs) -> None:
 
 
 def _post_processor(instance, event: Event | None, operation: Operation):
-    request_id = AuditLogMiddleware.get_current_request_id()
-    actor = AuditLogMiddleware.get_current_user()
-    model_name = get_model_name(instance)
-
     if not event and operation != Operation.DELETE:
         logger.debug("Event not received for %s. Ignoring.", operation)
         return
 
-    try:
-        if operation == Operation.DELETE:
-            changes = instance.__dict__
-            if "_state" in changes:
-                del changes["_state"]
-        else:
-            changes = json.dumps(event.changes if event else {}, cls=LogJsonEncoder)
-    except Exception:
-        logger.warning("Failed to log %s", event, exc_info=True)
-        return
+    # the values are copied, the records being serialized by the sink later
+    if operation == Operation.DELETE:
+        changes = get_values(instance)
+    else:
+        changes = copy_values(event.changes)
 
-    logger.info(
-        "AUDIT_LOG::%s|%s|%s|%s|ID:%s|%s",
-        request_id,
-        actor,
-        operation.value,
-        model_name,
-        instance.pk,
-        changes,
+    actor = AuditLogMiddleware.get_current_user()
+    audit_queue.put(
+        AuditRecord(
+            created_date=timezone.now(),
+            request_id=AuditLogMiddleware.get_current_request_id(),
+            actor_id=getattr(actor, "id", None),
+            actor=str(actor) if actor else None,
+            operation=operation,
+            model=get_model_name(instance),
+            entity_id=instance.pk,
+            changes=changes,
+        )
     )
 
 
@@ -150,11 +137,20 @@ def post_save_signal(sender, instance, created, update_fields: frozenset, **kwar
         return
 
     operation = Operation.INSERT if created else Operation.UPDATE
-    get_or_create_meta(instance)
-
-    event = instance._meta.dal.event
+    event = getattr(instance, "_audit_log_event", None)
     _post_processor(instance, event, operation)
 
+    # the values saved are the ones the next save is compared against
+    snapshot = getattr(instance, "_audit_log_snapshot", None)
+    if snapshot is None or update_fields is None:
+        instance._audit_log_snapshot = take_snapshot(instance)
+    else:
+        saved = take_snapshot(instance)
+        for name in update_fields:
+            attname = sender._meta.get_field(name).attname
+            if attname in saved:
+                snapshot[attname] = saved[attname]
+
 
 @receiver(post_delete, weak=False)
 def post_delete_signal(sender, instance, **kwargs) -> None:
@@ -170,5 +166,4 @@ def post_delete_signal(sender, instance, **kwargs) -> None:
         logger.debug("Ignoring %s.", model_name)
         return
 
-    event = instance._meta.dal.event
-    _post_processor(instance, event, Operation.DELETE)
+    _post_processor(instance, None, Operation.DELETE)
@@ -0,0 +1,266 @@
+import atexit
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from care.audit_log.enums import Operation
+from care.audit_log.helpers import LogJsonEncoder
+from care.utils.instrumentation import (
+    MetricFamily,
+    register_collector,
+    register_family,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditRecord:
+    created_date: datetime
+    request_id: str
+    actor_id: int | None
+    actor: str | None
+    operation: Operation
+    model: str
+    entity_id: int | str
+    changes: dict
+
+
+class AuditSink:
+    """
+    Destination of the audit records, written in batches from the thread
+    flushing the audit queue.
+    """
+
+    def write(self, records: list[AuditRecord]):
+        raise NotImplementedError
+
+
+def format_record(record: AuditRecord) -> str:
+    if record.operation == Operation.DELETE:
+        changes = str(record.changes)
+    else:
+        changes = json.dumps(record.changes, cls=LogJsonEncoder)
+    return (
+        f"AUDIT_LOG::{record.request_id}|{record.actor}|{record.operation.value}|"
+        f"{record.model}|ID:{record.entity_id}|{changes}"
+    )
+
+
+class LoggerSink(AuditSink):
+    """
+    Logs every record on a line of its own, to the handlers of the logging
+    configuration.
+    """
+
+    def write(self, records):
+        for record in records:
+            logger.info("%s", format_record(record))
+
+
+class FileSink(AuditSink):
+    """
+    Appends the records to the file at AUDIT_LOG_FILE, one line per record.
+    """
+
+    def write(self, records):
+        with open(settings.AUDIT_LOG_FILE, "a", encoding="utf-8") as file:  # noqa: PTH123
+            file.writelines(f"{format_record(record)}\n" for record in records)
+
+
+class DatabaseSink(AuditSink):
+    """
+    Inserts the records of a batch into the append only AuditLogEntry table
+    with a single query.
+    """
+
+    def write(self, records):
+        from care.audit_log.models import AuditLogEntry
+
+        AuditLogEntry.objects.bulk_create(
+            AuditLogEntry(
+                created_date=record.created_date,
+                request_id=record.request_id,
+                actor_id=record.actor_id,
+                actor=record.actor,
+                operation=record.operation.value,
+                model=record.model,
+                entity_id=str(record.entity_id),
+                changes=record.changes,
+            )
+            for record in records
+        )
+
+
+class MemorySink(AuditSink):
+    """
+    Keeps the records in memory, standing in for a log service in
+    development and tests.
+    """
+
+    records: list[AuditRecord] = []
+
+    def write(self, records):
+        MemorySink.records.extend(records)
+
+
+@dataclass
+class AuditQueueMetrics:
+    enqueued: int = 0
+    written: int = 0
+    batches: int = 0
+    # flushes made by the requests that found the queue full
+    backpressure_flushes: int = 0
+    failed_batches: int = 0
+    dropped: int = 0
+    max_depth: int = 0
+    depth: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class AuditQueue:
+    """
+    Bounded in-process queue of the audit records, written to the sink in
+    batches by a background thread every AUDIT_LOG_FLUSH_INTERVAL seconds
+    and at the end of every request. A request finding the queue full
+    flushes it itself, slowing down instead of losing records.
+    """
+
+    def __init__(self):
+        self.metrics = AuditQueueMetrics()
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def put(self, record: AuditRecord):
+        if len(self._records) >= settings.AUDIT_LOG_QUEUE_SIZE:
+            with self._lock:
+                self.metrics.backpressure_flushes += 1
+            self.flush()
+        with self._lock:
+            self._records.append(record)
+            self.metrics.enqueued += 1
+            self.metrics.depth = len(self._records)
+            self.metrics.max_depth = max(self.metrics.max_depth, self.metrics.depth)
+        if self.metrics.depth >= settings.AUDIT_LOG_BATCH_SIZE:
+            self._wakeup.set()
+        self._ensure_thread()
+
+    def _take_batch(self) -> list[AuditRecord]:
+        with self._lock:
+            batch = [
+                self._records.popleft()
+                for _ in range(min(len(self._records), settings.AUDIT_LOG_BATCH_SIZE))
+            ]
+            self.metrics.depth = len(self._records)
+            return batch
+
+    def flush(self):
+        """
+        Writes the queued records to the sink, in batches of at most
+        AUDIT_LOG_BATCH_SIZE records.
+        """
+        with self._flush_lock:
+            sink = get_audit_sink()
+            while batch := self._take_batch():
+                try:
+                    sink.write(batch)
+                except Exception:
+                    logger.warning(
+                        "Failed to write %s audit records", len(batch), exc_info=True
+                    )
+                    with self._lock:
+                        self.metrics.failed_batches += 1
+                        self.metrics.dropped += len(batch)
+                    continue
+                with self._lock:
+                    self.metrics.batches += 1
+                    self.metrics.written += len(batch)
+
+    def _ensure_thread(self):
+        if settings.AUDIT_LOG_FLUSH_INTERVAL <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-flush", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(settings.AUDIT_LOG_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+            close_old_connections()
+
+
+_sinks: dict[str, AuditSink] = {}
+
+
+def get_audit_sink() -> AuditSink:
+    path = settings.AUDIT_LOG_SINK
+    if path not in _sinks:
+        _sinks[path] = import_string(path)()
+    return _sinks[path]
+
+
+audit_queue = AuditQueue()
+
+atexit.register(audit_queue.flush)
+
+
+@receiver(request_finished)
+def flush_audit_queue(**kwargs):
+    # runs once the response is sent, so that the records of a request are
+    # written before the worker handles the next one
+    if audit_queue.metrics.depth:
+        audit_queue.flush()
+
+
+AUDIT_METRICS = {
+    "enqueued": "Audit records queued",
+    "written": "Audit records written to the sink",
+    "batches": "Batches of audit records written to the sink",
+    "backpressure_flushes": "Flushes made by the requests finding the queue full",
+    "failed_batches": "Batches of audit records the sink failed to write",
+    "dropped": "Audit records lost in failed batches",
+    "max_depth": "Largest number of audit records queued",
+    "depth": "Audit records queued and not yet written",
+}
+
+
+def get_audit_metric_name(name: str) -> str:
+    if name in ("depth", "max_depth"):
+        return f"care_audit_log_queue_{name}"
+    return f"care_audit_log_{name}_total"
+
+
+def collect_audit_metrics() -> dict[str, float]:
+    return {
+        get_audit_metric_name(name): value
+        for name, value in audit_queue.metrics.as_dict().items()
+    }
+
+
+for name, description in AUDIT_METRICS.items():
+    register_family(
+        get_audit_metric_name(name),
+        MetricFamily(
+            "gauge" if name in ("depth", "max_depth") else "counter", description
+        ),
+    )
+register_collector(collect_audit_metrics)
@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from care.audit_log.enums import Operation
+from care.audit_log.helpers import ScopeMatcher, exclude_model
+from care.audit_log.middleware import AuditLogMiddleware, RequestInformation
+from care.audit_log.sinks import MemorySink, audit_queue
+from care.facility.models import Facility
+from care.users.models import District, State
+from care.utils.tests.test_utils import TestUtils
+
+
+@override_settings(
+    AUDIT_LOG_ENABLED=True, AUDIT_LOG_SINK="care.audit_log.sinks.MemorySink"
+)
+class AuditLogReceiversTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state(name="Kerala")
+        cls.district = cls.create_district(cls.state)
+        cls.user = cls.create_user("audited", cls.district)
+
+    def setUp(self):
+        MemorySink.records.clear()
+        request = RequestFactory().post("/")
+        request.user = self.user
+        AuditLogMiddleware.thread.__dal__ = RequestInformation(
+            "post::audit", request, None, None
+        )
+
+    def tearDown(self):
+        AuditLogMiddleware.cleanup()
+
+    def get_records(self):
+        audit_queue.flush()
+        records = list(MemorySink.records)
+        MemorySink.records.clear()
+        return records
+
+    def assertAuditRecord(self, operation, changes):  # noqa: N802
+        records = self.get_records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].operation, operation)
+        self.assertEqual(records[0].actor_id, self.user.id)
+        self.assertEqual(records[0].changes, changes)
+
+    def test_update_is_diffed_without_refetching(self):
+        state = State.objects.get(id=self.state.id)
+        state.name = "Tamil Nadu"
+        with self.assertNumQueries(1):
+            state.save()
+        self.assertAuditRecord(Operation.UPDATE, {"name": "Tamil Nadu"})
+
+        # the next save is compared against the values saved
+        state.name = "Karnataka"
+        state.save()
+        self.assertAuditRecord(Operation.UPDATE, {"name": "Karnataka"})
+
+        state.save()
+        self.assertEqual(self.get_records(), [])
+
+    def test_update_fields_limit_the_changes(self):
+        other_state = self.create_state()
+        self.get_records()
+        district = District.objects.get(id=self.district.id)
+        district.name = "Ernakulam"
+        district.state_id = other_state.id
+        district.save(update_fields=["name"])
+        self.assertAuditRecord(Operation.UPDATE, {"name": "Ernakulam"})
+
+        district.save(update_fields=["state"])
+        self.assertAuditRecord(Operation.UPDATE, {"state_id": district.state_id})
+
+    def test_mutable_values_changed_in_place_are_diffed(self):
+        facility = self.create_facility(self.user, self.district, None, features=[1])
+        self.get_records()
+        with patch("care.audit_log.helpers.deepcopy") as deepcopy:
+            facility = Facility.objects.get(id=facility.id)
+        # the values loaded are not copied
+        deepcopy.assert_not_called()
+
+        facility.features.append(2)
+        facility.save()
+        self.assertAuditRecord(Operation.UPDATE, {"features": [1, 2]})
+
+        facility.save()
+        self.assertEqual(self.get_records(), [])
+
+    def test_insert_and_delete(self):
+        state = State.objects.create(name="Goa")
+        self.assertAuditRecord(Operation.INSERT, {})
+
+        state_id = state.id
+        state.delete()
+        self.assertAuditRecord(Operation.DELETE, {"id": state_id, "name": "Goa"})
+        self.assertTrue(hasattr(state, "_state"))
+
+    def test_instances_loaded_outside_requests_are_compared_to_the_database(self):
+        AuditLogMiddleware.cleanup()
+        state = State.objects.get(id=self.state.id)
+        self.setUp()
+        state.name = "Assam"
+        with self.assertNumQueries(2):
+            state.save()
+        self.assertAuditRecord(Operation.UPDATE, {"name": "Assam"})
+
+
+class ScopeMatcherTestCase(TestCase):
+    def test_matches(self):
+        matcher = ScopeMatcher(
+            ["plain:facility.Bed", "glob:auth*", "regex:^users\\.Skill$"]
+        )
+        self.assertTrue(matcher.matches("facility.bed"))
+        self.assertTrue(matcher.matches("authtoken"))
+        self.assertTrue(matcher.matches("Users.Skill"))
+        self.assertFalse(matcher.matches("facility.BedType"))
+        self.assertFalse(matcher.matches("users.SkillLevel"))
+
+    def test_exclude_model(self):
+        self.assertTrue(exclude_model("auth.Group"))
+        self.assertTrue(exclude_model("facility.HistoricalPatientRegistration"))
+        self.assertFalse(exclude_model("facility.PatientRegistration"))
@@ -0,0 +1,112 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.signals import request_finished
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from care.audit_log.enums import Operation
+from care.audit_log.models import AuditLogEntry
+from care.audit_log.sinks import (
+    AuditQueue,
+    AuditRecord,
+    DatabaseSink,
+    FileSink,
+    LoggerSink,
+    MemorySink,
+    audit_queue,
+    collect_audit_metrics,
+)
+
+
+def make_record(entity_id, operation=Operation.UPDATE, changes=None):
+    return AuditRecord(
+        created_date=timezone.now(),
+        request_id="post::audit",
+        actor_id=1,
+        actor="audited",
+        operation=operation,
+        model="users.State",
+        entity_id=entity_id,
+        changes={"name": "Kerala"} if changes is None else changes,
+    )
+
+
+@override_settings(
+    AUDIT_LOG_SINK="care.audit_log.sinks.MemorySink",
+    AUDIT_LOG_BATCH_SIZE=2,
+    AUDIT_LOG_QUEUE_SIZE=3,
+)
+class AuditQueueTestCase(TestCase):
+    def setUp(self):
+        MemorySink.records.clear()
+
+    def test_records_are_written_in_batches(self):
+        queue = AuditQueue()
+        for entity_id in range(3):
+            queue.put(make_record(entity_id))
+        self.assertEqual(MemorySink.records, [])
+
+        queue.flush()
+        self.assertEqual([record.entity_id for record in MemorySink.records], [0, 1, 2])
+        self.assertEqual(queue.metrics.batches, 2)
+        self.assertEqual(queue.metrics.written, 3)
+        self.assertEqual(queue.metrics.depth, 0)
+
+    def test_full_queue_is_flushed_by_the_producer(self):
+        queue = AuditQueue()
+        for entity_id in range(4):
+            queue.put(make_record(entity_id))
+        self.assertEqual(queue.metrics.backpressure_flushes, 1)
+        self.assertEqual(len(MemorySink.records), 3)
+        self.assertEqual(queue.metrics.depth, 1)
+        self.assertEqual(queue.metrics.max_depth, 3)
+
+    @override_settings(AUDIT_LOG_SINK="care.audit_log.sinks.AuditSink")
+    def test_failed_batches_are_counted(self):
+        queue = AuditQueue()
+        queue.put(make_record(1))
+        with self.assertLogs("care.audit_log.sinks", "WARNING"):
+            queue.flush()
+        self.assertEqual(queue.metrics.failed_batches, 1)
+        self.assertEqual(queue.metrics.dropped, 1)
+
+    def test_queue_is_flushed_at_request_end(self):
+        audit_queue.put(make_record(1))
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(len(MemorySink.records), 1)
+        self.assertGreaterEqual(
+            collect_audit_metrics()["care_audit_log_written_total"], 1
+        )
+
+
+class AuditSinksTestCase(TestCase):
+    def test_logger_sink(self):
+        with self.assertLogs("care.audit_log.sinks", "INFO") as logs:
+            LoggerSink().write(
+                [make_record(1), make_record(2, Operation.DELETE, {"id": 2})]
+            )
+        self.assertEqual(
+            [line.split(":", 2)[-1] for line in logs.output],
+            [
+                'AUDIT_LOG::post::audit|audited|update|users.State|ID:1|{"name": "Kerala"}',
+                "AUDIT_LOG::post::audit|audited|delete|users.State|ID:2|{'id': 2}",
+            ],
+        )
+
+    def test_file_sink(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory) / "audit.log"
+            with override_settings(AUDIT_LOG_FILE=str(path)):
+                FileSink().write([make_record(1)])
+                FileSink().write([make_record(2)])
+            lines = path.read_text().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith('|ID:2|{"name": "Kerala"}'))
+
+    def test_database_sink(self):
+        with self.assertNumQueries(1):
+            DatabaseSink().write([make_record(1), make_record(2)])
+        entry = AuditLogEntry.objects.get(entity_id="2")
+        self.assertEqual(entry.operation, "update")
+        self.assertEqual(entry.changes, {"name": "Kerala"})
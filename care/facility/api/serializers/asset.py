@@ -37,7 +37,7 @@ from care.utils.assetintegration.hl7monitor import HL7MonitorAsset
 from care.utils.assetintegration.onvif import OnvifAsset
 from care.utils.assetintegration.ventilator import VentilatorAsset
 from care.utils.models.validators import MiddlewareDomainAddressValidator
-from care.utils.queryset.facility import get_facility_queryset
+from care.utils.queryset.scope import get_permission_scope
 from care.utils.serializers.fields import ChoiceField
 
 
@@ -172,8 +172,7 @@ class AssetSerializer(ModelSerializer):
                 AssetLocation.objects.filter(external_id=attrs["location"])
             )
 
-            facilities = get_facility_queryset(user)
-            if not facilities.filter(id=location.facility.id).exists():
+            if not get_permission_scope(user).has_facility(location.facility):
                 raise PermissionError
             del attrs["location"]
             attrs["current_location"] = location
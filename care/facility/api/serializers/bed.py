@@ -29,7 +29,7 @@ from care.facility.models.patient_base import BedTypeChoices
 from care.facility.models.patient_consultation import PatientConsultation
 from care.utils.assetintegration.asset_classes import AssetClasses
 from care.utils.queryset.consultation import get_consultation_queryset
-from care.utils.queryset.facility import get_facility_queryset
+from care.utils.queryset.scope import get_permission_scope
 from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
 
 
@@ -70,9 +70,9 @@ class BedSerializer(ModelSerializer):
             facility = get_object_or_404(
                 Facility.objects.filter(external_id=attrs["facility"])
             )
-            facilities = get_facility_queryset(user)
-            if (not facilities.filter(id=location.facility.id).exists()) or (
-                not facilities.filter(id=facility.id).exists()
+            scope = get_permission_scope(user)
+            if not scope.has_facility(location.facility) or not scope.has_facility(
+                facility
             ):
                 raise PermissionError
             del attrs["location"]
@@ -106,10 +106,10 @@ class AssetBedSerializer(ModelSerializer):
                 Asset.objects.filter(external_id=attrs["asset"])
             )
             bed: Bed = get_object_or_404(Bed.objects.filter(external_id=attrs["bed"]))
-            facilities = get_facility_queryset(user)
-            if (
-                not facilities.filter(id=asset.current_location.facility.id).exists()
-            ) or (not facilities.filter(id=bed.facility.id).exists()):
+            scope = get_permission_scope(user)
+            if not scope.has_facility(
+                asset.current_location.facility
+            ) or not scope.has_facility(bed.facility):
                 raise PermissionError
             if AssetBed.objects.filter(asset=asset, bed=bed).exists():
                 raise ValidationError(
@@ -196,8 +196,7 @@ class ConsultationBedSerializer(ModelSerializer):
         user = self.context["request"].user
         bed = attrs["bed"]
 
-        facilities = get_facility_queryset(user)
-        if not facilities.filter(id=bed.facility_id).exists():
+        if not get_permission_scope(user).has_facility(bed.facility):
             msg = "You do not have access to this facility"
             raise ValidationError(msg)
 
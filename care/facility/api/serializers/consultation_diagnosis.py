@@ -1,5 +1,6 @@
 from typing import Any
 
+from django.db import models
 from rest_framework import serializers
 
 from care.facility.models import (
@@ -7,7 +8,10 @@ from care.facility.models import (
     ConsultationDiagnosis,
 )
 from care.facility.models.icd11_diagnosis import ICD11Diagnosis
-from care.facility.static_data.icd11 import get_icd11_diagnosis_object_by_id
+from care.facility.static_data.icd11 import (
+    get_icd11_diagnoses_by_ids,
+    get_icd11_diagnosis_object_by_id,
+)
 from care.users.api.serializers.user import UserBaseMinimumSerializer
 
 
@@ -23,6 +27,16 @@ class ConsultationCreateDiagnosisSerializer(serializers.ModelSerializer):
         fields = ("diagnosis", "verification_status", "is_principal")
 
 
+class ConsultationDiagnosisListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        data = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        # fetches the diagnoses in one round trip, the items then hit the cache
+        get_icd11_diagnoses_by_ids(obj.diagnosis_id for obj in data)
+        return super().to_representation(data)
+
+
 class ConsultationDiagnosisSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="external_id", read_only=True)
     diagnosis = serializers.PrimaryKeyRelatedField(
@@ -36,6 +50,7 @@ class ConsultationDiagnosisSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ConsultationDiagnosis
+        list_serializer_class = ConsultationDiagnosisListSerializer
         exclude = (
             "consultation",
             "external_id",
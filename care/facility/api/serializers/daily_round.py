@@ -17,6 +17,10 @@ from care.facility.models.bed import Bed
 from care.facility.models.daily_round import DailyRound
 from care.facility.models.notification import Notification
 from care.facility.models.patient_base import SuggestionChoices
+from care.facility.utils.automated_vitals import (
+    can_store_compactly,
+    store_automated_vitals,
+)
 from care.users.api.serializers.user import UserBaseMinimumSerializer
 from care.utils.notification_handler import NotificationGenerator
 from care.utils.queryset.facility import get_home_facility_queryset
@@ -260,6 +264,16 @@ class DailyRoundSerializer(serializers.ModelSerializer):
                 validated_data["created_by_telemedicine"] = True
                 validated_data["last_updated_by_telemedicine"] = True
 
+            if can_store_compactly(validated_data):
+                daily_round_obj = store_automated_vitals(
+                    validated_data, self.context["request"].user
+                )
+                consultation.last_updated_by_telemedicine = validated_data[
+                    "last_updated_by_telemedicine"
+                ]
+                consultation.save(update_fields=["last_updated_by_telemedicine"])
+                return daily_round_obj
+
             daily_round_obj: DailyRound = super().create(validated_data)
             daily_round_obj.created_by = self.context["request"].user
             daily_round_obj.last_edited_by = self.context["request"].user
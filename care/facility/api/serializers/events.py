@@ -1,4 +1,12 @@
-from rest_framework.serializers import ModelSerializer, SerializerMethodField
+from rest_framework.serializers import (
+    CharField,
+    DateTimeField,
+    IntegerField,
+    ModelSerializer,
+    PrimaryKeyRelatedField,
+    Serializer,
+    SerializerMethodField,
+)
 
 from care.facility.models.events import EventType, PatientConsultationEvent
 from care.users.api.serializers.user import UserBaseMinimumSerializer
@@ -19,7 +27,14 @@ class NestedEventTypeSerializer(ModelSerializer):
         fields = ("id", "parent", "name", "description", "model", "fields", "children")
 
     def get_children(self, obj: EventType) -> list[EventType] | None:
-        return NestedEventTypeSerializer(obj.children.all(), many=True).data or None
+        if "children" in self.context:
+            children = self.context["children"].get(obj.id, [])
+        else:
+            children = obj.children.all()
+        return (
+            NestedEventTypeSerializer(children, many=True, context=self.context).data
+            or None
+        )
 
 
 class PatientConsultationEventDetailSerializer(ModelSerializer):
@@ -30,3 +45,36 @@ class PatientConsultationEventDetailSerializer(ModelSerializer):
     class Meta:
         model = PatientConsultationEvent
         fields = "__all__"
+
+
+class TimelineQuerySerializer(Serializer):
+    cursor = CharField(required=False)
+    limit = IntegerField(min_value=1, max_value=500, default=100)
+    event_type = PrimaryKeyRelatedField(
+        queryset=EventType.objects.filter(is_active=True), required=False
+    )
+
+
+class TimelineEventSerializer(ModelSerializer):
+    id = ULIDField(source="external_id", read_only=True)
+
+    class Meta:
+        model = PatientConsultationEvent
+        fields = (
+            "id",
+            "event_type",
+            "is_latest",
+            "created_date",
+            "value",
+            "change_type",
+        )
+
+
+class ConsultationTimelineEntrySerializer(Serializer):
+    taken_at = DateTimeField()
+    object_model = CharField()
+    object_id = IntegerField()
+    external_id = CharField(allow_null=True)
+    event_type = EventTypeSerializer()
+    caused_by = UserBaseMinimumSerializer(allow_null=True)
+    events = TimelineEventSerializer(many=True)
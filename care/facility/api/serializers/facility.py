@@ -3,9 +3,7 @@ from django.db.models import Q
 from rest_framework import serializers
 
 from care.facility.models import FACILITY_TYPES, Facility, FacilityLocalGovtBody
-from care.facility.models.bed import Bed
 from care.facility.models.facility import FEATURE_CHOICES, FacilityHubSpoke
-from care.facility.models.patient import PatientRegistration
 from care.users.api.serializers.lsg import (
     DistrictSerializer,
     LocalBodySerializer,
@@ -55,16 +53,8 @@ class FacilityBasicInfoSerializer(serializers.ModelSerializer):
         child=serializers.ChoiceField(choices=FEATURE_CHOICES),
         required=False,
     )
-    patient_count = serializers.SerializerMethodField()
-    bed_count = serializers.SerializerMethodField()
-
-    def get_bed_count(self, facility):
-        return Bed.objects.filter(facility=facility).count()
-
-    def get_patient_count(self, facility):
-        return PatientRegistration.objects.filter(
-            facility=facility, is_active=True
-        ).count()
+    patient_count = serializers.IntegerField(read_only=True)
+    bed_count = serializers.IntegerField(read_only=True)
 
     def get_facility_type(self, facility):
         return {
@@ -101,7 +91,6 @@ class FacilitySerializer(FacilityBasicInfoSerializer):
         child=serializers.ChoiceField(choices=FEATURE_CHOICES),
         required=False,
     )
-    bed_count = serializers.SerializerMethodField()
 
     facility_flags = serializers.SerializerMethodField()
 
@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from django.utils.timezone import now
 from rest_framework import serializers
 
@@ -34,6 +35,8 @@ from care.facility.models.patient_base import (
 )
 from care.facility.models.patient_consultation import PatientConsultation
 from care.facility.models.patient_external_test import PatientExternalTest
+from care.facility.models.prescription import Prescription, PrescriptionType
+from care.facility.static_data.icd11 import get_icd11_diagnoses_by_ids
 from care.users.api.serializers.lsg import (
     DistrictSerializer,
     LocalBodySerializer,
@@ -41,7 +44,7 @@ from care.users.api.serializers.lsg import (
     WardSerializer,
 )
 from care.users.api.serializers.user import UserBaseMinimumSerializer
-from care.users.models import User
+from care.users.models import Skill, User
 from care.utils.notification_handler import NotificationGenerator
 from care.utils.queryset.facility import get_home_facility_queryset
 from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
@@ -67,6 +70,74 @@ class PatientMetaInfoSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+def get_patient_list_prefetches():
+    return (
+        "last_consultation__facility",
+        Prefetch(
+            "last_consultation__patient",
+            queryset=PatientRegistration.objects.only("id", "external_id"),
+        ),
+        "last_consultation__referred_to__ward",
+        "last_consultation__referred_to__local_body",
+        "last_consultation__referred_to__district",
+        "last_consultation__referred_to__state",
+        "last_consultation__referred_from_facility__ward",
+        "last_consultation__referred_from_facility__local_body",
+        "last_consultation__referred_from_facility__district",
+        "last_consultation__referred_from_facility__state",
+        "last_consultation__transferred_from_location__facility",
+        "last_consultation__assigned_to__home_facility",
+        Prefetch(
+            "last_consultation__assigned_to__skills",
+            queryset=Skill.objects.filter(userskill__deleted=False),
+        ),
+        "last_consultation__treating_physician",
+        "last_consultation__assigned_clinicians",
+        "last_consultation__last_edited_by",
+        "last_consultation__created_by",
+        "last_consultation__last_daily_round__created_by",
+        "last_consultation__last_daily_round__last_edited_by",
+        "last_consultation__current_bed__bed__location__facility",
+        "last_consultation__current_bed__assets__current_location__facility",
+        "last_consultation__current_bed__assets__last_service",
+        "last_consultation__diagnoses__created_by",
+        "last_consultation__symptoms__created_by",
+        "last_consultation__symptoms__updated_by",
+        Prefetch(
+            "last_consultation__prescription_set",
+            queryset=Prescription.objects.filter(
+                prescription_type=PrescriptionType.DISCHARGE.value
+            ),
+            to_attr="discharge_prescriptions",
+        ),
+    )
+
+
+class PatientListBatchSerializer(serializers.ListSerializer):
+    """
+    Fetches the relations of the patients of a page in one query per
+    relation, instead of once per patient while they are serialized.
+    """
+
+    def to_representation(self, data):
+        data = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        prefetch_related_objects(data, *get_patient_list_prefetches())
+
+        consultations = [
+            patient.last_consultation for patient in data if patient.last_consultation
+        ]
+        # fetches the diagnoses of the page in one round trip, the
+        # consultations then hit the cache
+        get_icd11_diagnoses_by_ids(
+            diagnosis.diagnosis_id
+            for consultation in consultations
+            for diagnosis in consultation.diagnoses.all()
+        )
+        return super().to_representation(data)
+
+
 class PatientListSerializer(serializers.ModelSerializer):
     id = serializers.CharField(source="external_id", read_only=True)
     facility = serializers.UUIDField(
@@ -100,6 +171,7 @@ class PatientListSerializer(serializers.ModelSerializer):
             "external_id",
         )
         read_only = (*TIMESTAMP_FIELDS, "death_datetime")
+        list_serializer_class = PatientListBatchSerializer
 
 
 class PatientContactDetailsSerializer(serializers.ModelSerializer):
@@ -71,6 +71,38 @@ from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
 MIN_ENCOUNTER_DATE = make_aware(settings.MIN_ENCOUNTER_DATE)
 
 
+def prescription_values(prescription: Prescription) -> dict:
+    """
+    Returns the fields of a prescription as `Prescription.objects.values()`
+    would, for prescriptions that are already fetched.
+    """
+    return {
+        field.attname: getattr(prescription, field.attname)
+        for field in Prescription._meta.concrete_fields  # noqa: SLF001
+    }
+
+
+def get_discharge_prescriptions(consultation, prn: bool):
+    """
+    Returns the PRN, or the other, discharge prescriptions of the consultation
+    as `Prescription.objects.values()` would.
+    """
+    if hasattr(consultation, "discharge_prescriptions"):
+        # prefetched for the patient list by PatientListBatchSerializer
+        return [
+            prescription_values(prescription)
+            for prescription in consultation.discharge_prescriptions
+            if (prescription.dosage_type == PrescriptionDosageType.PRN.value) == prn
+        ]
+    queryset = Prescription.objects.filter(
+        consultation=consultation,
+        prescription_type=PrescriptionType.DISCHARGE.value,
+    )
+    if prn:
+        return queryset.filter(dosage_type=PrescriptionDosageType.PRN.value).values()
+    return queryset.exclude(dosage_type=PrescriptionDosageType.PRN.value).values()
+
+
 class PatientConsultationSerializer(serializers.ModelSerializer):
     id = serializers.CharField(source="external_id", read_only=True)
     facility_name = serializers.CharField(source="facility.name", read_only=True)
@@ -174,21 +206,10 @@ class PatientConsultationSerializer(serializers.ModelSerializer):
     medico_legal_case = serializers.BooleanField(default=False, required=False)
 
     def get_discharge_prescription(self, consultation):
-        return (
-            Prescription.objects.filter(
-                consultation=consultation,
-                prescription_type=PrescriptionType.DISCHARGE.value,
-            )
-            .exclude(dosage_type=PrescriptionDosageType.PRN.value)
-            .values()
-        )
+        return get_discharge_prescriptions(consultation, prn=False)
 
     def get_discharge_prn_prescription(self, consultation):
-        return Prescription.objects.filter(
-            consultation=consultation,
-            prescription_type=PrescriptionType.DISCHARGE.value,
-            dosage_type=PrescriptionDosageType.PRN.value,
-        ).values()
+        return get_discharge_prescriptions(consultation, prn=True)
 
     def _lock_key(self, patient_id):
         return f"patient_consultation__patient_registration__{patient_id}"
@@ -714,21 +735,10 @@ class PatientConsultationDischargeSerializer(serializers.ModelSerializer):
     )
 
     def get_discharge_prescription(self, consultation):
-        return (
-            Prescription.objects.filter(
-                consultation=consultation,
-                prescription_type=PrescriptionType.DISCHARGE.value,
-            )
-            .exclude(dosage_type=PrescriptionDosageType.PRN.value)
-            .values()
-        )
+        return get_discharge_prescriptions(consultation, prn=False)
 
     def get_discharge_prn_prescription(self, consultation):
-        return Prescription.objects.filter(
-            consultation=consultation,
-            prescription_type=PrescriptionType.DISCHARGE.value,
-            dosage_type=PrescriptionDosageType.PRN.value,
-        ).values()
+        return get_discharge_prescriptions(consultation, prn=True)
 
     class Meta:
         model = PatientConsultation
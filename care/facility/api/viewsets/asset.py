@@ -61,11 +61,11 @@ from care.facility.models.asset import (
 from care.facility.models.bed import AssetBed, ConsultationBed
 from care.users.models import User
 from care.utils.assetintegration.asset_classes import AssetClasses
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter, inverse_choices
 from care.utils.queryset.asset_bed import get_asset_queryset
 from care.utils.queryset.asset_location import get_asset_location_queryset
 from care.utils.queryset.facility import get_facility_queryset
+from care.utils.queryset.scope import get_permission_scope
 from config.authentication import MiddlewareAuthentication
 
 if TYPE_CHECKING:
@@ -134,20 +134,10 @@ class AssetLocationViewSet(
         return context
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset
-        if user.is_superuser:
-            pass
-        elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(facility__state=user.state)
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(facility__district=user.district)
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            queryset = queryset.filter(facility__id__in=allowed_facilities)
-
-        return queryset.filter(
-            facility__external_id=self.kwargs["facility_external_id"]
+        scope = get_permission_scope(self.request.user)
+        return self.queryset.filter(
+            scope.facility_filter("facility"),
+            facility__external_id=self.kwargs["facility_external_id"],
         )
 
     def get_facility(self):
@@ -518,27 +508,11 @@ class AssetTransactionViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet
     filterset_class = AssetTransactionFilter
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset
-        if user.is_superuser:
-            pass
-        elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(
-                Q(from_location__facility__state=user.state)
-                | Q(to_location__facility__state=user.state)
-            )
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(
-                Q(from_location__facility__district=user.district)
-                | Q(to_location__facility__district=user.district)
-            )
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            queryset = queryset.filter(
-                Q(from_location__facility__id__in=allowed_facilities)
-                | Q(to_location__facility__id__in=allowed_facilities)
-            )
-        return queryset
+        scope = get_permission_scope(self.request.user)
+        return self.queryset.filter(
+            scope.facility_filter("from_location__facility")
+            | scope.facility_filter("to_location__facility")
+        )
 
 
 class AssetServiceFilter(filters.FilterSet):
@@ -568,23 +542,8 @@ class AssetServiceViewSet(
     filterset_class = AssetServiceFilter
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset.filter(
-            asset__external_id=self.kwargs.get("asset_external_id")
+        scope = get_permission_scope(self.request.user)
+        return self.queryset.filter(
+            scope.facility_filter("asset__current_location__facility"),
+            asset__external_id=self.kwargs.get("asset_external_id"),
         )
-        if user.is_superuser:
-            pass
-        elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(
-                asset__current_location__facility__state=user.state
-            )
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(
-                asset__current_location__facility__district=user.district
-            )
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            queryset = queryset.filter(
-                asset__current_location__facility__id__in=allowed_facilities
-            )
-        return queryset
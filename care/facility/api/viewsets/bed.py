@@ -26,11 +26,13 @@ from care.facility.api.serializers.bed import (
     PatientAssetBedSerializer,
 )
 from care.facility.models.bed import AssetBed, Bed, ConsultationBed
+from care.facility.models.facility import Facility
 from care.facility.models.patient_base import BedTypeChoices
 from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter, inverse_choices
 from care.utils.queryset.asset_bed import get_asset_bed_queryset, get_bed_queryset
+from care.utils.queryset.facility import refresh_facility_counts
+from care.utils.queryset.scope import get_permission_scope
 
 inverse_bed_type = inverse_choices(BedTypeChoices)
 
@@ -109,6 +111,8 @@ class BedViewSet(
                     {"detail": "Bed with same name already exists in this location."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
+            # bulk_create does not send the signals that update the counters
+            refresh_facility_counts(Facility.objects.filter(id=data["facility"].id))
             return Response(status=status.HTTP_201_CREATED)
 
         self.perform_create(serializer)
@@ -218,15 +222,5 @@ class ConsultationBedViewSet(
     lookup_field = "external_id"
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset
-        if user.is_superuser:
-            pass
-        elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(bed__facility__state=user.state)
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(bed__facility__district=user.district)
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            queryset = queryset.filter(bed__facility__id__in=allowed_facilities)
-        return queryset
+        scope = get_permission_scope(self.request.user)
+        return self.queryset.filter(scope.facility_filter("bed__facility"))
@@ -1,3 +1,10 @@
+from contextlib import suppress
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from dry_rest_permissions.generics import DRYPermissions
@@ -11,7 +18,22 @@ from rest_framework.viewsets import GenericViewSet
 
 from care.facility.api.serializers.daily_round import DailyRoundSerializer
 from care.facility.api.viewsets.mixins.access import AssetUserAccessMixin
-from care.facility.models.daily_round import DailyRound
+from care.facility.models.daily_round import AutomatedVitals, DailyRound
+from care.facility.utils.automated_vitals import (
+    UnionSequence,
+    UnionSource,
+    VirtualRounds,
+    as_daily_round,
+    get_vitals_queryset,
+    load_by_id,
+    promote_automated_vitals,
+)
+from care.facility.utils.daily_round_analytics import (
+    BUCKET_DURATIONS,
+    AnalyseBucket,
+    analyse_daily_rounds,
+    get_numeric_expression,
+)
 from care.utils.queryset.consultation import get_consultation_queryset
 
 DailyRoundAttributes = [f.name for f in DailyRound._meta.get_fields()]  # noqa: SLF001
@@ -32,6 +54,20 @@ class DailyRoundFilterSet(filters.FilterSet):
         return queryset.filter(rounds_type__in=list(rounds_type))
 
 
+class AutomatedVitalsFilterSet(filters.FilterSet):
+    rounds_type = filters.CharFilter(method="filter_rounds_type")
+    taken_at = filters.DateTimeFromToRangeFilter()
+
+    class Meta:
+        model = AutomatedVitals
+        fields = []
+
+    def filter_rounds_type(self, queryset, name, value):
+        if DailyRound.RoundsType.AUTOMATED.name not in value.upper().split(","):
+            return queryset.none()
+        return queryset
+
+
 class DailyRoundsViewSet(
     AssetUserAccessMixin,
     mixins.CreateModelMixin,
@@ -52,21 +88,75 @@ class DailyRoundsViewSet(
     MAX_FIELDS = 20
     PAGE_SIZE = 36  # One Round Per Hour
 
+    BUCKET_KEY = "bucket"
+    MAX_BUCKETS = 1000
+    DEFAULT_ANALYSE_RANGE = timedelta(days=30)
+
+    def get_consultation_obj(self):
+        # shared by the queryset and the serializer context of the request
+        if not hasattr(self, "_consultation"):
+            self._consultation = get_object_or_404(
+                get_consultation_queryset(self.request.user).filter(
+                    external_id=self.kwargs["consultation_external_id"]
+                )
+            )
+        return self._consultation
+
     def get_queryset(self):
-        consultation = get_object_or_404(
-            get_consultation_queryset(self.request.user).filter(
-                external_id=self.kwargs["consultation_external_id"]
+        consultation = self.get_consultation_obj()
+        return self.queryset.filter(consultation=consultation).order_by("-taken_at")
+
+    def get_vitals_queryset(self):
+        """
+        Returns the automated rounds of the consultation stored compactly,
+        filtered like the daily rounds.
+        """
+        filterset = AutomatedVitalsFilterSet(
+            self.request.query_params,
+            queryset=get_vitals_queryset(self.get_consultation_obj()),
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset.qs
+
+    def get_object(self):
+        """
+        Returns the round, read from the compact storage when it is not a
+        stored DailyRound. Compactly stored rounds are moved to the daily
+        rounds to be edited.
+        """
+        with suppress(Http404):
+            return super().get_object()
+        try:
+            vitals = get_vitals_queryset(self.get_consultation_obj()).get(
+                external_id=self.kwargs[self.lookup_field]
             )
+        except (AutomatedVitals.DoesNotExist, DjangoValidationError) as e:
+            raise Http404 from e
+        daily_round = as_daily_round(vitals)
+        self.check_object_permissions(self.request, daily_round)
+        if self.action in ("update", "partial_update"):
+            return promote_automated_vitals(vitals)
+        return daily_round
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rounds = UnionSequence(
+            [
+                UnionSource(queryset, load_by_id(queryset)),
+                VirtualRounds(self.get_vitals_queryset()).source(),
+            ]
         )
-        return self.queryset.filter(consultation=consultation).order_by("-taken_at")
+        page = self.paginate_queryset(rounds)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(rounds[:], many=True)
+        return Response(serializer.data)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        context["consultation"] = get_object_or_404(
-            get_consultation_queryset(self.request.user).filter(
-                external_id=self.kwargs["consultation_external_id"]
-            )
-        )
+        context["consultation"] = self.get_consultation_obj()
         return context
 
     @extend_schema(tags=["daily_rounds"])
@@ -74,6 +164,9 @@ class DailyRoundsViewSet(
     def analyse(self, request, **kwargs):
         # Request Body Validations
 
+        if self.BUCKET_KEY in request.data:
+            return self.analyse_buckets(request)
+
         if self.FIELDS_KEY not in request.data:
             raise ValidationError({"fields": "Field not present"})
         if not isinstance(request.data[self.FIELDS_KEY], list):
@@ -98,19 +191,23 @@ class DailyRoundsViewSet(
 
         page = request.data.get("page", 1)
 
-        consultation = get_object_or_404(
-            get_consultation_queryset(request.user).filter(
-                external_id=self.kwargs["consultation_external_id"]
-            )
+        consultation = self.get_consultation_obj()
+        daily_rounds = DailyRound.objects.filter(consultation=consultation)
+        daily_round_objects = UnionSequence(
+            [
+                UnionSource(
+                    daily_rounds,
+                    load_by_id(daily_rounds.values("id", "taken_at", *base_fields)),
+                ),
+                VirtualRounds(
+                    get_vitals_queryset(consultation), fields=["taken_at", *base_fields]
+                ).source(),
+            ]
         )
-        daily_round_objects = DailyRound.objects.filter(
-            consultation=consultation
-        ).order_by("-taken_at")
         total_count = daily_round_objects.count()
-        daily_round_objects = daily_round_objects[
+        final_data_rows = daily_round_objects[
             ((page - 1) * self.PAGE_SIZE) : ((page * self.PAGE_SIZE) + 1)
         ]
-        final_data_rows = daily_round_objects.values("taken_at", *base_fields)
         final_analytics = {}
 
         for row in final_data_rows:
@@ -128,3 +225,64 @@ class DailyRoundsViewSet(
             "page_size": self.PAGE_SIZE,
         }
         return Response(final_data)
+
+    def parse_analyse_datetime(self, request, key, default):
+        value = request.data.get(key)
+        if value is None:
+            return default
+        parsed = parse_datetime(str(value))
+        if parsed is None:
+            raise ValidationError({key: "Must be a valid datetime"})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def analyse_buckets(self, request):
+        """
+        Aggregates numeric fields of the rounds taken in a time range in
+        buckets of an hour, a shift or a day, in a single response.
+        """
+        bucket = request.data[self.BUCKET_KEY]
+        if bucket not in AnalyseBucket.values:
+            raise ValidationError(
+                {"bucket": f"Must be one of {', '.join(AnalyseBucket.values)}"}
+            )
+
+        fields = request.data.get(self.FIELDS_KEY)
+        if not isinstance(fields, list) or not fields:
+            raise ValidationError({"fields": "Must be a non empty List"})
+        if len(fields) >= self.MAX_FIELDS:
+            raise ValidationError({"fields": f"Must be smaller than {self.MAX_FIELDS}"})
+        fields = [str(field) for field in fields]
+        errors = {
+            field: "Not a numeric field"
+            for field in fields
+            if get_numeric_expression(field) is None
+        }
+        if errors:
+            raise ValidationError(errors)
+
+        end = self.parse_analyse_datetime(request, "taken_at_before", timezone.now())
+        start = self.parse_analyse_datetime(
+            request, "taken_at_after", end - self.DEFAULT_ANALYSE_RANGE
+        )
+        if start >= end:
+            raise ValidationError({"taken_at_after": "Must be before taken_at_before"})
+        if (end - start) / BUCKET_DURATIONS[bucket] > self.MAX_BUCKETS:
+            raise ValidationError(
+                {"bucket": f"The range must span at most {self.MAX_BUCKETS} buckets"}
+            )
+
+        consultation = self.get_consultation_obj()
+        return Response(
+            analyse_daily_rounds(
+                DailyRound.objects.filter(consultation=consultation),
+                list(dict.fromkeys(fields)),
+                bucket,
+                start,
+                end,
+                vitals_queryset=AutomatedVitals.objects.filter(
+                    consultation=consultation
+                ),
+            )
+        )
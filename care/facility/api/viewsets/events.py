@@ -1,19 +1,33 @@
+from collections import defaultdict
+
+from django.db.models import Q
+from django.db.models.functions import Length
 from django.shortcuts import get_object_or_404
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from care.facility.api.serializers.events import (
+    ConsultationTimelineEntrySerializer,
     EventTypeSerializer,
     NestedEventTypeSerializer,
     PatientConsultationEventDetailSerializer,
+    TimelineQuerySerializer,
 )
 from care.facility.models.events import EventType, PatientConsultationEvent
+from care.facility.utils.automated_vitals import (
+    UnionSequence,
+    UnionSource,
+    VirtualEvents,
+    get_vitals_queryset,
+    load_by_id,
+)
+from care.facility.utils.timeline import ConsultationTimeline, get_latest_events
 from care.utils.queryset.consultation import get_consultation_queryset
 
 
@@ -27,20 +41,40 @@ class EventTypeViewSet(ReadOnlyModelViewSet):
         return super().get_serializer_class()
 
     @extend_schema(tags=("event_types",))
-    @method_decorator(cache_page(86400))
     @action(detail=True, methods=["GET"])
     def descendants(self, request, pk=None):
         event_type: EventType = get_object_or_404(self.queryset, pk=pk)
-        queryset = self.get_queryset().filter(pk__in=event_type.get_descendants())
+        queryset = event_type.get_descendants().filter(is_active=True)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(tags=("event_types",))
+    @action(detail=True, methods=["GET"])
+    def ancestors(self, request, pk=None):
+        event_type: EventType = get_object_or_404(self.queryset, pk=pk)
+        queryset = (
+            event_type.get_ancestors().filter(is_active=True).order_by(Length("path"))
+        )
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     @extend_schema(tags=("event_types",))
-    @method_decorator(cache_page(86400))
     @action(detail=False, methods=["GET"])
     def roots(self, request):
-        queryset = self.get_queryset().filter(parent__isnull=True)
-        serializer = self.get_serializer(queryset, many=True)
+        # the whole tree is read with a single query
+        children = defaultdict(list)
+        roots = []
+        for event_type in EventType.objects.order_by("id"):
+            if event_type.parent_id is None:
+                if event_type.is_active:
+                    roots.append(event_type)
+            else:
+                children[event_type.parent_id].append(event_type)
+        serializer = self.get_serializer(
+            roots,
+            many=True,
+            context={**self.get_serializer_context(), "children": children},
+        )
         return Response(serializer.data)
 
 
@@ -70,12 +104,104 @@ class PatientConsultationEventViewSet(ReadOnlyModelViewSet):
     filterset_class = PatientConsultationEventFilterSet
 
     def get_consultation_obj(self):
-        return get_object_or_404(
-            get_consultation_queryset(self.request.user).filter(
-                external_id=self.kwargs["consultation_external_id"]
+        if not hasattr(self, "_consultation"):
+            self._consultation = get_object_or_404(
+                get_consultation_queryset(self.request.user).filter(
+                    external_id=self.kwargs["consultation_external_id"]
+                )
             )
-        )
+        return self._consultation
 
     def get_queryset(self):
         consultation = self.get_consultation_obj()
         return self.queryset.filter(consultation_id=consultation.id)
+
+    def list(self, request, *args, **kwargs):
+        # the events of the automated rounds stored compactly are built on read
+        filterset = filters.DjangoFilterBackend().get_filterset(
+            request, self.get_queryset(), self
+        )
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        params = filterset.form.cleaned_data
+        ordering = (params.get("ordering") or ["-created_date"])[0]
+        virtual_events = VirtualEvents(
+            get_vitals_queryset(self.get_consultation_obj()),
+            [params["event_type"]] if params.get("event_type") else None,
+            ordering,
+            is_latest=params.get("is_latest"),
+            row_filter=Q(created_by=params["caused_by"])
+            if params.get("caused_by") is not None
+            else None,
+        )
+        events = UnionSequence(
+            [
+                UnionSource(
+                    filterset.qs,
+                    load_by_id(filterset.qs),
+                    key=ordering.lstrip("-"),
+                ),
+                *virtual_events.sources(),
+            ],
+            reverse=ordering.startswith("-"),
+        )
+        page = self.paginate_queryset(events)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(events[:], many=True)
+        return Response(serializer.data)
+
+    def get_timeline_params(self):
+        serializer = TimelineQuerySerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if event_type := params.get("event_type"):
+            params["event_types"] = event_type.get_descendants(include_self=True)
+        return params
+
+    @extend_schema(
+        parameters=[TimelineQuerySerializer],
+        responses=ConsultationTimelineEntrySerializer(many=True),
+    )
+    @action(detail=False, methods=["GET"])
+    def timeline(self, request, *args, **kwargs):
+        """
+        The events of the consultation newest first, grouped by change of an
+        object and top level event type, paginated with the cursor returned
+        as next.
+        """
+        params = self.get_timeline_params()
+        timeline = ConsultationTimeline(
+            self.get_queryset(),
+            get_vitals_queryset(self.get_consultation_obj()),
+            params.get("event_types"),
+        )
+        entries, cursor = timeline.page(params.get("cursor"), params["limit"])
+        return Response(
+            {
+                "next": replace_query_param(
+                    request.build_absolute_uri(), "cursor", cursor
+                )
+                if cursor
+                else None,
+                "results": ConsultationTimelineEntrySerializer(entries, many=True).data,
+            }
+        )
+
+    @extend_schema(
+        parameters=[TimelineQuerySerializer],
+        responses=PatientConsultationEventDetailSerializer(many=True),
+    )
+    @action(detail=False, methods=["GET"])
+    def latest(self, request, *args, **kwargs):
+        """
+        The latest event of every event type of the consultation.
+        """
+        params = self.get_timeline_params()
+        events = get_latest_events(
+            self.get_queryset(),
+            get_vitals_queryset(self.get_consultation_obj()),
+            params.get("event_types"),
+        )
+        return Response(self.get_serializer(events, many=True).data)
@@ -2,7 +2,6 @@ from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django_filters import rest_framework as filters
-from djqscsv import render_to_csv_response
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from dry_rest_permissions.generics import DRYPermissionFiltersBase, DRYPermissions
 from rest_framework import filters as drf_filters
@@ -18,6 +17,7 @@ from care.facility.api.serializers.facility import (
     FacilitySerializer,
     FacilitySpokeSerializer,
 )
+from care.facility.api.viewsets.mixins.csv_export import CSVExportMixin
 from care.facility.models import (
     Facility,
     FacilityCapacity,
@@ -26,6 +26,7 @@ from care.facility.models import (
 )
 from care.facility.models.facility import FacilityHubSpoke, FacilityUser
 from care.users.models import User
+from care.utils.csp.config import BucketType
 from care.utils.file_uploads.cover_image import delete_cover_image
 from care.utils.queryset.facility import get_facility_queryset
 
@@ -67,6 +68,7 @@ class FacilityQSPermissions(DRYPermissionFiltersBase):
 
 
 class FacilityViewSet(
+    CSVExportMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -76,6 +78,8 @@ class FacilityViewSet(
 ):
     """Viewset for facility CRUD operations."""
 
+    csv_export_bucket_type = BucketType.FACILITY
+
     queryset = Facility.objects.all().select_related(
         "ward", "local_body", "district", "state"
     )
@@ -124,25 +128,28 @@ class FacilityViewSet(
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def get_csv_export(self):
+        mapping = Facility.CSV_MAPPING.copy()
+        pretty_mapping = Facility.CSV_MAKE_PRETTY.copy()
+        if self.FACILITY_CAPACITY_CSV_KEY in self.request.GET:
+            mapping.update(FacilityCapacity.CSV_RELATED_MAPPING.copy())
+            pretty_mapping.update(FacilityCapacity.CSV_MAKE_PRETTY.copy())
+        elif self.FACILITY_DOCTORS_CSV_KEY in self.request.GET:
+            mapping.update(HospitalDoctors.CSV_RELATED_MAPPING.copy())
+            pretty_mapping.update(HospitalDoctors.CSV_MAKE_PRETTY.copy())
+        elif self.FACILITY_TRIAGE_CSV_KEY in self.request.GET:
+            mapping.update(FacilityPatientStatsHistory.CSV_RELATED_MAPPING.copy())
+            pretty_mapping.update(FacilityPatientStatsHistory.CSV_MAKE_PRETTY.copy())
+        queryset = self.filter_queryset(self.get_queryset()).values(*mapping.keys())
+        return {
+            "queryset": queryset,
+            "field_header_map": mapping,
+            "field_serializer_map": pretty_mapping,
+        }
+
     def list(self, request, *args, **kwargs):
         if settings.CSV_REQUEST_PARAMETER in request.GET:
-            mapping = Facility.CSV_MAPPING.copy()
-            pretty_mapping = Facility.CSV_MAKE_PRETTY.copy()
-            if self.FACILITY_CAPACITY_CSV_KEY in request.GET:
-                mapping.update(FacilityCapacity.CSV_RELATED_MAPPING.copy())
-                pretty_mapping.update(FacilityCapacity.CSV_MAKE_PRETTY.copy())
-            elif self.FACILITY_DOCTORS_CSV_KEY in request.GET:
-                mapping.update(HospitalDoctors.CSV_RELATED_MAPPING.copy())
-                pretty_mapping.update(HospitalDoctors.CSV_MAKE_PRETTY.copy())
-            elif self.FACILITY_TRIAGE_CSV_KEY in request.GET:
-                mapping.update(FacilityPatientStatsHistory.CSV_RELATED_MAPPING.copy())
-                pretty_mapping.update(
-                    FacilityPatientStatsHistory.CSV_MAKE_PRETTY.copy()
-                )
-            queryset = self.filter_queryset(self.get_queryset()).values(*mapping.keys())
-            return render_to_csv_response(
-                queryset, field_header_map=mapping, field_serializer_map=pretty_mapping
-            )
+            return self.export_csv()
 
         return super().list(request, *args, **kwargs)
 
@@ -6,8 +6,7 @@ from rest_framework.permissions import IsAuthenticated
 from care.facility.api.serializers.hospital_doctor import HospitalDoctorSerializer
 from care.facility.api.viewsets import FacilityBaseViewset
 from care.facility.models import Facility, HospitalDoctors
-from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.utils.queryset.scope import get_permission_scope
 
 
 class HospitalDoctorViewSet(FacilityBaseViewset, ListModelMixin):
@@ -16,20 +15,11 @@ class HospitalDoctorViewSet(FacilityBaseViewset, ListModelMixin):
     permission_classes = (IsAuthenticated, DRYPermissions)
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset.filter(
-            facility__external_id=self.kwargs.get("facility_external_id")
+        scope = get_permission_scope(self.request.user)
+        return self.queryset.filter(
+            scope.facility_filter("facility"),
+            facility__external_id=self.kwargs.get("facility_external_id"),
         )
-        if user.is_superuser:
-            pass
-        elif self.request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(facility__state=user.state)
-        elif self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(facility__district=user.district)
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            queryset = queryset.filter(facility__id__in=allowed_facilities)
-        return queryset
 
     def get_object(self):
         return get_object_or_404(self.get_queryset(), area=self.kwargs.get("pk"))
@@ -0,0 +1,74 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+
+from care.facility.tasks.csv_export import export_csv_task
+from care.facility.utils.reports import csv_export
+from care.facility.utils.reports.csv_export import ExportStatus
+from care.utils.csp.config import BucketType
+from care.utils.csv_export import render_to_csv_stream_response
+
+
+class CSVExportMixin:
+    """
+    Exports the list as CSV, streamed in the response.
+
+    With the `async` query parameter the CSV is generated in the background
+    and uploaded to the bucket instead. Repeating the request returns the
+    progress of the export, and then a signed URL to download it.
+    """
+
+    csv_export_bucket_type = BucketType.PATIENT
+
+    def get_csv_export(self) -> dict:
+        """
+        Returns the arguments of `care.utils.csv_export.iter_csv` for the
+        export of the list.
+        """
+        raise NotImplementedError
+
+    def export_csv(self):
+        export = self.get_csv_export()
+        if settings.CSV_ASYNC_REQUEST_PARAMETER not in self.request.GET:
+            return render_to_csv_stream_response(**export)
+
+        viewset_path = f"{type(self).__module__}.{type(self).__qualname__}"
+        query_params = dict(self.request.GET.lists())
+        export_id = csv_export.get_export_id(
+            viewset_path, self.request.user, query_params
+        )
+        state = {"status": ExportStatus.PENDING.value, "progress": 0}
+
+        if csv_export.add_export_state(export_id, state):
+            export_csv_task.delay(
+                export_id,
+                viewset_path,
+                self.request.user.id,
+                query_params,
+                self.csv_export_bucket_type.value,
+            )
+        state = csv_export.get_export_state(export_id) or state
+
+        if state["status"] == ExportStatus.DONE.value:
+            return Response(
+                {
+                    "url": csv_export.get_export_url(
+                        export_id, self.csv_export_bucket_type, state["filename"]
+                    ),
+                    "rows": state["rows"],
+                }
+            )
+        if state["status"] == ExportStatus.FAILED.value:
+            return Response(
+                {"detail": "Export failed, please try again in a few minutes"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(
+            {
+                "detail": (
+                    f"Export is being generated, current progress {state['progress']}%"
+                ),
+                "progress": state["progress"],
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
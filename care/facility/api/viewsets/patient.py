@@ -19,7 +19,6 @@ from django.db.models.functions import Coalesce, ExtractDay, Now
 from django.db.models.query import QuerySet
 from django.utils import timezone
 from django_filters import rest_framework as filters
-from djqscsv import render_to_csv_response
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from dry_rest_permissions.generics import DRYPermissionFiltersBase, DRYPermissions
 from rest_framework import filters as rest_framework_filters
@@ -49,6 +48,7 @@ from care.facility.api.serializers.patient import (
     PatientTransferSerializer,
 )
 from care.facility.api.serializers.patient_icmr import PatientICMRSerializer
+from care.facility.api.viewsets.mixins.csv_export import CSVExportMixin
 from care.facility.api.viewsets.mixins.history import HistoryMixin
 from care.facility.events.handler import create_consultation_events
 from care.facility.models import (
@@ -79,11 +79,11 @@ from care.facility.models.patient_base import (
 )
 from care.facility.models.patient_consultation import PatientConsultation
 from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter
 from care.utils.filters.multiselect import MultiSelectFilter
 from care.utils.notification_handler import NotificationGenerator
 from care.utils.queryset.patient import get_patient_notes_queryset
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
 from config.authentication import (
     CustomBasicAuthentication,
     CustomJWTAuthentication,
@@ -318,23 +318,20 @@ class PatientDRYFilter(DRYPermissionFiltersBase):
                 ).values("id"),
                 last_consultation__last_daily_round__bed__isnull=False,
             )
-        if not request.user.is_superuser:
-            if request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-                queryset = queryset.filter(facility__state=request.user.state)
-            elif request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-                queryset = queryset.filter(facility__district=request.user.district)
-            elif view.action != "transfer":
-                allowed_facilities = get_accessible_facilities(request.user)
-                q_filters = Q(facility__id__in=allowed_facilities)
-                if view.action == "retrieve":
-                    q_filters |= Q(
-                        id__in=PatientConsultation.objects.filter(
-                            facility__id__in=allowed_facilities
-                        ).values("patient_id")
-                    )
-                q_filters |= Q(last_consultation__assigned_to=request.user)
-                q_filters |= Q(assigned_to=request.user)
-                queryset = queryset.filter(q_filters)
+        scope = get_permission_scope(request.user)
+        if scope.level != ScopeLevel.FACILITY:
+            return queryset.filter(scope.facility_filter("facility"))
+        if view.action != "transfer":
+            q_filters = scope.facility_filter("facility")
+            if view.action == "retrieve":
+                q_filters |= Q(
+                    id__in=PatientConsultation.objects.filter(
+                        scope.facility_filter("facility")
+                    ).values("patient_id")
+                )
+            q_filters |= Q(last_consultation__assigned_to=request.user)
+            q_filters |= Q(assigned_to=request.user)
+            queryset = queryset.filter(q_filters)
         return queryset
 
     def filter_list_queryset(self, request, queryset, view):
@@ -377,6 +374,7 @@ class PatientCustomOrderingFilter(BaseFilterBackend):
 @extend_schema_view(history=extend_schema(tags=["patient"]))
 class PatientViewSet(
     HistoryMixin,
+    CSVExportMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -475,7 +473,7 @@ class PatientViewSet(
         "last_consultation_encounter_date",
         "last_consultation_discharge_date",
     ]
-    CSV_EXPORT_LIMIT = 7
+    CSV_EXPORT_LIMIT = settings.PATIENT_CSV_EXPORT_LIMIT
 
     def get_queryset(self):
         queryset = super().get_queryset().order_by("modified_date")
@@ -520,6 +518,19 @@ class PatientViewSet(
 
         return super().filter_queryset(queryset)
 
+    def get_csv_export(self):
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .annotate(**PatientRegistration.CSV_ANNOTATE_FIELDS)
+            .values(*PatientRegistration.CSV_MAPPING.keys())
+        )
+        return {
+            "queryset": queryset,
+            "field_header_map": PatientRegistration.CSV_MAPPING,
+            "field_serializer_map": PatientRegistration.CSV_MAKE_PRETTY,
+            "chunk_serializer": PatientRegistration.CSV_MAKE_PRETTY_CHUNK,
+        }
+
     def list(self, request, *args, **kwargs):
         """
         Patient List
@@ -572,16 +583,7 @@ class PatientViewSet(
                     }
                 )
             # End Date Limiting Validation
-            queryset = (
-                self.filter_queryset(self.get_queryset())
-                .annotate(**PatientRegistration.CSV_ANNOTATE_FIELDS)
-                .values(*PatientRegistration.CSV_MAPPING.keys())
-            )
-            return render_to_csv_response(
-                queryset,
-                field_header_map=PatientRegistration.CSV_MAPPING,
-                field_serializer_map=PatientRegistration.CSV_MAKE_PRETTY,
-            )
+            return self.export_csv()
 
         return super().list(request, *args, **kwargs)
 
@@ -954,25 +956,13 @@ class PatientNotesEditViewSet(
             patient_note__external_id=self.kwargs.get("notes_external_id")
         )
 
-        if user.is_superuser:
-            return queryset
-        if user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(
-                patient_note__patient__facility__state=user.state
-            )
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(
-                patient_note__patient__facility__district=user.district
-            )
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            q_filters = Q(patient_note__patient__facility__id__in=allowed_facilities)
+        scope = get_permission_scope(user)
+        q_filters = scope.facility_filter("patient_note__patient__facility")
+        if scope.level == ScopeLevel.FACILITY:
             q_filters |= Q(patient_note__patient__last_consultation__assigned_to=user)
             q_filters |= Q(patient_note__patient__assigned_to=user)
             q_filters |= Q(patient_note__created_by=user)
-            queryset = queryset.filter(q_filters)
-
-        return queryset
+        return queryset.filter(q_filters)
 
 
 class PatientNotesViewSet(
@@ -1011,21 +1001,13 @@ class PatientNotesViewSet(
             last_edited_date=Subquery(last_edit_subquery.values("edited_date")[:1]),
         )
 
-        if user.is_superuser:
-            return queryset
-        if user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            queryset = queryset.filter(patient__facility__state=user.state)
-        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            queryset = queryset.filter(patient__facility__district=user.district)
-        else:
-            allowed_facilities = get_accessible_facilities(user)
-            q_filters = Q(patient__facility__id__in=allowed_facilities)
+        scope = get_permission_scope(user)
+        q_filters = scope.facility_filter("patient__facility")
+        if scope.level == ScopeLevel.FACILITY:
             q_filters |= Q(patient__last_consultation__assigned_to=user)
             q_filters |= Q(patient__assigned_to=user)
             q_filters |= Q(created_by=user)
-            queryset = queryset.filter(q_filters)
-
-        return queryset
+        return queryset.filter(q_filters)
 
     def perform_create(self, serializer):
         patient = get_object_or_404(
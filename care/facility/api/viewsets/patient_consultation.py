@@ -37,9 +37,9 @@ from care.facility.tasks.discharge_summary import (
     generate_discharge_summary_task,
 )
 from care.facility.utils.reports import discharge_summary
-from care.users.models import Skill, User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.users.models import Skill
 from care.utils.queryset.consultation import get_consultation_queryset
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
 
 
 class PatientConsultationFilter(filters.FilterSet):
@@ -94,20 +94,12 @@ class PatientConsultationViewSet(
                 "current_bed__assets",
                 "current_bed__assets__current_location",
             )
-        if self.request.user.is_superuser:
-            return self.queryset
-        if self.request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            return self.queryset.filter(
-                patient__facility__state=self.request.user.state
-            )
-        if self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            return self.queryset.filter(
-                patient__facility__district=self.request.user.district
-            )
-        allowed_facilities = get_accessible_facilities(self.request.user)
+        scope = get_permission_scope(self.request.user)
+        if scope.level != ScopeLevel.FACILITY:
+            return self.queryset.filter(scope.facility_filter("patient__facility"))
         # A user should be able to see all the consultations of a patient if the patient is active in an accessible facility
-        applied_filters = Q(
-            Q(patient__is_active=True) & Q(patient__facility__id__in=allowed_facilities)
+        applied_filters = Q(patient__is_active=True) & scope.facility_filter(
+            "patient__facility"
         )
         # A user should be able to see all consultations part of their home facility
         applied_filters |= Q(facility=self.request.user.home_facility)
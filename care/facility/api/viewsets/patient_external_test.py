@@ -4,7 +4,6 @@ from django.conf import settings
 from django_filters import Filter
 from django_filters import rest_framework as filters
 from django_filters.filters import DateFromToRangeFilter
-from djqscsv import render_to_csv_response
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
@@ -24,6 +23,7 @@ from care.facility.api.serializers.patient_external_test import (
     PatientExternalTestSerializer,
     PatientExternalTestUpdateSerializer,
 )
+from care.facility.api.viewsets.mixins.csv_export import CSVExportMixin
 from care.facility.models import PatientExternalTest
 from care.users.models import User
 
@@ -77,6 +77,7 @@ class PatientExternalTestPermission(BasePermission):
 
 
 class PatientExternalTestViewSet(
+    CSVExportMixin,
     RetrieveModelMixin,
     ListModelMixin,
     UpdateModelMixin,
@@ -127,16 +128,19 @@ class PatientExternalTestViewSet(
             or self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]
         )
 
+    def get_csv_export(self):
+        mapping = PatientExternalTest.CSV_MAPPING.copy()
+        pretty_mapping = PatientExternalTest.CSV_MAKE_PRETTY.copy()
+        queryset = self.filter_queryset(self.get_queryset()).values(*mapping.keys())
+        return {
+            "queryset": queryset,
+            "field_header_map": mapping,
+            "field_serializer_map": pretty_mapping,
+        }
+
     def list(self, request, *args, **kwargs):
         if settings.CSV_REQUEST_PARAMETER in request.GET:
-            mapping = PatientExternalTest.CSV_MAPPING.copy()
-            pretty_mapping = PatientExternalTest.CSV_MAKE_PRETTY.copy()
-            queryset = self.filter_queryset(self.get_queryset()).values(*mapping.keys())
-            return render_to_csv_response(
-                queryset,
-                field_header_map=mapping,
-                field_serializer_map=pretty_mapping,
-            )
+            return self.export_csv()
         return super().list(request, *args, **kwargs)
 
     @extend_schema(tags=["external_result"])
@@ -29,10 +29,10 @@ from care.facility.models.patient_investigation import (
     PatientInvestigationGroup,
 )
 from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.cache.patient_investigation import get_investigation_id
 from care.utils.filters.multiselect import MultiSelectFilter
 from care.utils.notification_handler import NotificationGenerator
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
 
 
 class InvestigationGroupFilter(filters.FilterSet):
@@ -121,18 +121,10 @@ class PatientInvestigationSummaryViewSet(
         if not sessions.exists():
             return self.queryset.none()
         queryset = queryset.filter(session_id__in=sessions.values("session_id"))
-        if self.request.user.is_superuser:
-            return queryset
-        if self.request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            return queryset.filter(
-                consultation__patient__facility__state=self.request.user.state
-            )
-        if self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            return queryset.filter(
-                consultation__patient__facility__district=self.request.user.district
-            )
-        allowed_facilities = get_accessible_facilities(self.request.user)
-        filters = Q(consultation__patient__facility_id__in=allowed_facilities)
+        scope = get_permission_scope(self.request.user)
+        filters = scope.facility_filter("consultation__patient__facility")
+        if scope.level != ScopeLevel.FACILITY:
+            return queryset.filter(filters)
         filters |= Q(consultation__assigned_to=self.request.user)
         filters |= Q(consultation__patient__assigned_to=self.request.user)
         return queryset.filter(filters)
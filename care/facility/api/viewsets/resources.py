@@ -1,5 +1,4 @@
 from django.conf import settings
-from django.db.models.query_utils import Q
 from django_filters import rest_framework as filters
 from djqscsv import render_to_csv_response
 from dry_rest_permissions.generics import DRYPermissions
@@ -18,11 +17,10 @@ from care.facility.models import (
     RESOURCE_STATUS_CHOICES,
     ResourceRequest,
     ResourceRequestComment,
-    User,
 )
 from care.facility.models.resources import RESOURCE_SUB_CATEGORY_CHOICES
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter
+from care.utils.queryset.scope import get_permission_scope
 
 
 def inverse_choices(choices):
@@ -37,26 +35,16 @@ inverse_category = inverse_choices(RESOURCE_CATEGORY_CHOICES)
 inverse_sub_category = inverse_choices(RESOURCE_SUB_CATEGORY_CHOICES)
 
 
-def get_request_queryset(request, queryset):
-    if request.user.is_superuser:
-        pass
-    else:
-        if request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-            q_objects = Q(origin_facility__state=request.user.state)
-            q_objects |= Q(approving_facility__state=request.user.state)
-            q_objects |= Q(assigned_facility__state=request.user.state)
-            return queryset.filter(q_objects)
-        if request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-            q_objects = Q(origin_facility__district=request.user.district)
-            q_objects |= Q(approving_facility__district=request.user.district)
-            q_objects |= Q(assigned_facility__district=request.user.district)
-            return queryset.filter(q_objects)
-        facility_ids = get_accessible_facilities(request.user)
-        q_objects = Q(origin_facility__id__in=facility_ids)
-        q_objects |= Q(approving_facility__id__in=facility_ids)
-        q_objects |= Q(assigned_facility__id__in=facility_ids)
-        queryset = queryset.filter(q_objects)
-    return queryset
+def get_request_queryset(request, queryset, prefix=""):
+    """
+    Restricts the queryset of resource requests, or of the models related to
+    them at `prefix`, to the requests of the facilities of the user's scope.
+    """
+    scope = get_permission_scope(request.user)
+    q_objects = scope.facility_filter(f"{prefix}origin_facility")
+    q_objects |= scope.facility_filter(f"{prefix}approving_facility")
+    q_objects |= scope.facility_filter(f"{prefix}assigned_facility")
+    return queryset.filter(q_objects)
 
 
 class ResourceFilterSet(filters.FilterSet):
@@ -153,35 +141,7 @@ class ResourceRequestCommentViewSet(
         queryset = self.queryset.filter(
             request__external_id=self.kwargs.get("resource_external_id")
         )
-        if self.request.user.is_superuser:
-            pass
-        else:
-            if self.request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-                q_objects = Q(request__origin_facility__state=self.request.user.state)
-                q_objects |= Q(
-                    request__approving_facility__state=self.request.user.state
-                )
-                q_objects |= Q(
-                    request__assigned_facility__state=self.request.user.state
-                )
-                return queryset.filter(q_objects)
-            if self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-                q_objects = Q(
-                    request__origin_facility__district=self.request.user.district
-                )
-                q_objects |= Q(
-                    request__approving_facility__district=self.request.user.district
-                )
-                q_objects |= Q(
-                    request__assigned_facility__district=self.request.user.district
-                )
-                return queryset.filter(q_objects)
-            facility_ids = get_accessible_facilities(self.request.user)
-            q_objects = Q(request__origin_facility__id__in=facility_ids)
-            q_objects |= Q(request__approving_facility__id__in=facility_ids)
-            q_objects |= Q(request__assigned_facility__id__in=facility_ids)
-            queryset = queryset.filter(q_objects)
-        return queryset
+        return get_request_queryset(self.request, queryset, prefix="request__")
 
     def get_request(self):
         queryset = get_request_queryset(self.request, ResourceRequest.objects.all())
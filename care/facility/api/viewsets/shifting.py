@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.db.models.query import QuerySet
-from django.db.models.query_utils import Q
 from django.utils.timezone import localtime, now
 from django_filters import rest_framework as filters
 from djqscsv import render_to_csv_response
@@ -30,14 +29,13 @@ from care.facility.models import (
     PatientConsultation,
     ShiftingRequest,
     ShiftingRequestComment,
-    User,
 )
 from care.facility.models.patient_base import (
     DISEASE_STATUS_DICT,
     NewDischargeReasonEnum,
 )
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
 from care.utils.queryset.shifting import get_shifting_queryset
 
 
@@ -54,7 +52,7 @@ inverse_breathlessness_level = inverse_choices(BREATHLESSNESS_CHOICES)
 
 class ShiftingFilterBackend(DRYPermissionFiltersBase):
     def filter_queryset(self, request, queryset, view):
-        return get_shifting_queryset(request.user)
+        return get_shifting_queryset(request.user, queryset)
 
 
 class ShiftingFilterSet(filters.FilterSet):
@@ -115,6 +113,8 @@ class ShiftingViewSet(
                 "shifting_approving_facility",
                 "assigned_facility",
                 "patient",
+                "patient__facility",
+                "patient__state",
             )
 
         else:
@@ -229,36 +229,15 @@ class ShifitngRequestCommentViewSet(
         queryset = self.queryset.filter(
             request__external_id=self.kwargs.get("shift_external_id")
         )
-        if self.request.user.is_superuser:
-            pass
-        else:
-            if self.request.user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-                q_objects = Q(request__origin_facility__state=self.request.user.state)
-                q_objects |= Q(
-                    request__shifting_approving_facility__state=self.request.user.state
-                )
-                q_objects |= Q(
-                    request__assigned_facility__state=self.request.user.state
-                )
-                return queryset.filter(q_objects)
-            if self.request.user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-                q_objects = Q(
-                    request__origin_facility__district=self.request.user.district
-                )
-                q_objects |= Q(
-                    request__shifting_approving_facility__district=self.request.user.district
-                )
-                q_objects |= Q(
-                    request__assigned_facility__district=self.request.user.district
-                )
-                return queryset.filter(q_objects)
-            facility_ids = get_accessible_facilities(self.request.user)
-            q_objects = Q(request__origin_facility__id__in=facility_ids)
-            q_objects |= Q(request__shifting_approving_facility__id__in=facility_ids)
-            q_objects |= Q(request__assigned_facility__id__in=facility_ids)
-            q_objects |= Q(request__patient__facility__id__in=facility_ids)
-            queryset = queryset.filter(q_objects)
-        return queryset
+        scope = get_permission_scope(self.request.user)
+        if scope.is_superuser:
+            return queryset
+        q_objects = scope.facility_filter("request__origin_facility")
+        q_objects |= scope.facility_filter("request__shifting_approving_facility")
+        q_objects |= scope.facility_filter("request__assigned_facility")
+        if scope.level == ScopeLevel.FACILITY:
+            q_objects |= scope.facility_filter("request__patient__facility")
+        return queryset.filter(q_objects)
 
     def get_request(self):
         queryset = get_shifting_queryset(self.request.user)
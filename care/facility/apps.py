@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 
@@ -8,3 +9,8 @@ class FacilityConfig(AppConfig):
 
     def ready(self):
         import care.facility.signals  # noqa F401
+
+        if settings.ENABLE_REQUEST_INSTRUMENTATION:
+            from care.utils.instrumentation import connect_metrics_push
+
+            connect_metrics_push()
@@ -1,17 +1,29 @@
+import operator
+from collections import defaultdict
 from contextlib import suppress
 from datetime import datetime
+from functools import reduce
 
 from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
-from django.db.models import Model
+from django.db.models import Model, Q
 from django.db.models.query import QuerySet
 from django.utils.timezone import now
 
-from care.facility.models.events import ChangeType, EventType, PatientConsultationEvent
+from care.facility.models.events import ChangeType, PatientConsultationEvent
+from care.utils.cache.event_types import get_event_type_groups
 from care.utils.event_utils import get_changed_fields, serialize_field
 
 
-def create_consultation_event_entry(
+def serialize_event_value(object_instance: Model, fields: list[str]) -> dict:
+    value = {}
+    for field in fields:
+        with suppress(FieldDoesNotExist):
+            value[field] = serialize_field(object_instance, field)
+    return value
+
+
+def build_consultation_events(
     consultation_id: int,
     object_instance: Model,
     caused_by: int,
@@ -19,7 +31,7 @@ def create_consultation_event_entry(
     taken_at: datetime,
     old_instance: Model | None = None,
     fields_to_store: set[str] | None = None,
-):
+) -> list[PatientConsultationEvent]:
     change_type = ChangeType.UPDATED if old_instance else ChangeType.CREATED
 
     fields: set[str] = (
@@ -31,32 +43,17 @@ def create_consultation_event_entry(
     fields_to_store = fields_to_store & fields if fields_to_store else fields
 
     batch = []
-    groups = EventType.objects.filter(
-        model=object_instance.__class__.__name__, fields__len__gt=0, is_active=True
-    ).values_list("id", "fields")
-    for group_id, group_fields in groups:
-        if fields_to_store & {field.split("__", 1)[0] for field in group_fields}:
-            value = {}
-            for field in group_fields:
-                with suppress(FieldDoesNotExist):
-                    value[field] = serialize_field(object_instance, field)
-
+    for group in get_event_type_groups(object_instance.__class__.__name__):
+        if fields_to_store & {field.split("__", 1)[0] for field in group.fields}:
+            value = serialize_event_value(object_instance, group.fields)
             if all(not v for v in value.values()):
                 continue
 
-            PatientConsultationEvent.objects.select_for_update().filter(
-                consultation_id=consultation_id,
-                event_type=group_id,
-                is_latest=True,
-                object_model=object_instance.__class__.__name__,
-                object_id=object_instance.id,
-                taken_at__lt=taken_at,
-            ).update(is_latest=False)
             batch.append(
                 PatientConsultationEvent(
                     consultation_id=consultation_id,
                     caused_by_id=caused_by,
-                    event_type_id=group_id,
+                    event_type_id=group.id,
                     is_latest=True,
                     created_date=created_date,
                     taken_at=taken_at,
@@ -70,11 +67,68 @@ def create_consultation_event_entry(
                     },
                 )
             )
+    return batch
+
+
+def save_consultation_events(
+    consultation_id: int, taken_at: datetime, batch: list[PatientConsultationEvent]
+) -> int:
+    """
+    Marks the events the batch supersedes as no longer the latest ones, with
+    a single update, and inserts the batch.
+    """
+    if not batch:
+        return 0
+
+    event_types_by_object = defaultdict(set)
+    for event in batch:
+        event_types_by_object[event.object_model, event.object_id].add(
+            event.event_type_id
+        )
+    PatientConsultationEvent.objects.filter(
+        reduce(
+            operator.or_,
+            (
+                Q(
+                    object_model=object_model,
+                    object_id=object_id,
+                    event_type_id__in=event_type_ids,
+                )
+                for (object_model, object_id), event_type_ids in (
+                    event_types_by_object.items()
+                )
+            ),
+        ),
+        consultation_id=consultation_id,
+        is_latest=True,
+        taken_at__lt=taken_at,
+    ).update(is_latest=False)
 
     PatientConsultationEvent.objects.bulk_create(batch)
     return len(batch)
 
 
+def create_consultation_event_entry(
+    consultation_id: int,
+    object_instance: Model,
+    caused_by: int,
+    created_date: datetime,
+    taken_at: datetime,
+    old_instance: Model | None = None,
+    fields_to_store: set[str] | None = None,
+):
+    batch = build_consultation_events(
+        consultation_id,
+        object_instance,
+        caused_by,
+        created_date,
+        taken_at,
+        old_instance,
+        fields_to_store,
+    )
+    return save_consultation_events(consultation_id, taken_at, batch)
+
+
 def create_consultation_events(
     consultation_id: int,
     objects: list | QuerySet | Model,
@@ -84,33 +138,43 @@ def create_consultation_events(
     old: Model | None = None,
     fields_to_store: list[str] | set[str] | None = None,
 ):
+    """
+    Creates the events of the objects, all of them being written with a
+    constant number of queries.
+    """
     if created_date is None:
         created_date = now()
 
     if taken_at is None:
         taken_at = created_date
 
-    with transaction.atomic():
-        if isinstance(objects, QuerySet | list | tuple):
-            if old is not None:
-                msg = "diff is not available when objects is a list or queryset"
-                raise ValueError(msg)
-            for obj in objects:
-                create_consultation_event_entry(
-                    consultation_id,
-                    obj,
-                    caused_by,
-                    created_date,
-                    taken_at,
-                    fields_to_store=set(fields_to_store) if fields_to_store else None,
-                )
-        else:
-            create_consultation_event_entry(
+    fields_to_store = set(fields_to_store) if fields_to_store else None
+    if isinstance(objects, QuerySet | list | tuple):
+        if old is not None:
+            msg = "diff is not available when objects is a list or queryset"
+            raise ValueError(msg)
+        batch = [
+            event
+            for obj in objects
+            for event in build_consultation_events(
                 consultation_id,
-                objects,
+                obj,
                 caused_by,
                 created_date,
                 taken_at,
-                old,
-                fields_to_store=set(fields_to_store) if fields_to_store else None,
+                fields_to_store=fields_to_store,
             )
+        ]
+    else:
+        batch = build_consultation_events(
+            consultation_id,
+            objects,
+            caused_by,
+            created_date,
+            taken_at,
+            old,
+            fields_to_store=fields_to_store,
+        )
+
+    with transaction.atomic():
+        return save_consultation_events(consultation_id, taken_at, batch)
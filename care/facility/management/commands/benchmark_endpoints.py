@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+from django.core.management import BaseCommand, CommandError
+from django.utils import timezone
+
+from care.facility.models import Facility, PatientRegistration
+from care.facility.models.asset import Asset
+from care.facility.models.daily_round import DailyRound
+from care.facility.utils.benchmark import get_benchmark_endpoints, run_benchmark
+from care.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Command to measure the queries, wall time and peak memory of the hottest
+    endpoints, failing when an endpoint runs more queries than its budget.
+    Seed the data with `seed_benchmark_data` first.
+    Usage: python manage.py benchmark_endpoints --output benchmark.json
+    """
+
+    help = "Benchmarks the hottest REST endpoints against their query budgets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", default="benchmark")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of times every endpoint is requested",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Path of the JSON artifact with the results",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            msg = f"User {options['username']} does not exist, run seed_benchmark_data"
+            raise CommandError(msg)
+
+        results = run_benchmark(user, get_benchmark_endpoints(), options["repeat"])
+
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "repeat": options["repeat"],
+            "volumes": {
+                "facilities": Facility.objects.count(),
+                "patients": PatientRegistration.objects.count(),
+                "daily_rounds": DailyRound.objects.count(),
+                "assets": Asset.objects.count(),
+            },
+            "endpoints": [result.as_dict() for result in results],
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2))
+
+        for result in results:
+            self.stdout.write(
+                f"{result.name}: {result.status_code}, "
+                f"{result.queries}/{result.query_budget} queries, "
+                f"{result.wall_time_ms['median']}ms, {result.peak_memory_kb}KB"
+            )
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if over_budget := [result.name for result in results if result.over_budget]:
+            msg = f"Query budget exceeded by {', '.join(over_budget)}"
+            raise CommandError(msg)
@@ -0,0 +1,92 @@
+import statistics
+import time
+
+from django.core.management import BaseCommand
+
+from care.facility.static_data.icd11 import icd11_search_index, search_icd11
+from care.facility.static_data.medibase import (
+    medibase_search_index,
+    search_medibase_medicines,
+)
+
+ICD11_QUERIES = [
+    "a",
+    "fev",
+    "fever",
+    "acute radio",
+    "haemorrhage rectum",
+    "chronic obstructive pulmonary",
+    "ME24.A1",
+    "1A00 Cholera",
+]
+MEDIBASE_QUERIES = [
+    "p",
+    "para",
+    "paracetamol",
+    "dolo",
+    "panadol paracetamol",
+    "amoxicillin clav",
+]
+
+
+class Command(BaseCommand):
+    """
+    Command to compare the latency of the redis and in-memory search backends
+    of the ICD11 and Medibase autocomplete.
+    Usage: python manage.py benchmark_static_data_search --iterations 50
+    """
+
+    help = "Benchmarks the ICD11 and Medibase search backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Number of times every query is run on each backend",
+        )
+
+    def measure(self, search, queries, iterations):
+        timings = []
+        for _ in range(iterations):
+            for query in queries:
+                started_at = time.perf_counter()
+                search(query)
+                timings.append((time.perf_counter() - started_at) * 1000)
+        percentiles = statistics.quantiles(timings, n=100)
+        return percentiles[49], percentiles[98]
+
+    def handle(self, *args, **options):
+        started_at = time.perf_counter()
+        icd11_search_index.get()
+        medibase_search_index.get()
+        self.stdout.write(
+            f"Built in-memory indexes in {time.perf_counter() - started_at:.2f}s"
+        )
+
+        benchmarks = {
+            "icd11": (
+                lambda query, backend: search_icd11(query, 20, backend=backend),
+                ICD11_QUERIES,
+            ),
+            "medibase": (
+                lambda query, backend: search_medibase_medicines(
+                    query, None, 30, backend=backend
+                ),
+                MEDIBASE_QUERIES,
+            ),
+        }
+        for name, (search, queries) in benchmarks.items():
+            for backend in ("redis", "memory"):
+                try:
+                    p50, p99 = self.measure(
+                        lambda query, backend=backend, search=search: search(
+                            query, backend
+                        ),
+                        queries,
+                        options["iterations"],
+                    )
+                except Exception as e:
+                    self.stdout.write(f"{name} {backend}: failed, {e!r}")
+                    continue
+                self.stdout.write(f"{name} {backend}: p50 {p50:.2f}ms, p99 {p99:.2f}ms")
@@ -10,6 +10,8 @@ from django.db.models.signals import (
     pre_save,
 )
 
+from care.facility.tasks.facility_counts import reconcile_facility_counts
+
 
 class Command(BaseCommand):
     """
@@ -51,6 +53,8 @@ class Command(BaseCommand):
                 self.BASE_URL + "facility.json",
             )
             management.call_command("populate_investigations")
+            # the fixtures are loaded without the signals updating the counters
+            reconcile_facility_counts()
         except Exception as e:
             raise CommandError(e) from e
         finally:
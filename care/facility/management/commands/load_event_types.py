@@ -3,6 +3,7 @@ from typing import TypedDict
 from django.core.management import BaseCommand
 
 from care.facility.models.events import EventType
+from care.utils.cache.event_types import invalidate_event_type_groups
 
 
 class EventTypeDef(TypedDict, total=False):
@@ -298,5 +299,7 @@ class Command(BaseCommand):
         )
 
         self.create_objects(self.consultation_event_types)
+        # the bulk update above sends no signals
+        invalidate_event_type_groups()
 
         self.stdout.write(self.style.SUCCESS("OK"))
@@ -0,0 +1,244 @@
+import os
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from care.facility.models import (
+    Facility,
+    PatientConsultation,
+    PatientRegistration,
+    ShiftingRequest,
+)
+from care.facility.models.asset import Asset, AssetLocation
+from care.facility.models.daily_round import DailyRound
+from care.facility.models.notification import Notification
+from care.facility.tasks.facility_counts import reconcile_facility_counts
+from care.users.models import District, LocalBody, State, User
+
+
+class Command(BaseCommand):
+    """
+    Management command to seed the volumes of data the endpoint benchmarks
+    are run against. Not for production use.
+    Usage: python manage.py seed_benchmark_data --patients 100000
+    """
+
+    help = "Seeds facilities, patients, daily rounds and assets for benchmarks"
+
+    BENCHMARK_USERNAME = "benchmark"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--facilities", type=int, default=500)
+        parser.add_argument("--patients", type=int, default=100_000)
+        parser.add_argument("--daily-rounds", type=int, default=1_000_000)
+        parser.add_argument("--assets", type=int, default=5_000)
+        parser.add_argument("--shifts", type=int, default=1_000)
+        parser.add_argument("--notifications", type=int, default=10_000)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def bulk_create(self, model, objects, batch_size):
+        """
+        Creates the objects of a generator in batches, so that the objects
+        of only one batch are in memory at a time.
+        """
+        created = []
+        while batch := list(islice(objects, batch_size)):
+            created.extend(
+                obj.id for obj in model.objects.bulk_create(batch, batch_size)
+            )
+        verbose_name = model._meta.verbose_name_plural  # noqa: SLF001
+        self.stdout.write(f"Created {len(created)} {verbose_name}")
+        return created
+
+    def handle(self, *args, **options):
+        env = os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+        if "production" in env or "staging" in env:
+            msg = "This command is not intended to be run in production environment."
+            raise CommandError(msg)
+
+        batch_size = options["batch_size"]
+        now = timezone.now()
+
+        with transaction.atomic():
+            state, _ = State.objects.get_or_create(name="Benchmark State")
+            district, _ = District.objects.get_or_create(
+                state=state, name="Benchmark District"
+            )
+            local_body, _ = LocalBody.objects.get_or_create(
+                district=district,
+                name="Benchmark Local Body",
+                defaults={"body_type": 10, "localbody_code": "BENCH01"},
+            )
+            user = User.objects.filter(username=self.BENCHMARK_USERNAME).first()
+            if user is None:
+                user = User.objects.create_user(
+                    username=self.BENCHMARK_USERNAME,
+                    is_superuser=True,
+                    password=self.BENCHMARK_USERNAME,
+                    email=f"{self.BENCHMARK_USERNAME}@care.local",
+                    phone_number="9999999999",
+                    user_type=User.TYPE_VALUE_MAP["StateAdmin"],
+                    state=state,
+                    district=district,
+                    gender=2,
+                    date_of_birth=date(1990, 1, 1),
+                )
+
+            facility_ids = self.bulk_create(
+                Facility,
+                (
+                    Facility(
+                        name=f"Benchmark Facility {i}",
+                        facility_type=2,
+                        address="Benchmark Address",
+                        state=state,
+                        district=district,
+                        local_body=local_body,
+                        created_by=user,
+                    )
+                    for i in range(options["facilities"])
+                ),
+                batch_size,
+            )
+            if not facility_ids:
+                return
+
+            location_ids = self.bulk_create(
+                AssetLocation,
+                (
+                    AssetLocation(
+                        name="Benchmark Ward", location_type=1, facility_id=facility_id
+                    )
+                    for facility_id in facility_ids
+                ),
+                batch_size,
+            )
+            self.bulk_create(
+                Asset,
+                (
+                    Asset(
+                        name=f"Benchmark Asset {i}",
+                        asset_type=50,
+                        current_location_id=location_ids[i % len(location_ids)],
+                    )
+                    for i in range(options["assets"])
+                ),
+                batch_size,
+            )
+
+            patient_ids = self.bulk_create(
+                PatientRegistration,
+                (
+                    PatientRegistration(
+                        name=f"Benchmark Patient {i}",
+                        gender=random.choice((1, 2, 3)),  # noqa: S311
+                        date_of_birth=date(1950 + i % 70, 1, 1),
+                        year_of_birth=1950 + i % 70,
+                        is_antenatal=False,
+                        phone_number="+919999999999",
+                        address="Benchmark Address",
+                        state=state,
+                        district=district,
+                        local_body=local_body,
+                        facility_id=facility_ids[i % len(facility_ids)],
+                        # one in five patients is discharged
+                        is_active=i % 5 != 0,
+                        created_by=user,
+                    )
+                    for i in range(options["patients"])
+                ),
+                batch_size,
+            )
+            if not patient_ids:
+                return
+
+            consultation_ids = self.bulk_create(
+                PatientConsultation,
+                (
+                    PatientConsultation(
+                        patient_id=patient_id,
+                        facility_id=facility_ids[i % len(facility_ids)],
+                        category="Stable",
+                        suggestion="A",
+                        route_to_facility=10,
+                        encounter_date=now - timedelta(days=i % 30),
+                        discharge_date=now if i % 5 == 0 else None,
+                        patient_no=f"IP{i}",
+                        created_by=user,
+                    )
+                    for i, patient_id in enumerate(patient_ids)
+                ),
+                batch_size,
+            )
+            PatientRegistration.objects.bulk_update(
+                [
+                    PatientRegistration(
+                        id=patient_id, last_consultation_id=consultation_id
+                    )
+                    for patient_id, consultation_id in zip(
+                        patient_ids, consultation_ids, strict=True
+                    )
+                ],
+                ["last_consultation"],
+                batch_size=batch_size,
+            )
+
+            self.bulk_create(
+                DailyRound,
+                (
+                    DailyRound(
+                        consultation_id=consultation_ids[i % len(consultation_ids)],
+                        taken_at=now - timedelta(hours=i // len(consultation_ids)),
+                        rounds_type=DailyRound.RoundsType.NORMAL.value,
+                        temperature=random.randint(97, 102),  # noqa: S311
+                        pulse=random.randint(60, 120),  # noqa: S311
+                        resp=random.randint(12, 30),  # noqa: S311
+                        bp={"systolic": 120, "diastolic": 80},
+                        created_by=user,
+                    )
+                    for i in range(options["daily_rounds"])
+                ),
+                batch_size,
+            )
+
+            self.bulk_create(
+                ShiftingRequest,
+                (
+                    ShiftingRequest(
+                        origin_facility_id=facility_ids[i % len(facility_ids)],
+                        shifting_approving_facility_id=facility_ids[
+                            (i + 1) % len(facility_ids)
+                        ],
+                        assigned_facility_id=facility_ids[(i + 1) % len(facility_ids)],
+                        patient_id=patient_ids[i % len(patient_ids)],
+                        reason="Benchmark",
+                        refering_facility_contact_number="9999999999",
+                        created_by=user,
+                        last_edited_by=user,
+                    )
+                    for i in range(options["shifts"])
+                ),
+                batch_size,
+            )
+
+            self.bulk_create(
+                Notification,
+                (
+                    Notification(
+                        intended_for=user,
+                        caused_by=user,
+                        event=Notification.Event.PATIENT_CONSULTATION_UPDATE_CREATED.value,
+                        message=f"Benchmark Notification {i}",
+                        caused_objects={},
+                    )
+                    for i in range(options["notifications"])
+                ),
+                batch_size,
+            )
+
+        # the objects are created without the signals updating the counters
+        reconcile_facility_counts()
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:35
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("facility", "0466_camera_presets"),
+    ]
+
+    def backfill_facility_counters(apps, schema_editor):
+        Bed = apps.get_model("facility", "Bed")
+        Facility = apps.get_model("facility", "Facility")
+        PatientRegistration = apps.get_model("facility", "PatientRegistration")
+
+        def count_subquery(queryset):
+            return Coalesce(
+                Subquery(
+                    queryset.order_by()
+                    .values("facility")
+                    .annotate(count=Count("id"))
+                    .values("count"),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+
+        Facility.objects.update(
+            bed_count=count_subquery(
+                Bed.objects.filter(facility=OuterRef("pk"), deleted=False)
+            ),
+            patient_count=count_subquery(
+                PatientRegistration.objects.filter(
+                    facility=OuterRef("pk"), is_active=True, deleted=False
+                )
+            ),
+        )
+
+    operations = [
+        migrations.AddField(
+            model_name="facility",
+            name="bed_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="facility",
+            name="patient_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(
+            backfill_facility_counters,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:57
+
+import uuid
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("facility", "0467_facility_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AutomatedVitals",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("external_id", models.UUIDField(default=uuid.uuid4, unique=True)),
+                ("taken_at", models.DateTimeField()),
+                (
+                    "temperature",
+                    models.DecimalField(
+                        decimal_places=2, default=None, max_digits=5, null=True
+                    ),
+                ),
+                ("pulse", models.SmallIntegerField(default=None, null=True)),
+                ("resp", models.SmallIntegerField(default=None, null=True)),
+                ("ventilator_spo2", models.SmallIntegerField(default=None, null=True)),
+                ("bp_systolic", models.SmallIntegerField(default=None, null=True)),
+                ("bp_diastolic", models.SmallIntegerField(default=None, null=True)),
+                ("samples", models.PositiveSmallIntegerField(default=1)),
+                (
+                    "consultation",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="automated_vitals",
+                        to="facility.patientconsultation",
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["consultation", "taken_at"],
+                        name="facility_au_consult_b104a7_idx",
+                    ),
+                    django.contrib.postgres.indexes.BrinIndex(
+                        fields=["taken_at"], name="automated_vitals_taken_at_brin"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("facility", "0468_automated_vitals"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="patientconsultationevent",
+            index=models.Index(
+                fields=["consultation", "-taken_at", "-id"],
+                name="consultation_event_timeline",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="patientconsultationevent",
+            index=models.Index(
+                condition=models.Q(("is_latest", True)),
+                fields=["consultation", "event_type", "-taken_at", "-id"],
+                name="consultation_event_latest",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.1 on 2026-10-18 06:19
+
+from django.db import migrations, models
+
+
+def backfill_event_type_paths(apps, schema_editor):
+    EventType = apps.get_model("facility", "EventType")
+
+    event_types = {event_type.id: event_type for event_type in EventType.objects.all()}
+
+    def get_path(event_type):
+        if not event_type.path:
+            parent = event_types.get(event_type.parent_id)
+            parent_path = get_path(parent) if parent else "/"
+            event_type.path = f"{parent_path}{event_type.id}/"
+        return event_type.path
+
+    for event_type in event_types.values():
+        get_path(event_type)
+    EventType.objects.bulk_update(event_types.values(), ["path"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("facility", "0469_consultation_event_timeline_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventtype",
+            name="path",
+            field=models.CharField(default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="eventtype",
+            index=models.Index(
+                fields=["path"],
+                name="event_type_path",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.RunPython(
+            backfill_event_type_paths, reverse_code=migrations.RunPython.noop
+        ),
+    ]
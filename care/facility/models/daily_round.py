@@ -1,5 +1,7 @@
+import uuid
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import BrinIndex
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import JSONField
@@ -659,3 +661,52 @@ class DailyRound(PatientBaseModel):
         return AssetBed.objects.filter(
             asset=request.user.asset, bed=consultation.current_bed.bed
         ).exists()
+
+
+class AutomatedVitals(models.Model):
+    """
+    Compact storage of the vitals of the automated rounds posted by monitors,
+    one narrow row per round, used instead of DailyRound when the
+    AUTOMATED_VITALS_COMPACT_STORAGE setting is enabled. Rows older than
+    AUTOMATED_VITALS_ROLLUP_AFTER_DAYS are rolled up into hourly averages,
+    `samples` being the number of rounds averaged in a row.
+    """
+
+    # uuid5 namespace of the ids of the events built from this table
+    EXTERNAL_ID_NAMESPACE = uuid.UUID("8d2d3ac4-4a3c-4f55-9a0e-6a1f3c0f1b7e")
+
+    # the id of the round read from the row, kept when it is edited as a
+    # DailyRound, and by the hourly average of the rows it is rolled up into
+    external_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    consultation = models.ForeignKey(
+        PatientConsultation,
+        on_delete=models.PROTECT,
+        related_name="automated_vitals",
+        db_index=False,
+    )
+    taken_at = models.DateTimeField()
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_index=False,
+    )
+    temperature = models.DecimalField(
+        decimal_places=2, max_digits=5, default=None, null=True
+    )
+    pulse = models.SmallIntegerField(default=None, null=True)
+    resp = models.SmallIntegerField(default=None, null=True)
+    ventilator_spo2 = models.SmallIntegerField(default=None, null=True)
+    bp_systolic = models.SmallIntegerField(default=None, null=True)
+    bp_diastolic = models.SmallIntegerField(default=None, null=True)
+    samples = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["consultation", "taken_at"]),
+            BrinIndex(fields=["taken_at"], name="automated_vitals_taken_at_brin"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.consultation_id} - {self.taken_at}"
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 
 from care.utils.event_utils import CustomJSONEncoder
 from care.utils.ulid.models import ULIDField
@@ -30,6 +32,17 @@ class EventType(models.Model):
     fields = ArrayField(models.CharField(max_length=50), default=list)
     created_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    # ids of the event types from the root to this one, as "/<id>/<id>/"
+    path = models.CharField(max_length=255, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["path"],
+                name="event_type_path",
+                opclasses=["varchar_pattern_ops"],
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.model} - {self.name}"
@@ -37,13 +50,42 @@ class EventType(models.Model):
     def save(self, *args, **kwargs):
         if self.description is not None and not self.description.strip():
             self.description = None
-        return super().save(*args, **kwargs)
+        result = super().save(*args, **kwargs)
+        path = f"{self.parent.get_path() if self.parent_id else '/'}{self.id}/"
+        if path != self.path:
+            old_path, self.path = self.path, path
+            if old_path:
+                # the paths of the descendants are moved along
+                EventType.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(path), Substr("path", len(old_path) + 1))
+                )
+            else:
+                EventType.objects.filter(id=self.id).update(path=path)
+        return result
+
+    def get_path(self) -> str:
+        """
+        Returns the path of the event type, computed from its parents when it
+        is not stored, as for the event types created in bulk.
+        """
+        if self.path:
+            return self.path
+        if self.pk is None:
+            msg = "The event type must be saved to have a path"
+            raise ValueError(msg)
+        return f"{self.parent.get_path() if self.parent_id else '/'}{self.id}/"
+
+    def get_descendants(self, include_self: bool = False):
+        # an empty path would match every event type
+        descendants = EventType.objects.filter(path__startswith=self.get_path())
+        if include_self:
+            return descendants
+        return descendants.exclude(id=self.id)
 
-    def get_descendants(self):
-        descendants = list(self.children.all())
-        for child in self.children.all():
-            descendants.extend(child.get_descendants())
-        return descendants
+    def get_ancestors(self):
+        return EventType.objects.filter(
+            id__in=[int(id_) for id_ in self.get_path().strip("/").split("/")[:-1]]
+        )
 
 
 class PatientConsultationEvent(models.Model):
@@ -70,7 +112,20 @@ class PatientConsultationEvent(models.Model):
 
     class Meta:
         ordering = ["-created_date"]
-        indexes = [models.Index(fields=["consultation", "is_latest"])]
+        indexes = [
+            models.Index(fields=["consultation", "is_latest"]),
+            # pages of the timeline, read from the position of the cursor
+            models.Index(
+                fields=["consultation", "-taken_at", "-id"],
+                name="consultation_event_timeline",
+            ),
+            # the latest event of every event type, with distinct on event_type
+            models.Index(
+                fields=["consultation", "event_type", "-taken_at", "-id"],
+                condition=models.Q(is_latest=True),
+                name="consultation_event_latest",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} - {self.consultation_id} - {self.event_type} - {self.change_type}"
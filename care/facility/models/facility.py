@@ -271,6 +271,12 @@ class Facility(FacilityBaseModel, FacilityPermissionMixin):
     )
     middleware_address = models.CharField(null=True, default=None, max_length=200)
 
+    # maintained by care.facility.signals.facility_counts
+    bed_count = models.IntegerField(default=0)
+    patient_count = models.IntegerField(default=0)
+
+    COUNTER_FIELDS = ("bed_count", "patient_count")
+
     class Meta:
         verbose_name_plural = "Facilities"
 
@@ -293,6 +299,17 @@ class Facility(FacilityBaseModel, FacilityPermissionMixin):
             self.state = self.district.state
 
         is_create = self.pk is None
+        if not (is_create or kwargs.get("force_insert")) and (
+            kwargs.get("update_fields") is None
+        ):
+            # the counters are updated in the database as beds and patients
+            # change, the values of this instance may be outdated
+            excluded_fields = {*self.COUNTER_FIELDS, *self.get_deferred_fields()}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in excluded_fields
+            ]
         super().save(*args, **kwargs)
 
         if is_create:
@@ -39,7 +39,7 @@ from care.facility.models.patient_base import (
     REVERSE_ROUTE_TO_FACILITY_CHOICES,
 )
 from care.facility.models.patient_consultation import PatientConsultation
-from care.facility.static_data.icd11 import get_icd11_diagnoses_objects_by_ids
+from care.facility.static_data.icd11 import get_icd11_diagnoses_by_ids
 from care.users.models import GENDER_CHOICES, REVERSE_GENDER_CHOICES, User
 from care.utils.models.base import BaseManager, BaseModel
 from care.utils.models.validators import mobile_or_landline_number_validator
@@ -553,9 +553,31 @@ class PatientRegistration(PatientBaseModel, PatientPermissionMixin):
     def format_as_time(self):
         return self.strftime("%H:%M")
 
+    CSV_DIAGNOSES_FIELDS = (
+        "principal_diagnoses",
+        "unconfirmed_diagnoses",
+        "provisional_diagnoses",
+        "differential_diagnoses",
+        "confirmed_diagnoses",
+    )
+
     def format_diagnoses(self):
-        diagnoses = get_icd11_diagnoses_objects_by_ids(self)
-        return ", ".join([diagnosis["label"] for diagnosis in diagnoses])
+        # formats the diagnoses of a chunk of records, fetched together
+        diagnoses = get_icd11_diagnoses_by_ids(
+            {
+                diagnosis_id
+                for record in self
+                for field in PatientRegistration.CSV_DIAGNOSES_FIELDS
+                for diagnosis_id in record[field] or ()
+            }
+        )
+        for record in self:
+            for field in PatientRegistration.CSV_DIAGNOSES_FIELDS:
+                record[field] = ", ".join(
+                    diagnoses[diagnosis_id].label
+                    for diagnosis_id in record[field] or ()
+                    if diagnosis_id in diagnoses
+                )
 
     CSV_MAKE_PRETTY = {
         "gender": (lambda x: REVERSE_GENDER_CHOICES[x]),
@@ -566,11 +588,6 @@ class PatientRegistration(PatientBaseModel, PatientPermissionMixin):
         "last_consultation__suggestion": (
             lambda x: PatientConsultation.REVERSE_SUGGESTION_CHOICES.get(x, "-")
         ),
-        "principal_diagnoses": format_diagnoses,
-        "unconfirmed_diagnoses": format_diagnoses,
-        "provisional_diagnoses": format_diagnoses,
-        "differential_diagnoses": format_diagnoses,
-        "confirmed_diagnoses": format_diagnoses,
         "last_consultation__route_to_facility": (
             lambda x: REVERSE_ROUTE_TO_FACILITY_CHOICES.get(x, "-")
         ),
@@ -581,6 +598,7 @@ class PatientRegistration(PatientBaseModel, PatientPermissionMixin):
         "last_consultation__discharge_date": format_as_date,
         "last_consultation__discharge_date__time": format_as_time,
     }
+    CSV_MAKE_PRETTY_CHUNK = format_diagnoses
 
 
 class PatientMetaInfo(models.Model):
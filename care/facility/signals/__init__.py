@@ -1 +1,4 @@
 from .asset_updates import *  # noqa
+from .event_types import *  # noqa
+from .facility_counts import *  # noqa
+from .user_facilities import *  # noqa
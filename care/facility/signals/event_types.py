@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from care.facility.models.events import EventType
+from care.utils.cache.event_types import invalidate_event_type_groups
+
+
+@receiver(post_save, sender=EventType)
+@receiver(post_delete, sender=EventType)
+def invalidate_event_type_groups_on_change(sender, **kwargs):
+    invalidate_event_type_groups()
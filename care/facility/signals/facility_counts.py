@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from care.facility.models import Facility, PatientRegistration
+from care.facility.models.bed import Bed
+from care.utils.queryset.facility import refresh_facility_counts
+
+# fields of the counted models that change the counters of the facility
+COUNTED_FIELDS = {
+    Bed: ("facility_id", "deleted"),
+    PatientRegistration: ("facility_id", "is_active", "deleted"),
+}
+
+
+def get_counted_values(instance):
+    # deferred fields are missing, reading them would fetch the instance
+    return tuple(
+        instance.__dict__.get(field) for field in COUNTED_FIELDS[type(instance)]
+    )
+
+
+@receiver(post_init, sender=Bed)
+@receiver(post_init, sender=PatientRegistration)
+def save_counted_values(sender, instance, **kwargs):
+    instance._counted_values = get_counted_values(instance)  # noqa: SLF001
+
+
+@receiver(post_save, sender=Bed)
+@receiver(post_save, sender=PatientRegistration)
+def update_facility_counts_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous_values = instance._counted_values  # noqa: SLF001
+    values = get_counted_values(instance)
+    instance._counted_values = values  # noqa: SLF001
+    if not created and previous_values == values:
+        return
+    # on transfer the counters of both facilities change
+    facility_ids = {previous_values[0], instance.facility_id} - {None}
+    refresh_facility_counts(Facility.objects.filter(id__in=facility_ids))
+
+
+@receiver(post_delete, sender=Bed)
+@receiver(post_delete, sender=PatientRegistration)
+def update_facility_counts_on_delete(sender, instance, **kwargs):
+    if instance.facility_id:
+        refresh_facility_counts(Facility.objects.filter(id=instance.facility_id))
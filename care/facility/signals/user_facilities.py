@@ -0,0 +1,41 @@
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from care.facility.models.facility import Facility, FacilityUser
+from care.users.models import User
+from care.utils.cache.cache_allowed_facilities import invalidate_user_facilities
+
+
+@receiver(post_init, sender=FacilityUser)
+def save_facility_user_user_id(sender, instance, **kwargs):
+    # deferred fields are missing, reading them would fetch the instance
+    instance._cached_user_id = instance.__dict__.get("user_id")  # noqa: SLF001
+
+
+@receiver(post_save, sender=FacilityUser)
+def invalidate_user_facilities_on_save(sender, instance, raw, **kwargs):
+    # a link moved to another user changes the facilities of both
+    invalidate_user_facilities(
+        {instance._cached_user_id, instance.user_id}  # noqa: SLF001
+    )
+    instance._cached_user_id = instance.user_id  # noqa: SLF001
+
+
+@receiver(post_delete, sender=FacilityUser)
+def invalidate_user_facilities_on_delete(sender, instance, **kwargs):
+    invalidate_user_facilities({instance.user_id})
+
+
+@receiver(m2m_changed, sender=Facility.users.through)
+def invalidate_user_facilities_on_m2m_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, User):
+        invalidate_user_facilities({instance.id})
+    elif action == "post_clear":
+        # the users of the cleared links are no longer known
+        invalidate_user_facilities()
+    else:
+        invalidate_user_facilities(pk_set)
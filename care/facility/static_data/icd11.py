@@ -1,18 +1,27 @@
 import logging
 import re
+from collections.abc import Iterable
 from typing import TypedDict
 
-from django.core.paginator import Paginator
-from redis_om import Field, Migrator
+from django.conf import settings
+from redis_om import Field, FindQuery
 
 from care.facility.models.icd11_diagnosis import ICD11Diagnosis
+from care.utils.static_data.cache import LRUCache
+from care.utils.static_data.helpers import query_builder
+from care.utils.static_data.loader import BULK_LOAD_BATCH_SIZE, bulk_load
 from care.utils.static_data.models.base import BaseRedisModel
+from care.utils.static_data.search import LazySearchIndex, PrefixSearchIndex
 
 logger = logging.getLogger(__name__)
 
 
 DISEASE_CODE_PATTERN = r"^(?:[A-Z]+\d|\d+[A-Z])[A-Z\d.]*\s"
 
+# diagnoses only change when the index is reloaded, entries are keyed by the
+# live version so a reload is picked up as soon as the version is refreshed
+icd11_cache = LRUCache(maxsize=10000, ttl=60 * 60)
+
 
 class ICD11Object(TypedDict):
     id: int
@@ -42,25 +51,94 @@ def load_icd11_diagnosis():
     icd_objs = ICD11Diagnosis.objects.order_by("id").values_list(
         "id", "label", "meta_chapter_short"
     )
-    paginator = Paginator(icd_objs, 5000)
-    for page_number in paginator.page_range:
-        for diagnosis in paginator.page(page_number).object_list:
+    bulk_load(
+        ICD11,
+        (
             ICD11(
                 id=diagnosis[0],
                 label=diagnosis[1],
                 chapter=diagnosis[2] or "null",
                 has_code=1 if re.match(DISEASE_CODE_PATTERN, diagnosis[1]) else 0,
                 vec=diagnosis[1].replace(".", "\\.", 1),
-            ).save()
-    Migrator().run()
+            )
+            for diagnosis in icd_objs.iterator(chunk_size=BULK_LOAD_BATCH_SIZE)
+        ),
+    )
     logger.info("ICD11 Diagnosis Loaded")
 
 
+def build_icd11_search_index() -> PrefixSearchIndex:
+    # search only ever looks up diagnoses with a disease code
+    diagnoses = ICD11Diagnosis.objects.order_by("id").values_list(
+        "id", "label", "meta_chapter_short"
+    )
+    return PrefixSearchIndex(
+        (
+            label,
+            {"id": diagnosis_id, "label": label, "chapter": chapter or ""},
+        )
+        for diagnosis_id, label, chapter in diagnoses.iterator(
+            chunk_size=BULK_LOAD_BATCH_SIZE
+        )
+        if re.match(DISEASE_CODE_PATTERN, label)
+    )
+
+
+icd11_search_index = LazySearchIndex(build_icd11_search_index)
+
+
+def search_icd11(
+    query: str, limit: int, backend: str | None = None
+) -> list[ICD11Object]:
+    """
+    Searches the diagnoses with a disease code, with the backend configured
+    by STATIC_DATA_SEARCH_BACKEND unless one is passed.
+    """
+    if (backend or settings.STATIC_DATA_SEARCH_BACKEND) == "memory":
+        return icd11_search_index.get().search(query, limit)
+
+    expressions = [ICD11.has_code == 1]
+    if query:
+        expressions.append(ICD11.vec % query_builder(query))
+    result = FindQuery(expressions=expressions, model=ICD11, limit=limit).execute(
+        exhaust_results=False
+    )
+    return [diagnosis.get_representation() for diagnosis in result]
+
+
+def get_icd11_diagnoses_by_ids(diagnoses_ids: Iterable[int]) -> dict[int, ICD11]:
+    """
+    Returns the diagnoses with the given ids keyed by id, fetching the ones
+    missing from the in-process cache in a single round trip.
+    The returned objects are shared, they must not be modified.
+    """
+    diagnoses_ids = {int(diagnosis_id) for diagnosis_id in diagnoses_ids}
+    if not diagnoses_ids:
+        return {}
+    version = ICD11.get_live_version()
+    diagnoses = {
+        diagnosis_id: diagnosis
+        for (_, diagnosis_id), diagnosis in icd11_cache.get_many(
+            (version, diagnosis_id) for diagnosis_id in diagnoses_ids
+        ).items()
+    }
+    if missing_ids := diagnoses_ids - diagnoses.keys():
+        fetched = ICD11.get_many(missing_ids)
+        icd11_cache.set_many(
+            {
+                (version, diagnosis_id): diagnosis
+                for diagnosis_id, diagnosis in fetched.items()
+            }
+        )
+        diagnoses.update(fetched)
+    return diagnoses
+
+
 def get_icd11_diagnosis_object_by_id(
     diagnosis_id: int, as_dict=False
 ) -> ICD11 | ICD11Object | None:
     try:
-        diagnosis = ICD11.get(diagnosis_id)
+        diagnosis = get_icd11_diagnoses_by_ids([diagnosis_id])[int(diagnosis_id)]
         return diagnosis.get_representation() if as_dict else diagnosis
     except Exception:
         return None
@@ -70,12 +148,9 @@ def get_icd11_diagnoses_objects_by_ids(diagnoses_ids: list[int]) -> list[ICD11Ob
     if not diagnoses_ids:
         return []
 
-    query = None
-    for diagnosis_id in diagnoses_ids:
-        if query is None:
-            query = ICD11.id == diagnosis_id
-        else:
-            query |= ICD11.id == diagnosis_id
-
-    diagnosis_objects: list[ICD11] = list(ICD11.find(query))
-    return [diagnosis.get_representation() for diagnosis in diagnosis_objects]
+    diagnoses = get_icd11_diagnoses_by_ids(diagnoses_ids)
+    return [
+        diagnoses[diagnosis_id].get_representation()
+        for diagnosis_id in dict.fromkeys(map(int, diagnoses_ids))
+        if diagnosis_id in diagnoses
+    ]
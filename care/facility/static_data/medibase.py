@@ -1,13 +1,16 @@
 import logging
 from typing import TypedDict
 
-from django.core.paginator import Paginator
+from django.conf import settings
 from django.db.models import CharField, TextField, Value
 from django.db.models.functions import Coalesce
-from redis_om import Field, Migrator
+from redis_om import Field, FindQuery
 
 from care.facility.models.prescription import MedibaseMedicine as MedibaseMedicineModel
+from care.utils.static_data.helpers import query_builder, token_escaper
+from care.utils.static_data.loader import BULK_LOAD_BATCH_SIZE, bulk_load
 from care.utils.static_data.models.base import BaseRedisModel
+from care.utils.static_data.search import LazySearchIndex, PrefixSearchIndex
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +51,8 @@ class MedibaseMedicine(BaseRedisModel):
         }
 
 
-def load_medibase_medicines():
-    logger.info("Loading Medibase Medicines into the redis cache...")
-
-    medibase_objects = (
+def get_medibase_medicine_rows():
+    return (
         MedibaseMedicineModel.objects.order_by("external_id")
         .annotate(
             generic_pretty=Coalesce("generic", Value(""), output_field=CharField()),
@@ -74,10 +75,16 @@ def load_medibase_medicines():
             "cims_class_pretty",
             "atc_classification_pretty",
         )
+        .iterator(chunk_size=BULK_LOAD_BATCH_SIZE)
     )
-    paginator = Paginator(medibase_objects, 5000)
-    for page_number in paginator.page_range:
-        for medicine in paginator.page(page_number).object_list:
+
+
+def load_medibase_medicines():
+    logger.info("Loading Medibase Medicines into the redis cache...")
+
+    bulk_load(
+        MedibaseMedicine,
+        (
             MedibaseMedicine(
                 id=str(medicine[0]),
                 name=medicine[1],
@@ -88,6 +95,65 @@ def load_medibase_medicines():
                 cims_class=medicine[6],
                 atc_classification=medicine[7],
                 vec=f"{medicine[1]} {medicine[3]} {medicine[4]}",
-            ).save()
-    Migrator().run()
+            )
+            for medicine in get_medibase_medicine_rows()
+        ),
+    )
     logger.info("Medibase Medicines Loaded")
+
+
+def build_medibase_search_index() -> PrefixSearchIndex:
+    return PrefixSearchIndex(
+        (
+            (
+                f"{medicine[1]} {medicine[3]} {medicine[4]}",
+                {
+                    "id": str(medicine[0]),
+                    "name": medicine[1],
+                    "type": medicine[2],
+                    "generic": medicine[3],
+                    "company": medicine[4],
+                    "contents": medicine[5],
+                    "cims_class": medicine[6],
+                    "atc_classification": medicine[7],
+                },
+            )
+            for medicine in get_medibase_medicine_rows()
+        ),
+        exact_field="name",
+    )
+
+
+medibase_search_index = LazySearchIndex(build_medibase_search_index)
+
+
+def search_medibase_medicines(
+    query: str, medicine_type: str | None, limit: int, backend: str | None = None
+) -> list[MedibaseMedicineObject]:
+    """
+    Searches the medicines by name, generic and company, with the backend
+    configured by STATIC_DATA_SEARCH_BACKEND unless one is passed.
+    """
+    if (backend or settings.STATIC_DATA_SEARCH_BACKEND) == "memory":
+        return medibase_search_index.get().search(
+            query,
+            limit,
+            where=(
+                (lambda medicine: medicine["type"] == medicine_type)
+                if medicine_type
+                else None
+            ),
+        )
+
+    expressions = []
+    if medicine_type:
+        expressions.append(MedibaseMedicine.type == medicine_type)
+    if query:
+        expressions.append(
+            (MedibaseMedicine.name == token_escaper.escape(query))
+            | (MedibaseMedicine.vec % query_builder(query))
+        )
+    result = FindQuery(
+        expressions=expressions, model=MedibaseMedicine, limit=limit
+    ).execute(exhaust_results=False)
+    return [medicine.get_representation() for medicine in result]
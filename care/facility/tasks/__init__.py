@@ -3,7 +3,10 @@ from celery.schedules import crontab
 from django.conf import settings
 
 from care.facility.tasks.asset_monitor import check_asset_status
+from care.facility.tasks.automated_vitals import rollup_automated_vitals
 from care.facility.tasks.cleanup import delete_old_notifications
+from care.facility.tasks.csv_export import export_csv_task
+from care.facility.tasks.facility_counts import reconcile_facility_counts
 from care.facility.tasks.location_monitor import check_location_status
 from care.facility.tasks.plausible_stats import capture_goals
 from care.facility.tasks.redis_index import load_redis_index
@@ -74,3 +77,13 @@ def setup_periodic_tasks(sender, **kwargs):
         check_location_status.s(),
         name="check_location_status",
     )
+    sender.add_periodic_task(
+        crontab(hour="*", minute="30"),
+        reconcile_facility_counts.s(),
+        name="reconcile_facility_counts",
+    )
+    sender.add_periodic_task(
+        crontab(hour="1", minute="0"),
+        rollup_automated_vitals.s(),
+        name="rollup_automated_vitals",
+    )
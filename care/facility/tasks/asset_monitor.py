@@ -1,21 +1,86 @@
 import logging
 from datetime import datetime
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
 from celery import shared_task
-from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 from django.utils import timezone
 
-from care.facility.models.asset import Asset, AvailabilityRecord, AvailabilityStatus
+from care.facility.models.asset import Asset, AvailabilityStatus
+from care.facility.utils.availability import AvailabilityRecorder
 from care.utils.assetintegration.asset_classes import AssetClasses
-
-if TYPE_CHECKING:
-    from care.utils.assetintegration.base import BaseAssetIntegration
+from care.utils.assetintegration.base import BaseAssetIntegration
+from care.utils.assetintegration.health import map_concurrently
 
 logger = logging.getLogger(__name__)
 
 
+def get_onvif_config(asset: Asset) -> dict | None:
+    # TODO: Remove this block after all assets are migrated to the new middleware
+    try:
+        username, password, *_ = asset.meta["camera_access_key"].split(":")
+    except (KeyError, ValueError):
+        return None
+    return {
+        "hostname": asset.meta.get("local_ip_address"),
+        "port": 80,
+        "username": username,
+        "password": password,
+    }
+
+
+def fetch_middleware_status(
+    middleware_hostname: str,
+    insecure_connection: bool,
+    endpoint: str,
+    onvif_configs: list[dict],
+) -> Any:
+    """
+    Fetches the status of the devices connected to a middleware.
+    Cameras are looked up with their credentials when available.
+    """
+    middleware = BaseAssetIntegration(
+        {
+            "middleware_hostname": middleware_hostname,
+            "local_ip_address": "",
+            "insecure_connection": insecure_connection,
+        }
+    )
+    if onvif_configs:
+        try:
+            return middleware.api_post(middleware.get_url(endpoint), data=onvif_configs)
+        except Exception:
+            logger.info(
+                "Falling back to fetch camera status of %s", middleware_hostname
+            )
+    return middleware.api_get(middleware.get_url(endpoint))
+
+
+def fetch_middleware_statuses(
+    middleware_requests: dict[tuple, list[dict]],
+) -> dict[tuple, Any]:
+    """
+    Fetches the status of every (middleware hostname, insecure connection,
+    endpoint, with credentials) concurrently. Middlewares that could not be
+    reached have no status.
+    """
+
+    def fetch(request):
+        middleware_hostname, insecure_connection, endpoint, _ = request
+        try:
+            return fetch_middleware_status(
+                middleware_hostname,
+                insecure_connection,
+                endpoint,
+                middleware_requests[request],
+            )
+        except Exception as e:
+            logger.warning("Middleware %s is down: %s", middleware_hostname, e)
+            return None
+
+    return map_concurrently(fetch, middleware_requests)
+
+
 @shared_task
 def check_asset_status():  # noqa: PLR0912
     logger.info("Checking Asset Status: %s", timezone.now())
@@ -34,8 +99,11 @@ def check_asset_status():  # noqa: PLR0912
             "current_location__facility__middleware_address",
         )
     )
-    asset_content_type = ContentType.objects.get_for_model(Asset)
 
+    # assets are grouped by the middleware request that returns their status
+    # so that every middleware is only queried once
+    middleware_requests: dict[tuple, list[dict]] = {}
+    asset_requests: list[tuple[Asset, tuple | None]] = []
     for asset in assets:
         # Skipping if local IP address is not present
         if not asset.meta.get("local_ip_address", None):
@@ -56,44 +124,45 @@ def check_asset_status():  # noqa: PLR0912
                 )
                 continue
 
-            result: Any = None
-
+            request = None
             try:
-                # Creating an instance of the asset class
-                asset_class: BaseAssetIntegration = AssetClasses[
-                    asset.asset_class
-                ].value(
+                # Validating the asset configuration against its asset class
+                AssetClasses[asset.asset_class].value(
                     {
                         **asset.meta,
                         "id": asset.external_id,
                         "middleware_hostname": resolved_middleware,
                     }
                 )
-                # Fetching the status of the device
-                if asset.asset_class == "ONVIF":
-                    try:
-                        # TODO: Remove this block after all assets are migrated to the new middleware
-                        asset_config = asset.meta["camera_access_key"].split(":")
-                        assets_config = [
-                            {
-                                "hostname": asset.meta.get("local_ip_address"),
-                                "port": 80,
-                                "username": asset_config[0],
-                                "password": asset_config[1],
-                            }
-                        ]
-
-                        result = asset_class.api_post(
-                            asset_class.get_url("cameras/status"), data=assets_config
-                        )
-                    except Exception:
-                        result = asset_class.api_get(
-                            asset_class.get_url("cameras/status")
-                        )
-                else:
-                    result = asset_class.api_get(asset_class.get_url("devices/status"))
+                is_onvif = asset.asset_class == "ONVIF"
+                onvif_config = get_onvif_config(asset) if is_onvif else None
+                # cameras without credentials are not in the status fetched
+                # with the credentials of the others, they are fetched apart
+                request = (
+                    resolved_middleware,
+                    asset.meta.get("insecure_connection", False),
+                    "cameras/status" if is_onvif else "devices/status",
+                    onvif_config is not None,
+                )
+                onvif_configs = middleware_requests.setdefault(request, [])
+                if onvif_config:
+                    onvif_configs.append(onvif_config)
             except Exception as e:
-                logger.warning("Middleware %s is down: %s", resolved_middleware, e)
+                logger.warning(
+                    "Invalid configuration of asset %s: %s", asset.external_id, e
+                )
+            asset_requests.append((asset, request))
+        except Exception as e:
+            logger.error("Error in Asset Status Check: %s", e)
+
+    middleware_statuses = fetch_middleware_statuses(middleware_requests)
+    recorder = AvailabilityRecorder(
+        Asset, [asset.external_id for asset, _ in asset_requests]
+    )
+
+    for asset, request in asset_requests:
+        try:
+            result: Any = middleware_statuses.get(request)
 
             # If no status is returned, setting default status as down
             if not result or "error" in result:
@@ -111,33 +180,20 @@ def check_asset_status():  # noqa: PLR0912
                 else:
                     asset_status = "down"
 
-                # Fetching the last record of the asset
-                last_record = (
-                    AvailabilityRecord.objects.filter(
-                        content_type=asset_content_type,
-                        object_external_id=asset.external_id,
-                    )
-                    .order_by("-timestamp")
-                    .first()
-                )
-
                 # Setting new status based on the status returned by the device
                 if asset_status == "up":
                     new_status = AvailabilityStatus.OPERATIONAL
                 elif asset_status == "maintenance":
                     new_status = AvailabilityStatus.UNDER_MAINTENANCE
 
-                # Creating a new record if the status has changed
-                if not last_record or (
-                    datetime.fromisoformat(status_record.get("time"))
-                    > last_record.timestamp
-                    and last_record.status != new_status.value
-                ):
-                    AvailabilityRecord.objects.create(
-                        content_type=asset_content_type,
-                        object_external_id=asset.external_id,
-                        status=new_status.value,
-                        timestamp=status_record.get("time", timezone.now()),
-                    )
+                # Recording the status if it has changed
+                timestamp = status_record.get("time")
+                recorder.record(
+                    asset.external_id,
+                    new_status,
+                    datetime.fromisoformat(timestamp) if timestamp else timezone.now(),
+                )
         except Exception as e:
             logger.error("Error in Asset Status Check: %s", e)
+
+    recorder.save()
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from decimal import Decimal
+from logging import Logger
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from care.facility.models.daily_round import AutomatedVitals
+
+logger: Logger = get_task_logger(__name__)
+
+ROLLED_UP_COLUMNS = (
+    "temperature",
+    "pulse",
+    "resp",
+    "ventilator_spo2",
+    "bp_systolic",
+    "bp_diastolic",
+)
+
+
+def rollup_hour(consultation_id: int, hour) -> int:
+    """
+    Replaces the vitals of a consultation taken during an hour by a single
+    row of their averages, weighted by the samples of rows already rolled
+    up. The row keeps the id of the newest one averaged, the ids of the
+    others are no longer found. Returns the number of rows removed.
+    """
+    with transaction.atomic():
+        rows = list(
+            AutomatedVitals.objects.select_for_update()
+            .filter(
+                consultation_id=consultation_id,
+                taken_at__gte=hour,
+                taken_at__lt=hour + timedelta(hours=1),
+            )
+            .order_by("taken_at")
+        )
+        if len(rows) < 2:  # noqa: PLR2004
+            return 0
+
+        averages = {}
+        for column in ROLLED_UP_COLUMNS:
+            values = [
+                (getattr(row, column), row.samples)
+                for row in rows
+                if getattr(row, column) is not None
+            ]
+            if not values:
+                averages[column] = None
+                continue
+            average = sum(value * samples for value, samples in values) / sum(
+                samples for _, samples in values
+            )
+            averages[column] = (
+                average.quantize(Decimal("0.01"))
+                if isinstance(average, Decimal)
+                else round(average)
+            )
+
+        AutomatedVitals.objects.filter(id__in=[row.id for row in rows]).delete()
+        AutomatedVitals.objects.create(
+            consultation_id=consultation_id,
+            taken_at=hour,
+            created_by_id=rows[-1].created_by_id,
+            external_id=rows[-1].external_id,
+            samples=min(sum(row.samples for row in rows), 32767),
+            **averages,
+        )
+        return len(rows) - 1
+
+
+@shared_task
+def rollup_automated_vitals():
+    """
+    Rolls the compactly stored vitals older than the rollup delay up into
+    hourly averages, and deletes the ones older than the retention period.
+    """
+    now = timezone.now()
+    if settings.AUTOMATED_VITALS_RETENTION_DAYS:
+        deleted, _ = AutomatedVitals.objects.filter(
+            taken_at__lt=now - timedelta(days=settings.AUTOMATED_VITALS_RETENTION_DAYS)
+        ).delete()
+        logger.info("Deleted %s automated vitals past retention", deleted)
+
+    hours = (
+        AutomatedVitals.objects.filter(
+            taken_at__lt=now
+            - timedelta(days=settings.AUTOMATED_VITALS_ROLLUP_AFTER_DAYS)
+        )
+        .annotate(hour=TruncHour("taken_at"))
+        .values("consultation_id", "hour")
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    removed = sum(
+        rollup_hour(hour["consultation_id"], hour["hour"]) for hour in hours.iterator()
+    )
+    logger.info("Rolled up %s automated vitals into hourly averages", removed)
@@ -0,0 +1,45 @@
+from logging import Logger
+
+from botocore.exceptions import ClientError
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from care.facility.utils.reports.csv_export import (
+    fail_csv_export,
+    generate_csv_export,
+)
+from care.utils.csp.config import BucketType
+
+logger: Logger = get_task_logger(__name__)
+
+MAX_RETRIES = 3
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    autoretry_for=(ClientError,),
+    retry_kwargs={"max_retries": MAX_RETRIES},
+    retry_backoff=True,
+)
+def export_csv_task(
+    self,
+    export_id: str,
+    viewset_path: str,
+    user_id: int,
+    query_params: dict,
+    bucket_type: str,
+):
+    """
+    Generate and Upload the CSV export of a list, retried exports resume
+    from the last uploaded part
+    """
+    try:
+        generate_csv_export(
+            export_id, viewset_path, user_id, query_params, BucketType(bucket_type)
+        )
+    except Exception as e:
+        if not isinstance(e, ClientError) or self.request.retries >= MAX_RETRIES:
+            logger.error("CSV export %s failed: %s", export_id, e)
+            fail_csv_export(export_id, BucketType(bucket_type))
+        raise
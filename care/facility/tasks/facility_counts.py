@@ -0,0 +1,20 @@
+from logging import Logger
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from care.facility.models import Facility
+from care.utils.queryset.facility import refresh_facility_counts
+
+logger: Logger = get_task_logger(__name__)
+
+
+@shared_task
+def reconcile_facility_counts():
+    """
+    Corrects the counters of the facilities that drifted, from changes made
+    without saving the models (bulk updates, raw fixtures, ...).
+    """
+    updated = refresh_facility_counts(Facility.objects.all())
+    if updated:
+        logger.warning("Reconciled the counters of %s facilities", updated)
@@ -5,8 +5,11 @@ from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.core.cache import cache
 
-from care.facility.static_data.icd11 import load_icd11_diagnosis
-from care.facility.static_data.medibase import load_medibase_medicines
+from care.facility.static_data.icd11 import ICD11, load_icd11_diagnosis
+from care.facility.static_data.medibase import (
+    MedibaseMedicine,
+    load_medibase_medicines,
+)
 from care.utils.static_data.models.base import index_exists
 from plug_config import manager
 
@@ -21,7 +24,7 @@ def load_redis_index():
 
     cache.set("redis_index_loading", value=True, timeout=60 * 2)
     logger.info("Loading Redis Index")
-    if index_exists():
+    if index_exists(ICD11) and index_exists(MedibaseMedicine):
         logger.info("Index already exists, skipping")
         return
 
@@ -1,5 +1,6 @@
 from celery import shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 
 from care.facility.utils.summarization.district.patient_summary import (
     district_patient_summary,
@@ -34,11 +35,11 @@ def summarize_facility_capacity():
 
 @shared_task
 def summarize_patient():
-    patient_summary()
+    patient_summary(incremental=settings.TASK_SUMMARIZE_PATIENT_INCREMENTAL)
     logger.info("Summarized Patients")
 
 
 @shared_task
 def summarize_district_patient():
-    district_patient_summary()
+    district_patient_summary(incremental=settings.TASK_SUMMARIZE_PATIENT_INCREMENTAL)
     logger.info("Summarized District Patients")
@@ -0,0 +1,180 @@
+from unittest.mock import patch
+
+import requests_mock
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from care.facility.models.asset import AvailabilityRecord, AvailabilityStatus
+from care.facility.tasks import asset_monitor
+from care.facility.tasks.asset_monitor import check_asset_status
+from care.utils.tests.test_utils import TestUtils
+
+
+class AssetMonitorTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.user,
+            cls.district,
+            cls.local_body,
+            middleware_address="middleware.local",
+        )
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.up_asset = cls.create_asset(
+            cls.location,
+            asset_class="HL7MONITOR",
+            meta={"local_ip_address": "192.168.1.10"},
+        )
+        cls.down_asset = cls.create_asset(
+            cls.location,
+            asset_class="HL7MONITOR",
+            meta={"local_ip_address": "192.168.1.11"},
+        )
+        cls.unreachable_asset = cls.create_asset(
+            cls.location,
+            asset_class="VENTILATOR",
+            meta={
+                "local_ip_address": "192.168.1.12",
+                "middleware_hostname": "dead-middleware.local",
+            },
+        )
+
+    def get_status(self, asset):
+        return (
+            AvailabilityRecord.objects.filter(object_external_id=asset.external_id)
+            .order_by("-timestamp")
+            .first()
+            .status
+        )
+
+    @requests_mock.Mocker()
+    def test_status_is_fetched_once_per_middleware(self, mock_requests):
+        status_request = mock_requests.get(
+            "https://middleware.local/devices/status",
+            json=[
+                {"time": "2030-01-01T00:00:00+00:00", "status": {"192.168.1.10": "up"}}
+            ],
+        )
+        mock_requests.get(
+            "https://dead-middleware.local/devices/status", status_code=502
+        )
+
+        check_asset_status()
+
+        self.assertEqual(status_request.call_count, 1)
+        self.assertEqual(
+            self.get_status(self.up_asset), AvailabilityStatus.OPERATIONAL.value
+        )
+        self.assertEqual(
+            self.get_status(self.down_asset), AvailabilityStatus.DOWN.value
+        )
+        self.assertEqual(
+            self.get_status(self.unreachable_asset), AvailabilityStatus.DOWN.value
+        )
+
+    @requests_mock.Mocker()
+    def test_cameras_without_credentials_are_fetched_apart(self, mock_requests):
+        camera = self.create_asset(
+            self.location,
+            asset_class="ONVIF",
+            meta={"local_ip_address": "192.168.1.20", "camera_access_key": "u:p:k"},
+        )
+        legacy_camera = self.create_asset(
+            self.location,
+            asset_class="ONVIF",
+            meta={"local_ip_address": "192.168.1.21", "camera_access_key": "u:p:k"},
+        )
+        post_request = mock_requests.post(
+            "https://middleware.local/cameras/status",
+            json=[
+                {"time": "2030-01-01T00:00:00+00:00", "status": {"192.168.1.20": "up"}}
+            ],
+        )
+        get_request = mock_requests.get(
+            "https://middleware.local/cameras/status",
+            json=[
+                {"time": "2030-01-01T00:00:00+00:00", "status": {"192.168.1.21": "up"}}
+            ],
+        )
+        mock_requests.get("https://middleware.local/devices/status", json=[])
+        mock_requests.get(
+            "https://dead-middleware.local/devices/status", status_code=502
+        )
+        get_onvif_config = asset_monitor.get_onvif_config
+
+        with patch.object(
+            asset_monitor,
+            "get_onvif_config",
+            lambda asset: None
+            if asset.external_id == legacy_camera.external_id
+            else get_onvif_config(asset),
+        ):
+            check_asset_status()
+
+        self.assertEqual(
+            [config["hostname"] for config in post_request.last_request.json()],
+            ["192.168.1.20"],
+        )
+        self.assertEqual(get_request.call_count, 1)
+        self.assertEqual(self.get_status(camera), AvailabilityStatus.OPERATIONAL.value)
+        self.assertEqual(
+            self.get_status(legacy_camera), AvailabilityStatus.OPERATIONAL.value
+        )
+
+    @requests_mock.Mocker()
+    def test_records_are_only_added_on_status_change(self, mock_requests):
+        mock_requests.get(
+            "https://middleware.local/devices/status",
+            [
+                {
+                    "json": [
+                        {
+                            "time": "2030-01-01T00:00:00+00:00",
+                            "status": {"192.168.1.10": "up", "192.168.1.11": "up"},
+                        }
+                    ]
+                },
+                {
+                    "json": [
+                        {
+                            "time": "2030-01-01T00:30:00+00:00",
+                            "status": {"192.168.1.10": "up"},
+                        }
+                    ]
+                },
+            ],
+        )
+        mock_requests.get(
+            "https://dead-middleware.local/devices/status", status_code=502
+        )
+
+        # the content type of the assets is cached by the tests run before
+        ContentType.objects.clear_cache()
+        with self.assertNumQueries(4):
+            check_asset_status()
+        check_asset_status()
+
+        self.assertEqual(
+            AvailabilityRecord.objects.filter(
+                object_external_id=self.up_asset.external_id
+            ).count(),
+            1,
+        )
+        self.assertEqual(
+            list(
+                AvailabilityRecord.objects.filter(
+                    object_external_id=self.down_asset.external_id
+                ).values_list("status", flat=True)
+            ),
+            [AvailabilityStatus.DOWN.value, AvailabilityStatus.OPERATIONAL.value],
+        )
+        self.assertEqual(
+            AvailabilityRecord.objects.filter(
+                object_external_id=self.unreachable_asset.external_id
+            ).count(),
+            1,
+        )
@@ -0,0 +1,302 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models import DailyRound
+from care.facility.models.daily_round import AutomatedVitals
+from care.facility.models.events import EventType, PatientConsultationEvent
+from care.facility.tasks.automated_vitals import rollup_automated_vitals
+from care.utils.tests.test_utils import TestUtils
+
+
+@override_settings(AUTOMATED_VITALS_COMPACT_STORAGE=True)
+class AutomatedVitalsTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command("load_event_types", stdout=StringIO())
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user("staff1", cls.district, home_facility=cls.facility)
+        cls.patient = cls.create_patient(district=cls.district, facility=cls.facility)
+        cls.asset_location = cls.create_asset_location(cls.facility)
+        cls.bed = cls.create_bed(facility=cls.facility, location=cls.asset_location)
+        cls.consultation = cls.create_consultation(
+            facility=cls.facility, patient=cls.patient
+        )
+        cls.consultation.current_bed = cls.create_consultation_bed(
+            cls.consultation, cls.bed
+        )
+        cls.consultation.save()
+
+    def get_url(self, action=""):
+        return f"/api/v1/consultation/{self.consultation.external_id}/daily_rounds/{action}"
+
+    def create_round(self, taken_at, **kwargs):
+        return self.client.post(
+            self.get_url(),
+            {"taken_at": taken_at.isoformat(), **kwargs},
+            format="json",
+        )
+
+    def test_automated_vitals_are_stored_compactly(self):
+        taken_at = timezone.now() - timedelta(minutes=10)
+        response = self.create_round(
+            taken_at,
+            rounds_type="AUTOMATED",
+            temperature=98.6,
+            pulse=80,
+            bp={"systolic": 120, "diastolic": 80},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(DailyRound.objects.exists())
+        vitals = AutomatedVitals.objects.get()
+        self.assertEqual(response.data["id"], str(vitals.external_id))
+        self.assertEqual(vitals.temperature, Decimal("98.60"))
+        self.assertEqual((vitals.bp_systolic, vitals.bp_diastolic), (120, 80))
+
+        # automated rounds with other fields are stored as daily rounds
+        response = self.create_round(
+            taken_at, rounds_type="AUTOMATED", pulse=80, rhythm="REGULAR"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DailyRound.objects.count(), 1)
+
+        with override_settings(AUTOMATED_VITALS_COMPACT_STORAGE=False):
+            self.create_round(taken_at, rounds_type="AUTOMATED", pulse=80)
+        self.assertEqual(DailyRound.objects.count(), 2)
+        self.assertEqual(AutomatedVitals.objects.count(), 1)
+
+    def test_compact_rounds_are_retrieved_and_edited(self):
+        response = self.create_round(
+            timezone.now() - timedelta(minutes=10), rounds_type="AUTOMATED", pulse=80
+        )
+        round_id = response.data["id"]
+        response = self.client.get(self.get_url(f"{round_id}/"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pulse"], 80)
+
+        # edited rounds are moved to the daily rounds with the same id
+        response = self.client.patch(
+            self.get_url(f"{round_id}/"), {"pulse": 90}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(AutomatedVitals.objects.exists())
+        self.assertEqual(DailyRound.objects.get(external_id=round_id).pulse, 90)
+        response = self.client.get(self.get_url(f"{round_id}/"))
+        self.assertEqual(response.data["pulse"], 90)
+
+        response = self.client.get(self.get_url("invalid/"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_compact_rounds_supersede_stored_events(self):
+        now = timezone.now()
+        with override_settings(AUTOMATED_VITALS_COMPACT_STORAGE=False):
+            self.create_round(
+                now - timedelta(hours=2),
+                rounds_type="AUTOMATED",
+                pulse=70,
+                temperature=98,
+            )
+        self.create_round(now - timedelta(hours=1), rounds_type="AUTOMATED", pulse=80)
+        latest = PatientConsultationEvent.objects.filter(is_latest=True)
+        self.assertFalse(latest.filter(event_type__name="PULSE").exists())
+        self.assertTrue(latest.filter(event_type__name="TEMPERATURE").exists())
+
+    def test_list_reads_through_compact_storage(self):
+        now = timezone.now()
+        self.create_round(now - timedelta(hours=3), rounds_type="AUTOMATED", pulse=70)
+        self.create_round(now - timedelta(hours=2), rounds_type="NORMAL", pulse=80)
+        self.create_round(now - timedelta(hours=1), rounds_type="AUTOMATED", pulse=90)
+
+        response = self.client.get(self.get_url())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            [(r["rounds_type"], r["pulse"]) for r in response.data["results"]],
+            [("AUTOMATED", 90), ("NORMAL", 80), ("AUTOMATED", 70)],
+        )
+
+        response = self.client.get(self.get_url(), {"limit": 1, "offset": 1})
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(response.data["results"][0]["pulse"], 80)
+
+        response = self.client.get(self.get_url(), {"rounds_type": "normal"})
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get(
+            self.get_url(),
+            {"taken_at_after": (now - timedelta(hours=1, minutes=30)).isoformat()},
+        )
+        self.assertEqual(
+            [r["pulse"] for r in response.data["results"]],
+            [90],
+        )
+
+        response = self.client.post(
+            self.get_url("analyse/"), {"fields": ["pulse", "bp"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(
+            sorted(row["pulse"] for row in response.data["results"].values()),
+            [70, 80, 90],
+        )
+
+    def test_analyse_buckets_with_compact_storage(self):
+        start = datetime(2024, 1, 1, tzinfo=ZoneInfo(settings.TIME_ZONE))
+        DailyRound.objects.create(
+            consultation=self.consultation,
+            taken_at=start + timedelta(minutes=10),
+            pulse=100,
+            temperature=99,
+        )
+        AutomatedVitals.objects.bulk_create(
+            [
+                # an hourly average of three rounds
+                AutomatedVitals(
+                    consultation=self.consultation,
+                    taken_at=start,
+                    pulse=70,
+                    bp_systolic=110,
+                    samples=3,
+                ),
+                AutomatedVitals(
+                    consultation=self.consultation,
+                    taken_at=start + timedelta(minutes=20),
+                    pulse=90,
+                    bp_systolic=120,
+                ),
+            ]
+        )
+        response = self.client.post(
+            self.get_url("analyse/"),
+            {
+                "bucket": "hour",
+                "fields": ["pulse", "temperature", "bp.systolic"],
+                "taken_at_after": start.isoformat(),
+                "taken_at_before": (start + timedelta(hours=2)).isoformat(),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], [5])
+        fields = response.data["fields"]
+        self.assertEqual(
+            fields["pulse"], {"min": [70], "max": [100], "avg": [80], "last": [90]}
+        )
+        self.assertEqual(fields["temperature"]["avg"], [99])
+        self.assertEqual(fields["bp.systolic"]["avg"], [112.5])
+        self.assertEqual(fields["bp.systolic"]["last"], [120])
+
+    def test_events_of_compact_rounds(self):
+        now = timezone.now()
+        self.create_round(now - timedelta(hours=2), rounds_type="AUTOMATED", pulse=70)
+        self.create_round(
+            now - timedelta(hours=1),
+            rounds_type="AUTOMATED",
+            temperature=99,
+            bp={"systolic": 120, "diastolic": 80},
+        )
+        url = f"/api/v1/consultation/{self.consultation.external_id}/events/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [event["event_type"]["name"] for event in response.data["results"]]
+        self.assertEqual(response.data["count"], len(names))
+        self.assertEqual(
+            sorted(names),
+            sorted(
+                [
+                    "DAILY_ROUND_DETAILS",
+                    "TEMPERATURE",
+                    "BLOOD_PRESSURE",
+                    "DAILY_ROUND_DETAILS",
+                    "PULSE",
+                ]
+            ),
+        )
+        self.assertEqual(set(names[-2:]), {"DAILY_ROUND_DETAILS", "PULSE"})
+        ids = [event["id"] for event in response.data["results"]]
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(
+            ids, [event["id"] for event in self.client.get(url).data["results"]]
+        )
+
+        response = self.client.get(url, {"limit": 2, "offset": 3})
+        self.assertEqual([event["id"] for event in response.data["results"]], ids[3:5])
+
+        pulse = EventType.objects.get(name="PULSE")
+        response = self.client.get(url, {"event_type": pulse.id})
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["value"], {"pulse": 70})
+
+        # only the events of the newest row of every event type are latest
+        response = self.client.get(url, {"is_latest": True})
+        self.assertEqual(
+            sorted(event["event_type"]["name"] for event in response.data["results"]),
+            ["BLOOD_PRESSURE", "DAILY_ROUND_DETAILS", "PULSE", "TEMPERATURE"],
+        )
+        response = self.client.get(url, {"is_latest": False})
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            response.data["results"][0]["event_type"]["name"], "DAILY_ROUND_DETAILS"
+        )
+        self.assertIn(response.data["results"][0]["id"], ids[-2:])
+
+        response = self.client.get(url, {"ordering": "taken_at"})
+        self.assertEqual([event["id"] for event in response.data["results"]], ids[::-1])
+
+    def test_rollup_and_retention(self):
+        # hours are truncated in the local time zone
+        old = timezone.localtime().replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(days=10)
+        AutomatedVitals.objects.bulk_create(
+            [
+                AutomatedVitals(
+                    consultation=self.consultation,
+                    taken_at=old + timedelta(minutes=minutes),
+                    pulse=pulse,
+                    temperature=temperature,
+                    created_by=self.user,
+                )
+                for minutes, pulse, temperature in (
+                    (5, 70, Decimal("98.00")),
+                    (25, 80, None),
+                    (45, 91, Decimal("99.00")),
+                )
+            ]
+            + [
+                AutomatedVitals(
+                    consultation=self.consultation,
+                    taken_at=timezone.now() - timedelta(minutes=minutes),
+                    pulse=80,
+                )
+                for minutes in (1, 2)
+            ]
+        )
+
+        newest = AutomatedVitals.objects.get(taken_at=old + timedelta(minutes=45))
+        rollup_automated_vitals()
+        rolled_up = AutomatedVitals.objects.get(taken_at=old)
+        self.assertEqual(rolled_up.external_id, newest.external_id)
+        self.assertEqual(rolled_up.samples, 3)
+        self.assertEqual(rolled_up.pulse, 80)
+        self.assertEqual(rolled_up.temperature, Decimal("98.50"))
+        self.assertEqual(rolled_up.created_by, self.user)
+        self.assertEqual(AutomatedVitals.objects.count(), 3)
+
+        with override_settings(AUTOMATED_VITALS_RETENTION_DAYS=5):
+            rollup_automated_vitals()
+        self.assertEqual(AutomatedVitals.objects.count(), 2)
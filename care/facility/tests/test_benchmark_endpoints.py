@@ -0,0 +1,53 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from care.facility.utils.benchmark import BenchmarkEndpoint
+
+
+@override_settings(STATIC_DATA_SEARCH_BACKEND="memory")
+class BenchmarkEndpointsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_benchmark_data",
+            facilities=3,
+            patients=12,
+            daily_rounds=60,
+            assets=6,
+            shifts=4,
+            notifications=10,
+            stdout=StringIO(),
+        )
+
+    def setUp(self):
+        self.output = Path(tempfile.mkdtemp()) / "benchmark.json"
+
+    def test_endpoints_within_query_budgets(self):
+        call_command(
+            "benchmark_endpoints", output=self.output, repeat=1, stdout=StringIO()
+        )
+
+        report = json.loads(self.output.read_text())
+        self.assertEqual(report["volumes"]["patients"], 12)
+        for result in report["endpoints"]:
+            with self.subTest(result["name"]):
+                self.assertEqual(result["status_code"], 200)
+                self.assertFalse(result["over_budget"])
+
+    @patch(
+        "care.facility.management.commands.benchmark_endpoints.get_benchmark_endpoints",
+        return_value=[BenchmarkEndpoint("facility_list", "/api/v1/facility/", 0)],
+    )
+    def test_exceeded_query_budget_fails(self, _):
+        with self.assertRaisesMessage(CommandError, "facility_list"):
+            call_command(
+                "benchmark_endpoints", output=self.output, repeat=1, stdout=StringIO()
+            )
+        report = json.loads(self.output.read_text())
+        self.assertTrue(report["endpoints"][0]["over_budget"])
@@ -0,0 +1,245 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.events.handler import create_consultation_events
+from care.facility.models import DailyRound
+from care.facility.models.daily_round import AutomatedVitals
+from care.facility.models.events import EventType, PatientConsultationEvent
+from care.facility.utils.automated_vitals import get_vitals_queryset
+from care.facility.utils.timeline import get_latest_events
+from care.utils.cache.event_types import (
+    get_event_type_groups,
+    invalidate_event_type_groups,
+)
+from care.utils.tests.test_utils import TestUtils
+
+
+@override_settings(EVENT_TYPES_LOCAL_CACHE_TIMEOUT=60)
+class ConsultationEventsTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command("load_event_types", stdout=StringIO())
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user("staff1", cls.district, home_facility=cls.facility)
+        cls.patient = cls.create_patient(district=cls.district, facility=cls.facility)
+        cls.consultation = cls.create_consultation(
+            facility=cls.facility, patient=cls.patient
+        )
+
+    def tearDown(self):
+        # the event types cached are rolled back with the test
+        invalidate_event_type_groups()
+
+    def create_rounds(self, count):
+        return DailyRound.objects.bulk_create(
+            DailyRound(
+                consultation=self.consultation,
+                taken_at=timezone.now(),
+                pulse=70 + i,
+                temperature=98,
+            )
+            for i in range(count)
+        )
+
+    def create_events(self, rounds, taken_at=None):
+        create_consultation_events(
+            self.consultation.id,
+            rounds,
+            self.user.id,
+            taken_at=taken_at,
+            fields_to_store={"pulse", "temperature"},
+        )
+
+    def test_event_type_groups_are_cached(self):
+        get_event_type_groups(DailyRound.__name__)
+        with self.assertNumQueries(0):
+            groups = get_event_type_groups(DailyRound.__name__)
+        self.assertIn("PULSE", [group.name for group in groups])
+
+        pulse = EventType.objects.get(name="PULSE")
+        pulse.is_active = False
+        pulse.save()
+        self.assertNotIn(
+            "PULSE",
+            [group.name for group in get_event_type_groups(DailyRound.__name__)],
+        )
+
+        call_command("load_event_types", stdout=StringIO())
+        self.assertIn(
+            "PULSE",
+            [group.name for group in get_event_type_groups(DailyRound.__name__)],
+        )
+
+    def test_batches_are_written_with_constant_queries(self):
+        get_event_type_groups(DailyRound.__name__)
+        with CaptureQueriesContext(connection) as single:
+            self.create_events(self.create_rounds(1))
+        with CaptureQueriesContext(connection) as batch:
+            self.create_events(self.create_rounds(50))
+        self.assertEqual(len(batch), len(single))
+        self.assertEqual(
+            PatientConsultationEvent.objects.filter(
+                event_type__name="PULSE", is_latest=True
+            ).count(),
+            51,
+        )
+
+    def test_previous_events_are_no_longer_latest(self):
+        rounds = self.create_rounds(2)
+        self.create_events(rounds, timezone.now() - timedelta(hours=1))
+        self.create_events(rounds[:1])
+
+        latest = PatientConsultationEvent.objects.filter(is_latest=True)
+        self.assertEqual(latest.count(), 4)
+        self.assertEqual(
+            PatientConsultationEvent.objects.filter(
+                is_latest=False, object_id=rounds[0].id
+            ).count(),
+            2,
+        )
+
+        # events taken earlier do not supersede the ones taken later
+        self.create_events(rounds[1:], timezone.now() - timedelta(hours=2))
+        self.assertEqual(
+            latest.filter(object_id=rounds[1].id).count(),
+            4,
+        )
+
+
+class ConsultationTimelineTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command("load_event_types", stdout=StringIO())
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user("staff1", cls.district, home_facility=cls.facility)
+        cls.patient = cls.create_patient(district=cls.district, facility=cls.facility)
+        cls.consultation = cls.create_consultation(
+            facility=cls.facility, patient=cls.patient
+        )
+        now = timezone.now()
+        cls.rounds = []
+        for hours in range(5, 0, -1):
+            daily_round = DailyRound.objects.create(
+                consultation=cls.consultation,
+                taken_at=now - timedelta(hours=hours),
+                pulse=70 + hours,
+                temperature=98,
+            )
+            create_consultation_events(
+                cls.consultation.id,
+                daily_round,
+                cls.user.id,
+                taken_at=daily_round.taken_at,
+                fields_to_store={"pulse", "temperature"},
+            )
+            cls.rounds.append(daily_round)
+        # taken between the rounds of 3 and 2 hours ago
+        cls.vitals = AutomatedVitals.objects.create(
+            consultation=cls.consultation,
+            taken_at=now - timedelta(hours=2, minutes=30),
+            pulse=60,
+        )
+
+    def get_url(self, action):
+        return f"/api/v1/consultation/{self.consultation.external_id}/events/{action}/"
+
+    def test_timeline_pages(self):
+        url = self.get_url("timeline")
+        entries = []
+        while url:
+            response = self.client.get(url, {"limit": 4} if not entries else None)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            entries += response.data["results"]
+            url = response.data["next"]
+
+        # the events of a round may be split between two pages
+        merged = {}
+        for entry in entries:
+            key = (entry["taken_at"], entry["object_id"])
+            merged.setdefault(key, []).extend(entry["events"])
+        self.assertEqual(len(merged), 6)
+        self.assertEqual(
+            sum(len(events) for events in merged.values()),
+            PatientConsultationEvent.objects.count() + 2,
+        )
+        self.assertEqual(
+            [entry["event_type"]["name"] for entry in entries],
+            ["DAILY_ROUND"] * len(entries),
+        )
+        taken_at = [entry["taken_at"] for entry in entries]
+        self.assertEqual(taken_at, sorted(taken_at, reverse=True))
+        self.assertEqual(
+            list(merged)[2],
+            (timezone.localtime(self.vitals.taken_at).isoformat(), self.vitals.id),
+        )
+
+        response = self.client.get(self.get_url("timeline"), {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_timeline_of_event_types_without_a_path(self):
+        EventType.objects.filter(name="VITALS").update(path="")
+        response = self.client.get(self.get_url("timeline"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {entry["event_type"]["name"] for entry in response.data["results"]},
+            {"DAILY_ROUND"},
+        )
+
+    def test_timeline_of_a_subtree(self):
+        vitals = EventType.objects.get(name="VITALS")
+        response = self.client.get(
+            self.get_url("timeline"), {"event_type": vitals.id, "limit": 500}
+        )
+        names = {
+            event_type.id: event_type.name for event_type in EventType.objects.all()
+        }
+        self.assertEqual(
+            {
+                names[event["event_type"]]
+                for entry in response.data["results"]
+                for event in entry["events"]
+            },
+            {"PULSE", "TEMPERATURE"},
+        )
+        self.assertEqual(len(response.data["results"]), 6)
+
+    def test_latest_events(self):
+        # the event types of the compactly stored vitals are not cached in tests
+        with self.assertNumQueries(3):
+            events = get_latest_events(
+                PatientConsultationEvent.objects.filter(
+                    consultation=self.consultation
+                ).select_related("event_type", "caused_by"),
+                get_vitals_queryset(self.consultation),
+            )
+        latest = {event.event_type.name: event.value for event in events}
+        self.assertEqual(latest["PULSE"], {"pulse": 71})
+        self.assertEqual(latest["TEMPERATURE"], {"temperature": 98.0})
+
+        PatientConsultationEvent.objects.filter(
+            object_id__in=[daily_round.id for daily_round in self.rounds[-2:]]
+        ).delete()
+        response = self.client.get(self.get_url("latest"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        latest = {
+            event["event_type"]["name"]: event["value"] for event in response.data
+        }
+        # the pulse of the compactly stored vitals is newer than the rounds
+        self.assertEqual(latest["PULSE"], {"pulse": 60})
+        self.assertEqual(latest["TEMPERATURE"], {"temperature": 98.0})
@@ -0,0 +1,182 @@
+import csv
+import io
+from unittest.mock import patch
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from care.facility.utils.reports import csv_export
+from care.utils.csp.config import BucketType
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class CSVExportTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.user, cls.district, cls.local_body, name="Export Facility"
+        )
+        cls.patient = cls.create_patient(cls.district, cls.facility)
+        cls.discharged_patient = cls.create_patient(cls.district, cls.facility)
+        cls.consultation = cls.create_consultation(
+            cls.discharged_patient,
+            cls.facility,
+            discharge_date=timezone.now(),
+            suggestion="A",
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get_rows(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        self.assertTrue(content.startswith("\ufeff"))
+        return list(csv.DictReader(io.StringIO(content[1:])))
+
+    def test_facility_export(self):
+        response = self.client.get("/api/v1/facility/?csv")
+        rows = self.get_rows(response)
+        self.assertIn("Export Facility", [row["Facility Name"] for row in rows])
+
+    def test_patient_export(self):
+        today = timezone.now().date()
+        response = self.client.get(
+            "/api/v1/patient/?csv"
+            f"&created_date_after={today - timezone.timedelta(days=20)}"
+            f"&created_date_before={today}"
+        )
+        rows = self.get_rows(response)
+        self.assertEqual(
+            [row["Patient ID"] for row in rows],
+            [str(self.discharged_patient.external_id)],
+        )
+        self.assertEqual(rows[0]["Decision after consultation"], "ADMISSION")
+        self.assertEqual(rows[0]["Confirmed Diagnoses"], "")
+
+    def test_patient_export_limit(self):
+        today = timezone.now().date()
+        response = self.client.get(
+            "/api/v1/patient/?csv"
+            f"&created_date_after={today - timezone.timedelta(days=60)}"
+            f"&created_date_before={today}"
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncCSVExportTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.user, cls.district, cls.local_body, name="Export Facility"
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def mock_s3(self, boto3):
+        s3 = boto3.client.return_value
+        s3.create_multipart_upload.return_value = {"UploadId": "upload"}
+        s3.upload_part.side_effect = lambda **kwargs: {
+            "ETag": f"etag-{kwargs['PartNumber']}"
+        }
+        s3.generate_presigned_url.return_value = "https://bucket.local/export.csv"
+        return s3
+
+    @OverrideCache
+    @patch("care.facility.utils.reports.csv_export.boto3")
+    def test_identical_exports_are_generated_once(self, boto3):
+        s3 = self.mock_s3(boto3)
+
+        response = self.client.get("/api/v1/facility/?csv&async")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["url"], "https://bucket.local/export.csv")
+        self.assertEqual(response.data["rows"], 1)
+        content = s3.upload_part.call_args.kwargs["Body"].decode()
+        self.assertIn("Export Facility", content)
+        s3.complete_multipart_upload.assert_called_once()
+
+        response = self.client.get("/api/v1/facility/?csv&async")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(s3.create_multipart_upload.call_count, 1)
+
+        response = self.client.get("/api/v1/facility/?csv&async&facility_capacity")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(s3.create_multipart_upload.call_count, 2)
+
+    @OverrideCache
+    @patch("care.facility.api.viewsets.mixins.csv_export.export_csv_task")
+    def test_pending_export_is_not_started_again(self, export_csv_task):
+        response = self.client.get("/api/v1/facility/?csv&async")
+        self.assertEqual(response.status_code, 202)
+        response = self.client.get("/api/v1/facility/?csv&async")
+        self.assertEqual(response.status_code, 202)
+        export_csv_task.delay.assert_called_once()
+
+        # the task marks the export running before counting and uploading it
+        export_id = export_csv_task.delay.call_args.args[0]
+        states = []
+        with patch(
+            "care.facility.utils.reports.csv_export.upload_csv",
+            side_effect=lambda *args, **kwargs: states.append(
+                csv_export.get_export_state(export_id)
+            )
+            or 1,
+        ):
+            csv_export.generate_csv_export(
+                export_id,
+                *export_csv_task.delay.call_args.args[1:4],
+                BucketType.FACILITY,
+            )
+        self.assertEqual(states[0]["status"], csv_export.ExportStatus.RUNNING.value)
+        self.assertEqual(
+            csv_export.get_export_state(export_id)["status"],
+            csv_export.ExportStatus.DONE.value,
+        )
+
+    @OverrideCache
+    @patch("care.facility.utils.reports.csv_export.boto3")
+    def test_failed_export(self, boto3):
+        s3 = self.mock_s3(boto3)
+        s3.upload_part.side_effect = ValueError
+
+        response = self.client.get("/api/v1/facility/?csv&async")
+        self.assertEqual(response.status_code, 503)
+        s3.abort_multipart_upload.assert_called_once()
+
+    @OverrideCache
+    @patch("care.facility.utils.reports.csv_export.boto3")
+    def test_retried_export_restarts_from_the_first_line(self, boto3):
+        s3 = self.mock_s3(boto3)
+        csv_export.set_export_state(
+            "export",
+            {
+                "status": csv_export.ExportStatus.RUNNING.value,
+                "progress": 50,
+                "upload_id": "previous",
+            },
+        )
+
+        rows = csv_export.upload_csv(
+            "export", iter(["bom", "header\n", "1\n", "2\n"]), BucketType.PATIENT, 2
+        )
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(
+            s3.abort_multipart_upload.call_args.kwargs["UploadId"], "previous"
+        )
+        s3.create_multipart_upload.assert_called_once()
+        self.assertEqual(s3.upload_part.call_args.kwargs["Body"], b"bomheader\n1\n2\n")
+        self.assertEqual(
+            s3.complete_multipart_upload.call_args.kwargs["MultipartUpload"],
+            {"Parts": [{"PartNumber": 1, "ETag": "etag-1"}]},
+        )
@@ -0,0 +1,111 @@
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models.events import EventType
+from care.utils.tests.test_utils import TestUtils
+
+
+class EventTypeTreeTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command("load_event_types", stdout=StringIO())
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.user = cls.create_user("staff1", cls.district)
+
+    def test_paths(self):
+        daily_round = EventType.objects.get(name="DAILY_ROUND")
+        vitals = EventType.objects.get(name="VITALS")
+        pulse = EventType.objects.get(name="PULSE")
+        self.assertEqual(pulse.path, f"/{daily_round.id}/{vitals.id}/{pulse.id}/")
+
+        with self.assertNumQueries(1):
+            descendants = {event_type.name for event_type in vitals.get_descendants()}
+        self.assertEqual(
+            descendants,
+            {
+                "TEMPERATURE",
+                "PULSE",
+                "BLOOD_PRESSURE",
+                "RESPIRATORY_RATE",
+                "RHYTHM",
+                "PAIN_SCALE",
+            },
+        )
+        with self.assertNumQueries(1):
+            ancestors = {event_type.name for event_type in pulse.get_ancestors()}
+        self.assertEqual(ancestors, {"DAILY_ROUND", "VITALS"})
+
+    def test_event_types_without_a_path(self):
+        vitals = EventType.objects.get(name="VITALS")
+        EventType.objects.filter(name="VITALS").update(path="")
+        vitals.refresh_from_db()
+        self.assertEqual(len(vitals.get_descendants()), 6)
+        self.assertEqual(
+            {event_type.name for event_type in vitals.get_ancestors()},
+            {"DAILY_ROUND"},
+        )
+        with self.assertRaises(ValueError):
+            EventType(name="UNSAVED").get_descendants()
+
+        child = EventType.objects.create(
+            parent=vitals, name="SPO2_TREND", model="DailyRound"
+        )
+        self.assertEqual(child.path, f"{vitals.get_path()}{child.id}/")
+        self.assertIn(child, vitals.get_descendants())
+
+    def test_moved_subtrees_keep_their_paths(self):
+        vitals = EventType.objects.get(name="VITALS")
+        consultation = EventType.objects.get(name="CONSULTATION")
+        vitals.parent = consultation
+        vitals.save()
+        pulse = EventType.objects.get(name="PULSE")
+        self.assertEqual(pulse.path, f"/{consultation.id}/{vitals.id}/{pulse.id}/")
+        self.assertIn(pulse, consultation.get_descendants())
+
+        call_command("load_event_types", stdout=StringIO())
+        pulse.refresh_from_db()
+        self.assertTrue(pulse.path.startswith(f"/{pulse.parent.parent_id}/"))
+        self.assertNotIn(pulse, consultation.get_descendants())
+
+    def test_api(self):
+        vitals = EventType.objects.get(name="VITALS")
+        pulse = EventType.objects.get(name="PULSE")
+
+        response = self.client.get(f"/api/v1/event_types/{vitals.id}/descendants/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 6)
+
+        response = self.client.get(f"/api/v1/event_types/{pulse.id}/ancestors/")
+        self.assertEqual(
+            [event_type["name"] for event_type in response.data],
+            ["DAILY_ROUND", "VITALS"],
+        )
+
+        EventType.objects.filter(name="PATIENT_NOTES").update(is_active=False)
+        # the session and the user, then the whole tree
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/event_types/roots/")
+        daily_round = next(
+            event_type
+            for event_type in response.data
+            if event_type["name"] == "DAILY_ROUND"
+        )
+        vitals_data = next(
+            child for child in daily_round["children"] if child["name"] == "VITALS"
+        )
+        self.assertEqual(len(vitals_data["children"]), 6)
+        self.assertNotIn(
+            "PATIENT_NOTES", [event_type["name"] for event_type in response.data]
+        )
+
+    def test_inactive_ancestors_are_not_listed(self):
+        pulse = EventType.objects.get(name="PULSE")
+        EventType.objects.filter(name="VITALS").update(is_active=False)
+        response = self.client.get(f"/api/v1/event_types/{pulse.id}/ancestors/")
+        self.assertEqual(
+            [event_type["name"] for event_type in response.data], ["DAILY_ROUND"]
+        )
@@ -0,0 +1,100 @@
+from django.test import TestCase
+
+from care.facility.models import Facility, FacilityRelatedSummary
+from care.facility.models.inventory import (
+    FacilityInventoryBurnRate,
+    FacilityInventoryItem,
+    FacilityInventoryLog,
+    FacilityInventorySummary,
+    FacilityInventoryUnit,
+)
+from care.facility.utils.summarization.facility_capacity import (
+    facility_capacity_summary,
+)
+from care.utils.tests.test_utils import TestUtils
+
+
+class FacilityCapacitySummaryTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.other_facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.create_bed(cls.facility, cls.location)
+
+        cls.create_patient(cls.district, cls.facility)
+        cls.create_patient(cls.district, cls.facility)
+        cls.create_patient(cls.district, cls.facility, is_active=False)
+
+        unit = FacilityInventoryUnit.objects.create(name="Cylinders")
+        cls.item = FacilityInventoryItem.objects.create(
+            name="Oxygen", default_unit=unit, min_quantity=1
+        )
+        FacilityInventorySummary.objects.create(
+            facility=cls.facility, item=cls.item, quantity=15
+        )
+        FacilityInventoryBurnRate.objects.create(
+            facility=cls.facility, item=cls.item, burn_rate=2.5
+        )
+        FacilityInventoryLog.objects.create(
+            facility=cls.facility,
+            item=cls.item,
+            is_incoming=True,
+            quantity_in_default_unit=10,
+            current_stock=20,
+        )
+        FacilityInventoryLog.objects.create(
+            facility=cls.facility,
+            item=cls.item,
+            is_incoming=False,
+            quantity_in_default_unit=5,
+            current_stock=15,
+        )
+
+    def get_summary(self, facility):
+        return FacilityRelatedSummary.objects.get(
+            s_type="FacilityCapacity", facility=facility
+        )
+
+    def test_facility_capacity_summary(self):
+        # the summary does not rely on the counters of the facilities
+        Facility.objects.filter(id=self.facility.id).update(
+            bed_count=0, patient_count=0
+        )
+        facility_capacity_summary()
+
+        data = self.get_summary(self.facility).data
+        self.assertEqual(data["actual_live_patients"], 2)
+        self.assertEqual(data["actual_discharged_patients"], 1)
+        self.assertEqual(data["patient_count"], 2)
+        self.assertEqual(data["bed_count"], 1)
+
+        inventory = data["inventory"][str(self.item.id)]
+        self.assertEqual(inventory["burn_rate"], 2.5)
+        self.assertEqual(inventory["end_stock"], 15)
+        self.assertEqual(inventory["total_added"], 10)
+        self.assertEqual(inventory["total_consumed"], 5)
+        self.assertEqual(inventory["start_stock"], 10)
+
+        other_data = self.get_summary(self.other_facility).data
+        self.assertEqual(other_data["actual_live_patients"], 0)
+        self.assertEqual(other_data["inventory"], {})
+
+    def test_facility_capacity_summary_updates_existing_summary(self):
+        facility_capacity_summary()
+        self.create_patient(self.district, self.facility)
+        facility_capacity_summary()
+
+        self.assertEqual(
+            FacilityRelatedSummary.objects.filter(
+                s_type="FacilityCapacity", facility=self.facility
+            ).count(),
+            1,
+        )
+        self.assertEqual(
+            self.get_summary(self.facility).data["actual_live_patients"], 3
+        )
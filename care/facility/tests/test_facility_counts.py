@@ -0,0 +1,66 @@
+from django.test import TestCase
+
+from care.facility.models import Facility, PatientRegistration
+from care.facility.tasks.facility_counts import reconcile_facility_counts
+from care.utils.tests.test_utils import TestUtils
+
+
+class FacilityCountsTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.other_facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.location = cls.create_asset_location(cls.facility)
+
+    def assert_counts(self, facility, bed_count, patient_count):
+        facility.refresh_from_db()
+        self.assertEqual(
+            (facility.bed_count, facility.patient_count), (bed_count, patient_count)
+        )
+
+    def test_bed_counts(self):
+        bed = self.create_bed(self.facility, self.location)
+        self.create_bed(self.facility, self.location, name="Other Bed")
+        self.assert_counts(self.facility, 2, 0)
+
+        bed.delete()
+        self.assert_counts(self.facility, 1, 0)
+
+    def test_patient_counts(self):
+        patient = self.create_patient(self.district, self.facility)
+        self.assert_counts(self.facility, 0, 1)
+
+        # transfer
+        patient.facility = self.other_facility
+        patient.save()
+        self.assert_counts(self.facility, 0, 0)
+        self.assert_counts(self.other_facility, 0, 1)
+
+        # discharge
+        patient.is_active = False
+        patient.save()
+        self.assert_counts(self.other_facility, 0, 0)
+
+    def test_outdated_facility_does_not_overwrite_counts(self):
+        facility = Facility.objects.get(id=self.facility.id)
+        self.create_patient(self.district, self.facility)
+
+        facility.name = "Renamed Facility"
+        facility.save()
+        self.assert_counts(facility, 0, 1)
+        self.assertEqual(facility.name, "Renamed Facility")
+
+    def test_reconciliation(self):
+        patient = self.create_patient(self.district, self.facility)
+        PatientRegistration.objects.filter(id=patient.id).update(
+            facility=self.other_facility
+        )
+        self.assert_counts(self.facility, 0, 1)
+
+        reconcile_facility_counts()
+        self.assert_counts(self.facility, 0, 0)
+        self.assert_counts(self.other_facility, 0, 1)
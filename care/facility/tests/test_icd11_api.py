@@ -1,6 +1,9 @@
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from care.facility.models.icd11_diagnosis import ICD11Diagnosis
+from care.facility.static_data.icd11 import icd11_search_index
 from care.utils.tests.test_utils import TestUtils
 
 
@@ -54,3 +57,34 @@ class TestICD11Api(TestUtils, APITestCase):
     def test_get_icd11_by_invalid_id(self):
         res = self.client.get("/api/v1/icd/invalid/")
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(STATIC_DATA_SEARCH_BACKEND="memory")
+    def test_search_in_memory(self):
+        ICD11Diagnosis.objects.create(
+            id=999999991,
+            icd11_id="999999991",
+            label="XY99.9 Spurious radiodermatitis",
+            class_kind="category",
+            is_leaf=True,
+            average_depth=3,
+            is_adopted_child=False,
+            breadth_value=0,
+            meta_chapter="99 Test chapter",
+        )
+        icd11_search_index.reset()
+        self.addCleanup(icd11_search_index.reset)
+
+        res = self.search_icd11("spurious radio")
+        self.assertEqual(
+            res.data,
+            [
+                {
+                    "id": 999999991,
+                    "label": "XY99.9 Spurious radiodermatitis",
+                    "chapter": "",
+                }
+            ],
+        )
+
+        res = self.search_icd11("XY99.9")
+        self.assertContains(res, "XY99.9 Spurious radiodermatitis")
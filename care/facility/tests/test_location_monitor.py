@@ -0,0 +1,67 @@
+import requests
+import requests_mock
+from django.test import TestCase
+
+from care.facility.models.asset import AvailabilityRecord, AvailabilityStatus
+from care.facility.tasks.location_monitor import check_location_status
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class LocationMonitorTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.user,
+            cls.district,
+            cls.local_body,
+            middleware_address="middleware.local",
+        )
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.other_location = cls.create_asset_location(cls.facility)
+        cls.dead_location = cls.create_asset_location(
+            cls.facility, middleware_address="dead-middleware.local"
+        )
+
+    def get_status(self, location):
+        return (
+            AvailabilityRecord.objects.filter(object_external_id=location.external_id)
+            .first()
+            .status
+        )
+
+    @OverrideCache
+    @requests_mock.Mocker()
+    def test_middlewares_are_probed_once(self, mock_requests):
+        probe = mock_requests.get(
+            "https://middleware.local/devices/status", json=[{"status": {}}]
+        )
+        dead_probe = mock_requests.get(
+            "https://dead-middleware.local/devices/status",
+            exc=requests.ConnectTimeout,
+        )
+
+        with self.assertNumQueries(4):
+            check_location_status()
+
+        self.assertEqual(probe.call_count, 1)
+        self.assertEqual(
+            self.get_status(self.location), AvailabilityStatus.OPERATIONAL.value
+        )
+        self.assertEqual(
+            self.get_status(self.other_location), AvailabilityStatus.OPERATIONAL.value
+        )
+        self.assertEqual(
+            self.get_status(self.dead_location), AvailabilityStatus.DOWN.value
+        )
+
+        # the circuit of the unreachable middleware is open, it is not probed again
+        check_location_status()
+        self.assertEqual(probe.call_count, 2)
+        self.assertEqual(dead_probe.call_count, 1)
+        self.assertEqual(
+            self.get_status(self.dead_location), AvailabilityStatus.DOWN.value
+        )
@@ -1,6 +1,9 @@
+from django.test import override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from care.facility.models import MedibaseMedicine
+from care.facility.static_data.medibase import medibase_search_index
 from care.utils.tests.test_utils import TestUtils
 
 
@@ -30,3 +33,25 @@ class TestMedibaseApi(TestUtils, APITestCase):
         self.assertEqual(response.data[0]["name"], "PANADOL")
         self.assertEqual(response.data[0]["generic"], "paracetamol")
         self.assertEqual(response.data[0]["company"], "GSK")
+
+    @override_settings(STATIC_DATA_SEARCH_BACKEND="memory")
+    def test_search_in_memory(self):
+        MedibaseMedicine.objects.create(
+            name="ZYPARAMOL", type="brand", generic="zyparacetamol", company="ACME"
+        )
+        MedibaseMedicine.objects.create(name="zyparacetamol", type="generic")
+        medibase_search_index.reset()
+        self.addCleanup(medibase_search_index.reset)
+
+        response = self.client.get(self.get_url(query="zyparacetamol"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [medicine["name"] for medicine in response.data],
+            ["zyparacetamol", "ZYPARAMOL"],
+        )
+        self.assertEqual(response.data[1]["company"], "ACME")
+
+        response = self.client.get(f"{self.get_url(query='zyparacetamol')}&type=brand")
+        self.assertEqual(
+            [medicine["name"] for medicine in response.data], ["ZYPARAMOL"]
+        )
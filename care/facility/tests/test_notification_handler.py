@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+from django.test import TestCase
+from pywebpush import WebPushException
+from requests import Response
+
+from care.facility.models.notification import Notification
+from care.users.models import User
+from care.utils.notification_handler import NotificationGenerator
+from care.utils.tests.test_utils import TestUtils
+
+
+def push_service_reply(status_code):
+    response = Response()
+    response.status_code = status_code
+    return WebPushException("Push failed", response=response)
+
+
+class NotificationGeneratorTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user(
+            "doctor",
+            cls.district,
+            home_facility=cls.facility,
+            user_type=User.TYPE_VALUE_MAP["Doctor"],
+        )
+        subscription = {"pf_p256dh": "p256dh", "pf_auth": "auth"}
+        cls.subscribed_user = cls.create_user(
+            "subscribed",
+            cls.district,
+            home_facility=cls.facility,
+            pf_endpoint="https://push.local/subscribed",
+            **subscription,
+        )
+        cls.unsubscribed_user = cls.create_user(
+            "unsubscribed",
+            cls.district,
+            home_facility=cls.facility,
+            pf_endpoint="https://push.local/unsubscribed",
+            **subscription,
+        )
+        cls.other_user = cls.create_user(
+            "other", cls.district, home_facility=cls.facility
+        )
+
+    def notify(self):
+        NotificationGenerator(
+            event_type=Notification.EventType.CUSTOM_MESSAGE,
+            event=Notification.Event.MESSAGE,
+            caused_by=self.user,
+            facility=self.facility,
+            caused_object=self.user,
+            message="Hello",
+        ).generate()
+
+    @patch("care.utils.webpush.time.sleep")
+    @patch("care.utils.webpush.webpush")
+    def test_notifications_are_sent_to_facility_users(self, webpush, sleep):
+        def reply(subscription_info, **kwargs):
+            if subscription_info["endpoint"].endswith("/unsubscribed"):
+                raise push_service_reply(410)
+            if webpush.call_count == 1:
+                raise push_service_reply(503)
+
+        webpush.side_effect = reply
+        self.notify()
+
+        self.assertCountEqual(
+            Notification.objects.values_list("intended_for", flat=True),
+            [
+                self.super_user.id,
+                self.subscribed_user.id,
+                self.unsubscribed_user.id,
+                self.other_user.id,
+            ],
+        )
+        pushed_endpoints = [
+            call.kwargs["subscription_info"]["endpoint"]
+            for call in webpush.call_args_list
+        ]
+        self.assertEqual(
+            pushed_endpoints.count("https://push.local/unsubscribed"),
+            1,
+        )
+        self.assertIn("https://push.local/subscribed", pushed_endpoints)
+
+        self.unsubscribed_user.refresh_from_db()
+        self.assertIsNone(self.unsubscribed_user.pf_endpoint)
+        self.subscribed_user.refresh_from_db()
+        self.assertIsNotNone(self.subscribed_user.pf_endpoint)
+
+    @patch("care.utils.webpush.time.sleep")
+    @patch("care.utils.webpush.webpush", side_effect=push_service_reply(503))
+    def test_unavailable_push_service_is_retried(self, webpush, sleep):
+        self.notify()
+
+        # both subscribed users are tried once and retried twice
+        self.assertEqual(webpush.call_count, 6)
+        self.assertEqual(sleep.call_count, 4)
+        self.subscribed_user.refresh_from_db()
+        self.assertIsNotNone(self.subscribed_user.pf_endpoint)
@@ -1,10 +1,12 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 
+from django.conf import settings
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from care.facility.models import PatientRegistration
+from care.facility.models import DailyRound, PatientRegistration
 from care.facility.models.patient_consultation import PatientConsultation
 from care.utils.tests.test_utils import TestUtils
 
@@ -324,3 +326,98 @@ class TestDailyRoundApi(TestUtils, APITestCase):
             data,
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def create_rounds(self, start, values):
+        for hours, temperature, pulse, bp in values:
+            DailyRound.objects.create(
+                consultation=self.consultation_with_bed,
+                taken_at=start + timedelta(hours=hours),
+                temperature=temperature,
+                pulse=pulse,
+                bp=bp,
+            )
+
+    def test_analyse_buckets(self):
+        start = datetime(2024, 1, 1, tzinfo=ZoneInfo(settings.TIME_ZONE))
+        self.create_rounds(
+            start,
+            [
+                (0.5, 98, 80, {"systolic": 120, "diastolic": 80}),
+                (1, 99, None, {"systolic": 110, "diastolic": 70}),
+                (3, 100, 90, None),
+                (9, None, 100, {"systolic": 130, "diastolic": 90}),
+                (30, 101, 110, None),
+            ],
+        )
+        data = {
+            "fields": ["temperature", "pulse", "bp.systolic"],
+            "taken_at_after": start.isoformat(),
+            "taken_at_before": (start + timedelta(days=2)).isoformat(),
+        }
+
+        response = self.client.post(
+            self.get_url(self.consultation_with_bed.external_id),
+            {**data, "bucket": "shift"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["buckets"],
+            [start, start + timedelta(hours=8), start + timedelta(hours=24)],
+        )
+        self.assertEqual(response.data["count"], [3, 1, 1])
+        fields = response.data["fields"]
+        self.assertEqual(
+            fields["temperature"],
+            {
+                "min": [98, None, 101],
+                "max": [100, None, 101],
+                "avg": [99, None, 101],
+                "last": [100, None, 101],
+            },
+        )
+        self.assertEqual(fields["pulse"]["avg"], [85, 100, 110])
+        self.assertEqual(fields["pulse"]["last"], [90, 100, 110])
+        self.assertEqual(fields["bp.systolic"]["last"], [110, 130, None])
+        self.assertEqual(fields["bp.systolic"]["max"], [120, 130, None])
+
+        response = self.client.post(
+            self.get_url(self.consultation_with_bed.external_id),
+            {**data, "bucket": "day"},
+            format="json",
+        )
+        self.assertEqual(response.data["count"], [4, 1])
+
+        response = self.client.post(
+            self.get_url(self.consultation_with_bed.external_id),
+            {**data, "bucket": "hour"},
+            format="json",
+        )
+        self.assertEqual(response.data["count"], [1, 1, 1, 1, 1])
+
+    def test_analyse_buckets_validation(self):
+        url = self.get_url(self.consultation_with_bed.external_id)
+        response = self.client.post(
+            url, {"bucket": "week", "fields": ["pulse"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            url,
+            {"bucket": "hour", "fields": ["pulse", "rhythm", "bp.mean", "other"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {"rhythm", "bp.mean", "other"})
+
+        response = self.client.post(
+            url,
+            {
+                "bucket": "hour",
+                "fields": ["pulse"],
+                "taken_at_after": "2023-01-01T00:00:00",
+                "taken_at_before": "2024-01-01T00:00:00",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,113 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from care.facility.models import (
+    ConditionVerificationStatus,
+    DailyRound,
+    ICD11Diagnosis,
+    PrescriptionDosageType,
+    PrescriptionType,
+)
+from care.utils.tests.test_utils import TestUtils
+
+
+class PatientListQueriesTestCase(TestUtils, APITestCase):
+    # queries of a page of the patient list, whatever its size
+    PATIENT_LIST_QUERIES = 21
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.asset = cls.create_asset(cls.location)
+        cls.diagnoses = ICD11Diagnosis.objects.filter(is_leaf=True).order_by("id")[:2]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def create_admitted_patient(self):
+        patient = self.create_patient(self.district, self.facility)
+        consultation = self.create_consultation(
+            patient, self.facility, assigned_to=self.user
+        )
+        bed = self.create_bed(self.facility, self.location, name=f"Bed {patient.id}")
+        consultation_bed = self.create_consultation_bed(consultation, bed)
+        consultation_bed.assets.add(self.asset)
+        consultation.current_bed = consultation_bed
+        consultation.last_daily_round = DailyRound.objects.create(
+            consultation=consultation, created_by=self.user
+        )
+        consultation.save()
+        for diagnosis in self.diagnoses:
+            self.create_consultation_diagnosis(
+                consultation,
+                diagnosis,
+                ConditionVerificationStatus.CONFIRMED,
+                created_by=self.user,
+            )
+        self.create_encounter_symptom(consultation, self.user)
+        for dosage_type in PrescriptionDosageType:
+            self.create_prescription(
+                consultation,
+                self.user,
+                prescription_type=PrescriptionType.DISCHARGE.value,
+                dosage_type=dosage_type.value,
+            )
+        patient.last_consultation = consultation
+        patient.save()
+        return patient
+
+    def get_patient_list(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/v1/patient/")
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_patient_list_queries_do_not_grow_with_page_size(self):
+        self.create_admitted_patient()
+        _, queries = self.get_patient_list()
+        self.assertLessEqual(queries, self.PATIENT_LIST_QUERIES)
+
+        for _ in range(3):
+            self.create_admitted_patient()
+        response, page_queries = self.get_patient_list()
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(page_queries, queries)
+
+    def test_patient_list_batched_relations(self):
+        patient = self.create_admitted_patient()
+        response, _ = self.get_patient_list()
+
+        result = response.data["results"][0]
+        consultation = result["last_consultation"]
+        self.assertEqual(result["facility_object"]["bed_count"], 1)
+        self.assertEqual(result["facility_object"]["patient_count"], 1)
+        self.assertEqual(consultation["patient"], patient.external_id)
+        self.assertEqual(
+            sorted(diagnosis["diagnosis"] for diagnosis in consultation["diagnoses"]),
+            [diagnosis.id for diagnosis in self.diagnoses],
+        )
+        self.assertEqual(len(consultation["symptoms"]), 1)
+        self.assertEqual(len(consultation["current_bed"]["assets_objects"]), 1)
+        self.assertEqual(
+            {
+                prescription["dosage_type"]
+                for prescription in consultation["discharge_prescription"]
+            },
+            {
+                PrescriptionDosageType.REGULAR.value,
+                PrescriptionDosageType.TITRATED.value,
+            },
+        )
+        self.assertEqual(
+            [
+                prescription["dosage_type"]
+                for prescription in consultation["discharge_prn_prescription"]
+            ],
+            [PrescriptionDosageType.PRN.value],
+        )
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+from django.test import TestCase
+from django.utils.timezone import make_aware
+from freezegun import freeze_time
+
+from care.facility.models import DistrictScopedSummary, FacilityRelatedSummary
+from care.facility.utils.summarization.district.patient_summary import (
+    district_patient_summary,
+)
+from care.facility.utils.summarization.patient_summary import patient_summary
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class PatientSummaryTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.other_facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.bed = cls.create_bed(cls.facility, cls.location)
+
+        patient = cls.create_patient(
+            cls.district, cls.facility, local_body=cls.local_body
+        )
+        consultation = cls.create_consultation(patient, cls.facility)
+        consultation.current_bed = cls.create_consultation_bed(consultation, cls.bed)
+        consultation.save()
+        patient = cls.create_patient(
+            cls.district, cls.other_facility, local_body=cls.local_body
+        )
+        cls.create_consultation(patient, cls.other_facility)
+
+    def get_summary(self, facility):
+        return FacilityRelatedSummary.objects.get(
+            s_type="PatientSummary", facility=facility
+        ).data
+
+    def test_patient_summary(self):
+        patient_summary()
+
+        data = self.get_summary(self.facility)
+        self.assertEqual(data["facility_name"], self.facility.name)
+        self.assertEqual(data["total_patients_isolation"], 1)
+        self.assertEqual(data["total_patients_home_quarantine"], 1)
+        self.assertEqual(data["total_patients_regular"], 0)
+
+        other_data = self.get_summary(self.other_facility)
+        self.assertEqual(other_data["total_patients_isolation"], 0)
+        self.assertEqual(other_data["total_patients_home_quarantine"], 1)
+
+    def test_district_patient_summary(self):
+        district_patient_summary()
+
+        data = DistrictScopedSummary.objects.get(district=self.district).data
+        local_body_data = data[str(self.local_body.id)]
+        self.assertEqual(local_body_data["total_patients_isolation"], 1)
+        self.assertEqual(local_body_data["total_patients_home_quarantine"], 2)
+        self.assertEqual(local_body_data["total_inactive"], 0)
+
+    @OverrideCache
+    def test_incremental_patient_summary_only_updates_changed_facilities(self):
+        with freeze_time(make_aware(datetime(2030, 1, 1, 10, 0))):
+            patient_summary(incremental=True)
+        FacilityRelatedSummary.objects.filter(facility=self.other_facility).delete()
+
+        with freeze_time(make_aware(datetime(2030, 1, 1, 10, 30))):
+            patient = self.create_patient(
+                self.district, self.facility, local_body=self.local_body
+            )
+            self.create_consultation(patient, self.facility)
+
+        with freeze_time(make_aware(datetime(2030, 1, 1, 11, 0))):
+            patient_summary(incremental=True)
+
+        self.assertEqual(
+            self.get_summary(self.facility)["total_patients_home_quarantine"], 2
+        )
+        self.assertFalse(
+            FacilityRelatedSummary.objects.filter(facility=self.other_facility).exists()
+        )
+
+    @OverrideCache
+    def test_incremental_patient_summary_runs_fully_on_a_new_day(self):
+        with freeze_time(make_aware(datetime(2030, 1, 1, 10, 0))):
+            patient_summary(incremental=True)
+
+        with freeze_time(make_aware(datetime(2030, 1, 2, 0, 59))):
+            patient_summary(incremental=True)
+
+        self.assertEqual(
+            FacilityRelatedSummary.objects.filter(facility=self.other_facility).count(),
+            2,
+        )
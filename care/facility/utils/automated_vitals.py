@@ -0,0 +1,442 @@
+import operator
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from functools import reduce
+
+from django.conf import settings
+from django.db.models import F, IntegerField, Q, QuerySet, Value
+
+from care.facility.events.handler import (
+    create_consultation_events,
+    serialize_event_value,
+)
+from care.facility.models.daily_round import AutomatedVitals, DailyRound
+from care.facility.models.events import ChangeType, PatientConsultationEvent
+from care.utils.cache.event_types import get_event_type_groups
+from care.utils.ulid.ulid import ULID
+
+# columns of the compact storage by field of the daily rounds, the keys of
+# the JSON fields being "<field>.<key>"
+VITALS_COLUMNS = {
+    "temperature": "temperature",
+    "pulse": "pulse",
+    "resp": "resp",
+    "ventilator_spo2": "ventilator_spo2",
+    "bp.systolic": "bp_systolic",
+    "bp.diastolic": "bp_diastolic",
+}
+
+# keys of the validated data of the rounds that can be stored compactly, the
+# telemedicine flags being set by the serializer for every round
+COMPACT_ROUND_KEYS = frozenset(
+    {"consultation", "rounds_type", "taken_at", "bp"}
+    | {"created_by_telemedicine", "last_updated_by_telemedicine"}
+    | {field for field in VITALS_COLUMNS if "." not in field}
+)
+
+EPOCH = datetime.fromtimestamp(0, tz=UTC)
+
+
+def can_store_compactly(validated_data: dict) -> bool:
+    """
+    Checks that the validated data is an automated round with nothing but
+    the vitals kept by the compact storage, when it is enabled.
+    """
+    return (
+        settings.AUTOMATED_VITALS_COMPACT_STORAGE
+        and validated_data.get("rounds_type") == DailyRound.RoundsType.AUTOMATED
+        and validated_data.get("taken_at") is not None
+        and validated_data.keys() <= COMPACT_ROUND_KEYS
+        and (validated_data.get("bp") or {}).keys() <= {"systolic", "diastolic"}
+    )
+
+
+def store_automated_vitals(validated_data: dict, user) -> DailyRound:
+    """
+    Stores the vitals of an automated round compactly, returning the round
+    as it is read back by the daily round endpoints.
+    """
+    bp = validated_data.get("bp") or {}
+    vitals = AutomatedVitals.objects.create(
+        consultation=validated_data["consultation"],
+        taken_at=validated_data["taken_at"],
+        created_by=user,
+        temperature=validated_data.get("temperature"),
+        pulse=validated_data.get("pulse"),
+        resp=validated_data.get("resp"),
+        ventilator_spo2=validated_data.get("ventilator_spo2"),
+        bp_systolic=bp.get("systolic"),
+        bp_diastolic=bp.get("diastolic"),
+    )
+    daily_round = as_daily_round(vitals)
+    supersede_stored_events(vitals, daily_round)
+    return daily_round
+
+
+def supersede_stored_events(vitals: AutomatedVitals, daily_round: DailyRound):
+    """
+    Marks the stored events of the rounds taken before the vitals as no longer
+    the latest ones, for the event types the vitals have a value for.
+    """
+    event_type_ids = [
+        group.id
+        for group in get_event_type_groups(DailyRound.__name__)
+        if any(serialize_event_value(daily_round, group.fields).values())
+    ]
+    if event_type_ids:
+        PatientConsultationEvent.objects.filter(
+            consultation_id=vitals.consultation_id,
+            object_model=DailyRound.__name__,
+            event_type_id__in=event_type_ids,
+            is_latest=True,
+            taken_at__lt=vitals.taken_at,
+        ).update(is_latest=False)
+
+
+def promote_automated_vitals(vitals: AutomatedVitals) -> DailyRound:
+    """
+    Moves a compactly stored round to the daily rounds, keeping its id, so
+    that it can be edited like any other round.
+    """
+    daily_round = as_daily_round(vitals)
+    daily_round.created_by_telemedicine = False
+    daily_round.last_updated_by_telemedicine = False
+    vitals.delete()
+    daily_round.save()
+    create_consultation_events(
+        daily_round.consultation_id,
+        daily_round,
+        daily_round.created_by_id,
+        daily_round.created_date,
+        taken_at=daily_round.taken_at,
+    )
+    return daily_round
+
+
+def as_daily_round(vitals: AutomatedVitals) -> DailyRound:
+    """
+    Returns an unsaved automated DailyRound with the vitals of a row of the
+    compact storage.
+    """
+    bp = {
+        key: value
+        for key, value in (
+            ("systolic", vitals.bp_systolic),
+            ("diastolic", vitals.bp_diastolic),
+        )
+        if value is not None
+    }
+    return DailyRound(
+        external_id=vitals.external_id,
+        consultation_id=vitals.consultation_id,
+        created_by=vitals.created_by,
+        rounds_type=DailyRound.RoundsType.AUTOMATED,
+        taken_at=vitals.taken_at,
+        created_date=vitals.taken_at,
+        modified_date=vitals.taken_at,
+        temperature=vitals.temperature,
+        pulse=vitals.pulse,
+        resp=vitals.resp,
+        ventilator_spo2=vitals.ventilator_spo2,
+        bp=bp or None,
+    )
+
+
+def get_vitals_queryset(consultation):
+    return AutomatedVitals.objects.filter(consultation=consultation).select_related(
+        "created_by"
+    )
+
+
+def load_by_id(queryset, build: Callable | None = None) -> Callable:
+    """
+    Returns a loader of the rows of the queryset for the keys of a page of a
+    UnionSequence, built with the given function.
+    """
+
+    def load(keys: list[tuple[int, int]]) -> dict:
+        rows = queryset.filter(id__in=[row_id for row_id, _ in keys])
+        return {
+            (row["id"] if isinstance(row, dict) else row.id, 0): build(row)
+            if build
+            else row
+            for row in rows
+        }
+
+    return load
+
+
+@dataclass
+class UnionSource:
+    """
+    A queryset of the rows of a UnionSequence, loaded page by page by id.
+    Sources sharing a loader are loaded together, `part` telling apart the
+    sources built from the same rows.
+    """
+
+    queryset: QuerySet
+    load: Callable[[list[tuple[int, int]]], dict]
+    key: str = "taken_at"
+    part: int = 0
+
+
+class UnionSequence:
+    """
+    The rows of several querysets sorted by a key, paginated in SQL with a
+    UNION of their narrow (key, source, id) tuples. Only the rows of the
+    page are then loaded, so that deep pages cost a single OFFSET query.
+    """
+
+    def __init__(self, sources: list[UnionSource], reverse: bool = True):
+        self.sources = sources
+        keys = [
+            source.queryset.order_by()
+            .annotate(
+                _key=F(source.key),
+                _source=Value(index, output_field=IntegerField()),
+            )
+            .values_list("_key", "_source", "id")
+            for index, source in enumerate(sources)
+        ]
+        ordering = (
+            ("-_key", "-_source", "-id") if reverse else ("_key", "_source", "id")
+        )
+        self.keys = keys[0].union(*keys[1:], all=True).order_by(*ordering)
+        self._count = None
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self.keys.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index: slice) -> list:
+        if not isinstance(index, slice) or index.step is not None:
+            msg = "Only slices without a step are supported"
+            raise TypeError(msg)
+        keys = list(self.keys[index])
+        by_loader = defaultdict(list)
+        for _, source_index, row_id in keys:
+            source = self.sources[source_index]
+            by_loader[source.load].append((row_id, source.part))
+        loaded = {}
+        for load, load_keys in by_loader.items():
+            for (row_id, part), item in load(load_keys).items():
+                loaded[load, row_id, part] = item
+        # rows deleted since the keys were read are skipped
+        items = (
+            loaded.get(
+                (
+                    self.sources[source_index].load,
+                    row_id,
+                    self.sources[source_index].part,
+                )
+            )
+            for _, source_index, row_id in keys
+        )
+        return [item for item in items if item is not None]
+
+
+class VirtualRounds:
+    """
+    The compactly stored automated rounds of a queryset, as DailyRound
+    instances or as dictionaries of the given fields, read as a source of a
+    UnionSequence.
+    """
+
+    def __init__(self, queryset, fields: list[str] | None = None):
+        self.queryset = queryset
+        # the ids of the related objects are read, like values() does
+        self.fields = fields and {
+            field: getattr(
+                DailyRound._meta.get_field(field),  # noqa: SLF001
+                "attname",
+                field,
+            )
+            for field in fields
+        }
+
+    def build(self, vitals: AutomatedVitals):
+        daily_round = as_daily_round(vitals)
+        if self.fields is None:
+            return daily_round
+        return {
+            field: getattr(daily_round, attname)
+            for field, attname in self.fields.items()
+        }
+
+    def source(self) -> UnionSource:
+        return UnionSource(self.queryset, load_by_id(self.queryset, self.build))
+
+
+def _has_value(column: str) -> Q:
+    if column.startswith("bp_"):
+        return Q(**{f"{column}__isnull": False})
+    # zero is empty for the events, as it is falsy
+    return Q(**{f"{column}__isnull": False}) & ~Q(**{column: 0})
+
+
+class VirtualEvents:
+    """
+    The consultation events of the compactly stored automated rounds, built
+    like the events of the DailyRound instances they are read as. The event
+    of the newest row having a value for an event type is the latest one.
+    Rows with a value for none of the event types are skipped in SQL, so
+    that every row loaded yields at least one event.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        event_types=None,
+        ordering: str = "-created_date",
+        is_latest: bool | None = None,
+        row_filter: Q | None = None,
+    ):
+        groups = get_event_type_groups(DailyRound.__name__)
+        if event_types is not None:
+            event_type_ids = {event_type.id for event_type in event_types}
+            groups = [group for group in groups if group.id in event_type_ids]
+        # the groups having a value in every row have no condition
+        probe = as_daily_round(AutomatedVitals(taken_at=EPOCH))
+        self.groups = []
+        for group in groups:
+            if any(serialize_event_value(probe, group.fields).values()):
+                self.groups.append((group, None))
+                continue
+            base_fields = {field.split("__", 1)[0] for field in group.fields}
+            columns = [
+                column
+                for field, column in VITALS_COLUMNS.items()
+                if field.split(".", 1)[0] in base_fields
+            ]
+            if columns:
+                self.groups.append(
+                    (group, reduce(operator.or_, map(_has_value, columns)))
+                )
+
+        self.queryset = queryset
+        self.is_latest = is_latest
+        # filters the rows read, the latest ones being those of the queryset
+        self.row_filter = row_filter if row_filter is not None else Q()
+        self._latest_rows = None
+        if not self.groups:
+            self.rows = queryset.none()
+        elif any(condition is None for _, condition in self.groups):
+            self.rows = queryset
+        else:
+            self.rows = queryset.filter(
+                reduce(operator.or_, (condition for _, condition in self.groups))
+            )
+        self.reverse = ordering.startswith("-")
+        self.rows = self.rows.order_by(
+            "-taken_at" if self.reverse else "taken_at",
+            "-id" if self.reverse else "id",
+        )
+
+    def get_latest_rows(self) -> dict[int, AutomatedVitals]:
+        """
+        Returns the newest row having a value for every event type, by the id
+        of the event type, fetched with a single query.
+        """
+        if self._latest_rows is None:
+            self._latest_rows = {}
+            rows = [
+                self.queryset.filter(condition if condition is not None else Q())
+                .annotate(group_id=Value(group.id))
+                .order_by("-taken_at", "-id")[:1]
+                for group, condition in self.groups
+            ]
+            if rows:
+                for vitals in rows[0].union(*rows[1:], all=True):
+                    self._latest_rows[vitals.group_id] = vitals
+        return self._latest_rows
+
+    def build_event(
+        self, vitals: AutomatedVitals, daily_round: DailyRound, group, value
+    ) -> PatientConsultationEvent:
+        latest = self.get_latest_rows().get(group.id)
+        # deterministic ids, ordered like the ones of the stored events
+        timestamp = int(vitals.taken_at.timestamp() * 1000).to_bytes(6, "big")
+        randomness = uuid.uuid5(
+            AutomatedVitals.EXTERNAL_ID_NAMESPACE, f"{vitals.external_id}:{group.id}"
+        ).bytes[:10]
+        return PatientConsultationEvent(
+            external_id=ULID(timestamp + randomness),
+            consultation_id=vitals.consultation_id,
+            caused_by=vitals.created_by,
+            event_type=group,
+            is_latest=latest is not None and latest.id == vitals.id,
+            created_date=vitals.taken_at,
+            taken_at=vitals.taken_at,
+            object_model=DailyRound.__name__,
+            object_id=vitals.id,
+            value=value,
+            change_type=ChangeType.CREATED,
+            meta={"external_id": str(daily_round.external_id)},
+        )
+
+    def events(self, vitals: AutomatedVitals):
+        daily_round = as_daily_round(vitals)
+        for group, _ in reversed(self.groups) if self.reverse else self.groups:
+            value = serialize_event_value(daily_round, group.fields)
+            if all(not v for v in value.values()):
+                continue
+            yield self.build_event(vitals, daily_round, group, value)
+
+    def latest(self) -> list:
+        """
+        Returns the latest event of every event type.
+        """
+        groups = {group.id: group for group, _ in self.groups}
+        latest = []
+        for group_id, vitals in self.get_latest_rows().items():
+            daily_round = as_daily_round(vitals)
+            group = groups[group_id]
+            value = serialize_event_value(daily_round, group.fields)
+            latest.append(self.build_event(vitals, daily_round, group, value))
+        return latest
+
+    def load(self, keys: list[tuple[int, int]]) -> dict:
+        groups = {group.id: group for group, _ in self.groups}
+        rows = {
+            vitals.id: vitals
+            for vitals in self.queryset.filter(id__in={row_id for row_id, _ in keys})
+        }
+        events = {}
+        for row_id, group_id in keys:
+            if (vitals := rows.get(row_id)) is None:
+                continue
+            daily_round = as_daily_round(vitals)
+            group = groups[group_id]
+            value = serialize_event_value(daily_round, group.fields)
+            events[row_id, group_id] = self.build_event(
+                vitals, daily_round, group, value
+            )
+        return events
+
+    def sources(self) -> list[UnionSource]:
+        """
+        Returns a source of a UnionSequence for every event type, of the rows
+        having a value for it, filtered on whether their event is the latest.
+        """
+        sources = []
+        for group, condition in self.groups:
+            queryset = self.queryset.filter(self.row_filter)
+            if condition is not None:
+                queryset = queryset.filter(condition)
+            if self.is_latest is not None:
+                latest = self.get_latest_rows().get(group.id)
+                if self.is_latest:
+                    if latest is None:
+                        continue
+                    queryset = queryset.filter(id=latest.id)
+                elif latest is not None:
+                    queryset = queryset.exclude(id=latest.id)
+            sources.append(UnionSource(queryset, self.load, part=group.id))
+        return sources
@@ -0,0 +1,68 @@
+from collections.abc import Collection
+from datetime import datetime
+from uuid import UUID
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from care.facility.models.asset import AvailabilityRecord, AvailabilityStatus
+
+BULK_BATCH_SIZE = 500
+
+
+class AvailabilityRecorder:
+    """
+    Records the availability of the objects of a model, adding a record only
+    when the status of an object changes.
+
+    The latest status of the monitored objects is loaded with a single query,
+    transitions are decided in memory and the new records are created in bulk
+    by `save`.
+    """
+
+    def __init__(
+        self,
+        model: type[models.Model],
+        external_ids: Collection[UUID] | models.QuerySet,
+    ):
+        self.content_type = ContentType.objects.get_for_model(model)
+        self.last_records: dict[UUID, tuple[str, datetime]] = {
+            object_external_id: (status, timestamp)
+            for object_external_id, status, timestamp in AvailabilityRecord.objects.filter(
+                content_type=self.content_type,
+                object_external_id__in=external_ids,
+            )
+            .order_by("object_external_id", "-timestamp")
+            .distinct("object_external_id")
+            .values_list("object_external_id", "status", "timestamp")
+        }
+        self.new_records: list[AvailabilityRecord] = []
+
+    def record(
+        self, object_external_id: UUID, status: AvailabilityStatus, timestamp: datetime
+    ) -> bool:
+        """
+        Records the status of the object if it is newer than and different
+        from its last recorded status. Returns whether it was recorded.
+        """
+        last_record = self.last_records.get(object_external_id)
+        if last_record and (timestamp <= last_record[1] or status == last_record[0]):
+            return False
+
+        self.last_records[object_external_id] = (status.value, timestamp)
+        self.new_records.append(
+            AvailabilityRecord(
+                content_type=self.content_type,
+                object_external_id=object_external_id,
+                status=status.value,
+                timestamp=timestamp,
+            )
+        )
+        return True
+
+    def save(self) -> list[AvailabilityRecord]:
+        records = AvailabilityRecord.objects.bulk_create(
+            self.new_records, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True
+        )
+        self.new_records = []
+        return records
@@ -0,0 +1,143 @@
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from care.facility.models import PatientRegistration
+from care.users.models import User
+
+
+@dataclass
+class BenchmarkEndpoint:
+    name: str
+    path: str
+    # queries the endpoint may run, whatever the volume of data
+    query_budget: int
+    method: str = "get"
+    data: dict | None = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    method: str
+    path: str
+    status_code: int
+    queries: int
+    query_budget: int
+    wall_time_ms: dict = field(default_factory=dict)
+    peak_memory_kb: float = 0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.queries > self.query_budget
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "over_budget": self.over_budget}
+
+
+def get_benchmark_endpoints() -> list[BenchmarkEndpoint]:
+    """
+    Returns the endpoints to benchmark, for the most recent admitted patient.
+    """
+    patient = (
+        PatientRegistration.objects.filter(
+            is_active=True, last_consultation__isnull=False
+        )
+        .select_related("last_consultation")
+        .order_by("-id")
+        .first()
+    )
+    endpoints = [
+        BenchmarkEndpoint("patient_list", "/api/v1/patient/", 25),
+        BenchmarkEndpoint("facility_list", "/api/v1/facility/", 8),
+        BenchmarkEndpoint("asset_list", "/api/v1/asset/", 6),
+        BenchmarkEndpoint("shifting_list", "/api/v1/shift/", 6),
+        BenchmarkEndpoint("notification_list", "/api/v1/notification/", 5),
+        BenchmarkEndpoint("icd_search", "/api/v1/icd/?query=fever", 3),
+        BenchmarkEndpoint("medibase_search", "/api/v1/medibase/?query=para", 3),
+    ]
+    if patient is None:
+        return endpoints
+
+    consultation = patient.last_consultation
+    endpoints += [
+        BenchmarkEndpoint(
+            "patient_detail", f"/api/v1/patient/{patient.external_id}/", 20
+        ),
+        BenchmarkEndpoint(
+            "consultation_list",
+            f"/api/v1/consultation/?patient={patient.external_id}",
+            15,
+        ),
+        BenchmarkEndpoint(
+            "daily_round_analyse",
+            f"/api/v1/consultation/{consultation.external_id}/daily_rounds/analyse/",
+            6,
+            method="post",
+            data={"fields": ["temperature", "pulse", "resp", "bp"]},
+        ),
+        BenchmarkEndpoint(
+            "daily_round_trends",
+            f"/api/v1/consultation/{consultation.external_id}/daily_rounds/analyse/",
+            6,
+            method="post",
+            data={
+                "fields": ["temperature", "pulse", "resp", "bp.systolic"],
+                "bucket": "hour",
+            },
+        ),
+    ]
+    return endpoints
+
+
+def measure_endpoint(
+    client: APIClient, endpoint: BenchmarkEndpoint, repeat: int
+) -> BenchmarkResult:
+    request = getattr(client, endpoint.method)
+    kwargs = {"data": endpoint.data, "format": "json"} if endpoint.data else {}
+
+    # the first request warms the caches, its time is left out but not its
+    # queries, the budget applies to every request
+    queries = 0
+    timings = []
+    for _ in range(repeat + 1):
+        with CaptureQueriesContext(connection) as context:
+            started_at = time.perf_counter()
+            response = request(endpoint.path, **kwargs)
+            timings.append((time.perf_counter() - started_at) * 1000)
+        queries = max(queries, len(context.captured_queries))
+    timings = timings[1:] or timings
+
+    tracemalloc.start()
+    try:
+        request(endpoint.path, **kwargs)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=endpoint.name,
+        method=endpoint.method.upper(),
+        path=endpoint.path,
+        status_code=response.status_code,
+        queries=queries,
+        query_budget=endpoint.query_budget,
+        wall_time_ms={
+            "median": round(statistics.median(timings), 2),
+            "max": round(max(timings), 2),
+        },
+        peak_memory_kb=round(peak_memory / 1024, 2),
+    )
+
+
+def run_benchmark(
+    user: User, endpoints: list[BenchmarkEndpoint], repeat: int = 5
+) -> list[BenchmarkResult]:
+    client = APIClient()
+    client.force_authenticate(user)
+    return [measure_endpoint(client, endpoint, repeat) for endpoint in endpoints]
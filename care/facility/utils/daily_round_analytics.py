@@ -0,0 +1,234 @@
+from datetime import datetime, timedelta
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Func,
+    Max,
+    Min,
+    Q,
+    Sum,
+)
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import (
+    Cast,
+    ExtractHour,
+    Floor,
+    TruncDay,
+    TruncHour,
+)
+
+from care.facility.models.daily_round import DailyRound
+from care.facility.utils.automated_vitals import VITALS_COLUMNS
+
+
+class AnalyseBucket(models.TextChoices):
+    HOUR = "hour"
+    SHIFT = "shift"
+    DAY = "day"
+
+
+BUCKET_DURATIONS = {
+    AnalyseBucket.HOUR: timedelta(hours=1),
+    AnalyseBucket.SHIFT: timedelta(hours=8),
+    AnalyseBucket.DAY: timedelta(days=1),
+}
+
+# numeric keys of the JSON fields that can be aggregated, as "<field>.<key>"
+NUMERIC_JSON_KEYS = {
+    "bp": ("systolic", "diastolic"),
+}
+
+AGGREGATES = ("min", "max", "avg", "last")
+
+
+class FirstElement(Func):
+    template = "(%(expressions)s)[1]"
+    output_field = FloatField()
+
+
+def get_numeric_expression(field: str):
+    """
+    Returns the expression of a numeric field of the daily rounds, or of a
+    numeric key of one of their JSON fields, cast to float. Returns None
+    for the fields that cannot be aggregated.
+    """
+    if "." in field:
+        base_field, key = field.split(".", 1)
+        if key not in NUMERIC_JSON_KEYS.get(base_field, ()):
+            return None
+        return Cast(KeyTextTransform(key, base_field), FloatField())
+    try:
+        model_field = DailyRound._meta.get_field(field)  # noqa: SLF001
+    except FieldDoesNotExist:
+        return None
+    if (
+        not isinstance(
+            model_field, models.IntegerField | models.DecimalField | models.FloatField
+        )
+        or model_field.primary_key
+        or model_field.choices
+    ):
+        return None
+    return Cast(F(field), FloatField())
+
+
+def get_bucket_annotations(bucket: str) -> dict:
+    if bucket == AnalyseBucket.HOUR:
+        return {"bucket_start": TruncHour("taken_at")}
+    if bucket == AnalyseBucket.DAY:
+        return {"bucket_start": TruncDay("taken_at")}
+    shift_hours = BUCKET_DURATIONS[AnalyseBucket.SHIFT] // timedelta(hours=1)
+    return {
+        "bucket_start": TruncDay("taken_at"),
+        # the hour is extracted as a numeric, floored into an integer part
+        "bucket_part": Cast(
+            Floor(ExtractHour("taken_at") / shift_hours), models.IntegerField()
+        ),
+    }
+
+
+def _aggregate_buckets(queryset, expressions: dict, bucket: str, weight=None) -> dict:
+    """
+    Aggregates the expressions of the fields in the buckets of the queryset,
+    into the partial aggregates the buckets of several querysets are merged
+    from. The rows stand for `weight` rounds each, for rolled up rows.
+    """
+    bucket_annotations = get_bucket_annotations(bucket)
+    aggregates = {"count": Sum(weight) if weight else Count("id")}
+    for index in range(len(expressions)):
+        has_value = Q(**{f"f{index}__isnull": False})
+        aggregates[f"f{index}_min"] = Min(f"f{index}")
+        aggregates[f"f{index}_max"] = Max(f"f{index}")
+        aggregates[f"f{index}_sum"] = Sum(
+            ExpressionWrapper(F(f"f{index}") * weight, output_field=FloatField())
+            if weight
+            else F(f"f{index}")
+        )
+        aggregates[f"f{index}_samples"] = (
+            Sum(weight, filter=has_value) if weight else Count(f"f{index}")
+        )
+        aggregates[f"f{index}_last"] = FirstElement(
+            ArrayAgg(f"f{index}", filter=has_value, ordering="-taken_at")
+        )
+        aggregates[f"f{index}_last_at"] = Max("taken_at", filter=has_value)
+    rows = (
+        queryset.annotate(
+            **{
+                f"f{index}": expression
+                for index, expression in enumerate(expressions.values())
+            }
+        )
+        .annotate(**bucket_annotations)
+        .values(*bucket_annotations)
+        .annotate(**aggregates)
+    )
+
+    bucket_duration = BUCKET_DURATIONS[bucket]
+    buckets = {}
+    for row in rows:
+        bucket_start = row["bucket_start"]
+        if "bucket_part" in row:
+            bucket_start += row["bucket_part"] * bucket_duration
+        buckets[bucket_start] = {
+            "count": row["count"],
+            "fields": {
+                field: {
+                    key: row[f"f{index}_{key}"]
+                    for key in ("min", "max", "sum", "samples", "last", "last_at")
+                }
+                for index, field in enumerate(expressions)
+            },
+        }
+    return buckets
+
+
+def _merge_aggregates(first: dict, second: dict) -> dict:
+    if first["samples"] is None or not first["samples"]:
+        return second
+    if second["samples"] is None or not second["samples"]:
+        return first
+    latest = first if first["last_at"] >= second["last_at"] else second
+    return {
+        "min": min(first["min"], second["min"]),
+        "max": max(first["max"], second["max"]),
+        "sum": first["sum"] + second["sum"],
+        "samples": first["samples"] + second["samples"],
+        "last": latest["last"],
+        "last_at": latest["last_at"],
+    }
+
+
+def analyse_daily_rounds(
+    queryset,
+    fields: list[str],
+    bucket: str,
+    start: datetime,
+    end: datetime,
+    vitals_queryset=None,
+) -> dict:
+    """
+    Aggregates the fields of the daily rounds taken between start and end in
+    buckets of an hour, a shift or a day, returning the buckets that have
+    rounds as columns: one array per aggregate of each field, in the order
+    of the bucket start times. The automated rounds of `vitals_queryset`,
+    stored compactly, are aggregated along with the daily rounds.
+    """
+    buckets = _aggregate_buckets(
+        queryset.filter(taken_at__gte=start, taken_at__lt=end),
+        {field: get_numeric_expression(field) for field in fields},
+        bucket,
+    )
+    if vitals_queryset is not None:
+        vitals_buckets = _aggregate_buckets(
+            vitals_queryset.filter(taken_at__gte=start, taken_at__lt=end),
+            {
+                field: Cast(F(VITALS_COLUMNS[field]), FloatField())
+                for field in fields
+                if field in VITALS_COLUMNS
+            },
+            bucket,
+            weight=F("samples"),
+        )
+        for bucket_start, vitals_bucket in vitals_buckets.items():
+            daily_round_bucket = buckets.setdefault(
+                bucket_start, {"count": 0, "fields": {}}
+            )
+            daily_round_bucket["count"] += vitals_bucket["count"]
+            for field, aggregates in vitals_bucket["fields"].items():
+                daily_round_bucket["fields"][field] = _merge_aggregates(
+                    daily_round_bucket["fields"].get(field, {"samples": None}),
+                    aggregates,
+                )
+
+    bucket_starts, counts = [], []
+    columns = {field: {aggregate: [] for aggregate in AGGREGATES} for field in fields}
+    for bucket_start in sorted(buckets):
+        bucket_starts.append(bucket_start)
+        counts.append(buckets[bucket_start]["count"])
+        for field in fields:
+            aggregates = buckets[bucket_start]["fields"].get(field, {"samples": None})
+            if not aggregates["samples"]:
+                for aggregate in AGGREGATES:
+                    columns[field][aggregate].append(None)
+                continue
+            columns[field]["min"].append(aggregates["min"])
+            columns[field]["max"].append(aggregates["max"])
+            columns[field]["avg"].append(
+                round(aggregates["sum"] / aggregates["samples"], 2)
+            )
+            columns[field]["last"].append(aggregates["last"])
+
+    return {
+        "bucket": bucket,
+        "taken_at_after": start,
+        "taken_at_before": end,
+        "buckets": bucket_starts,
+        "count": counts,
+        "fields": columns,
+    }
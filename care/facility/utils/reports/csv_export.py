@@ -0,0 +1,226 @@
+import enum
+import hashlib
+import io
+import json
+import logging
+from collections.abc import Iterator
+
+import boto3
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+
+from care.users.models import User
+from care.utils.csp.config import BucketType, get_client_config
+from care.utils.csv_export import get_csv_filename, iter_csv
+
+logger = logging.getLogger(__name__)
+
+# an export that stopped updating its progress for this long is restarted
+LOCK_DURATION = 10 * 60  # 10 minutes
+# identical exports requested within this duration share the same file
+EXPORT_DURATION = 24 * 60 * 60  # 1 day
+FAILURE_DURATION = 2 * 60  # 2 minutes
+
+# size of the parts of the multipart upload, at least 5MB for S3
+PART_SIZE = 8 * 1024 * 1024
+
+# lines before the rows of the CSV, the byte order mark and the header
+HEADER_LINES = 2
+
+
+class ExportStatus(enum.Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+def get_export_id(viewset_path: str, user: User, query_params: dict) -> str:
+    """
+    Returns the id of the export of the list by the user with the query
+    params, so that identical export requests share the same export.
+    """
+    key = json.dumps(
+        [viewset_path, user.id, sorted(query_params.items())], sort_keys=True
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def export_key(export_id: str):
+    return f"csv_export_{export_id}"
+
+
+def set_export_state(export_id: str, state: dict, timeout: int = LOCK_DURATION):
+    cache.set(export_key(export_id), state, timeout=timeout)
+
+
+def add_export_state(export_id: str, state: dict, timeout: int = LOCK_DURATION) -> bool:
+    """
+    Sets the state of the export unless it already has one, returns whether
+    it was set so that only one of concurrent requests starts the export.
+    """
+    return cache.add(export_key(export_id), state, timeout=timeout)
+
+
+def get_export_state(export_id: str) -> dict | None:
+    return cache.get(export_key(export_id))
+
+
+def get_export_object_key(export_id: str):
+    return f"CSV_EXPORT/{export_id}.csv"
+
+
+def get_export_url(export_id: str, bucket_type: BucketType, filename: str) -> str:
+    config, bucket_name = get_client_config(bucket_type, external=True)
+    s3 = boto3.client("s3", **config)
+    return s3.generate_presigned_url(
+        "get_object",
+        Params={
+            "Bucket": bucket_name,
+            "Key": get_export_object_key(export_id),
+            "ResponseContentDisposition": f"attachment; filename={filename}",
+        },
+        ExpiresIn=EXPORT_DURATION,  # seconds
+    )
+
+
+def get_csv_export(viewset_path: str, user_id: int, query_params: dict) -> dict:
+    """
+    Returns the export of the list view of the viewset, as it would be
+    requested by the user with the query params.
+    """
+    http_request = HttpRequest()
+    http_request.method = "GET"
+    for key, values in query_params.items():
+        http_request.GET.setlist(key, values)
+    request = Request(http_request)
+    request.user = User.objects.get(id=user_id)
+    viewset = import_string(viewset_path)(
+        request=request, action="list", args=(), kwargs={}, format_kwarg=None
+    )
+    return viewset.get_csv_export()
+
+
+def abort_upload(s3, bucket_name: str, export_id: str, upload_id: str):
+    try:
+        s3.abort_multipart_upload(
+            Bucket=bucket_name,
+            Key=get_export_object_key(export_id),
+            UploadId=upload_id,
+        )
+    except Exception as e:
+        logger.warning("Could not abort CSV export upload %s: %s", export_id, e)
+
+
+def upload_csv(
+    export_id: str, lines: Iterator[str], bucket_type: BucketType, total: int
+) -> int:
+    """
+    Uploads the lines of the CSV as a multipart upload, in parts of
+    `PART_SIZE`. A retried export aborts the upload of the previous attempt
+    and starts again from the first line, as the rows are read again and
+    their order may have changed since.
+    Returns the number of rows uploaded.
+    """
+    config, bucket_name = get_client_config(bucket_type)
+    s3 = boto3.client("s3", **config)
+    key = get_export_object_key(export_id)
+
+    state = get_export_state(export_id) or {}
+    if previous_upload_id := state.get("upload_id"):
+        logger.info("Restarting CSV export %s", export_id)
+        abort_upload(s3, bucket_name, export_id, previous_upload_id)
+    upload_id = s3.create_multipart_upload(
+        Bucket=bucket_name, Key=key, ContentType="text/csv"
+    )["UploadId"]
+    parts, lines_uploaded = [], 0
+
+    def upload_part(buffer: io.BytesIO, lines_count: int):
+        nonlocal lines_uploaded
+        part_number = len(parts) + 1
+        response = s3.upload_part(
+            Bucket=bucket_name,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=buffer.getvalue(),
+        )
+        parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+        lines_uploaded += lines_count
+        rows = max(lines_uploaded - HEADER_LINES, 0)
+        set_export_state(
+            export_id,
+            {
+                "status": ExportStatus.RUNNING.value,
+                "progress": min(99, rows * 100 // total) if total else 99,
+                "upload_id": upload_id,
+            },
+        )
+
+    buffer, lines_count = io.BytesIO(), 0
+    for line in lines:
+        buffer.write(line.encode())
+        lines_count += 1
+        if buffer.tell() >= PART_SIZE:
+            upload_part(buffer, lines_count)
+            buffer, lines_count = io.BytesIO(), 0
+    if lines_count or not parts:
+        upload_part(buffer, lines_count)
+
+    s3.complete_multipart_upload(
+        Bucket=bucket_name,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={"Parts": parts},
+    )
+    return max(lines_uploaded - HEADER_LINES, 0)
+
+
+def generate_csv_export(
+    export_id: str,
+    viewset_path: str,
+    user_id: int,
+    query_params: dict,
+    bucket_type: BucketType,
+):
+    logger.info("Generating CSV export %s of %s", export_id, viewset_path)
+    # refreshes the lock right away, a retried export keeps its upload to abort
+    state = get_export_state(export_id) or {}
+    set_export_state(
+        export_id,
+        {
+            **state,
+            "status": ExportStatus.RUNNING.value,
+            "progress": state.get("progress", 0),
+        },
+    )
+    export = get_csv_export(viewset_path, user_id, query_params)
+    rows = upload_csv(
+        export_id,
+        iter_csv(**export),
+        bucket_type,
+        total=export["queryset"].count(),
+    )
+    set_export_state(
+        export_id,
+        {
+            "status": ExportStatus.DONE.value,
+            "progress": 100,
+            "rows": rows,
+            "filename": get_csv_filename(export["queryset"]),
+        },
+        timeout=EXPORT_DURATION,
+    )
+    logger.info("Generated CSV export %s with %s rows", export_id, rows)
+
+
+def fail_csv_export(export_id: str, bucket_type: BucketType):
+    state = get_export_state(export_id) or {}
+    if upload_id := state.get("upload_id"):
+        config, bucket_name = get_client_config(bucket_type)
+        abort_upload(boto3.client("s3", **config), bucket_name, export_id, upload_id)
+    set_export_state(
+        export_id, {"status": ExportStatus.FAILED.value}, timeout=FAILURE_DURATION
+    )
@@ -1,92 +1,109 @@
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.utils.timezone import now
 
-from care.facility.models import DistrictScopedSummary, PatientRegistration
-from care.facility.models.patient_base import BedTypeChoices
+from care.facility.models import (
+    ConsultationBed,
+    DistrictScopedSummary,
+    PatientConsultation,
+    PatientRegistration,
+)
+from care.facility.utils.summarization.patient_summary import (
+    get_active_patients,
+    get_changes_since,
+    get_patient_counts,
+)
 from care.users.models import District, LocalBody
 
+DISTRICT_PATIENT_SUMMARY_LAST_RUN_CACHE_KEY = "district_patient_summary:last_run"
 
-def district_patient_summary():
-    for district_object in District.objects.all():
+
+def get_changed_district_ids(since):
+    """
+    Returns the ids of districts with local bodies whose patients,
+    consultations or bed assignments were modified since the given time.
+    """
+    local_body_ids = set(
+        PatientRegistration._base_manager.filter(  # noqa: SLF001
+            modified_date__gte=since
+        ).values_list("local_body_id", flat=True)
+    )
+    local_body_ids.update(
+        PatientConsultation._base_manager.filter(  # noqa: SLF001
+            modified_date__gte=since
+        ).values_list("patient__local_body_id", flat=True)
+    )
+    local_body_ids.update(
+        ConsultationBed._base_manager.filter(  # noqa: SLF001
+            modified_date__gte=since
+        ).values_list("consultation__patient__local_body_id", flat=True)
+    )
+    local_body_ids.discard(None)
+    return set(
+        LocalBody.objects.filter(id__in=local_body_ids).values_list(
+            "district_id", flat=True
+        )
+    )
+
+
+def district_patient_summary(incremental=False):
+    """
+    Summarizes the patients of every local body, grouped by district.
+
+    With `incremental`, only districts with patient, consultation or bed
+    changes since the previous run of the day are recomputed.
+    """
+    started_at = now()
+    districts = District.objects.all()
+    local_bodies = LocalBody.objects.order_by("id")
+    inactive_patients = PatientRegistration.objects.filter(is_active=False)
+    active_patients = get_active_patients()
+    since = get_changes_since(DISTRICT_PATIENT_SUMMARY_LAST_RUN_CACHE_KEY)
+    if incremental and since:
+        changed_district_ids = get_changed_district_ids(since)
+        districts = districts.filter(id__in=changed_district_ids)
+        local_bodies = local_bodies.filter(district_id__in=changed_district_ids)
+        inactive_patients = inactive_patients.filter(
+            local_body__district_id__in=changed_district_ids
+        )
+        active_patients = active_patients.filter(
+            local_body__district_id__in=changed_district_ids
+        )
+
+    local_bodies_by_district = {}
+    for local_body_object in local_bodies:
+        local_bodies_by_district.setdefault(local_body_object.district_id, []).append(
+            local_body_object
+        )
+    inactive_counts = dict(
+        inactive_patients.order_by()
+        .values_list("local_body_id")
+        .annotate(count=Count("id"))
+    )
+    counts, empty_counts = get_patient_counts(active_patients, "local_body_id")
+
+    object_filter = Q(s_type="PatientSummary") & Q(
+        created_date__startswith=now().date()
+    )
+    existing_summaries = {
+        summary.district_id: summary
+        for summary in DistrictScopedSummary.objects.filter(object_filter)
+    }
+    for district_object in districts:
         district_summary = {
             "name": district_object.name,
             "id": district_object.id,
         }
-        for local_body_object in LocalBody.objects.filter(
-            district_id=district_object.id
-        ):
+        for local_body_object in local_bodies_by_district.get(district_object.id, []):
             district_summary[local_body_object.id] = {
                 "name": local_body_object.name,
                 "code": local_body_object.localbody_code,
-                "total_inactive": PatientRegistration.objects.filter(
-                    is_active=False,
-                    local_body_id=local_body_object.id,
-                ).count(),
+                "total_inactive": inactive_counts.get(local_body_object.id, 0),
+                **counts.get(local_body_object.id, empty_counts),
             }
-            patients = PatientRegistration.objects.filter(
-                is_active=True,
-                last_consultation__discharge_date__isnull=True,
-                local_body_id=local_body_object.id,
-            )
-
-            # Get Total Counts
-
-            for bed_type_choice in BedTypeChoices:
-                db_value, text = bed_type_choice
-                patient_filters = {
-                    "last_consultation__" + "current_bed__bed__bed_type": db_value
-                }
-                count = patients.filter(**patient_filters).count()
-                clean_name = "total_patients_" + "_".join(text.lower().split())
-                district_summary[local_body_object.id][clean_name] = count
-
-            home_quarantine = Q(last_consultation__suggestion="HI")
 
-            total_patients_home_quarantine = patients.filter(home_quarantine).count()
-            district_summary[local_body_object.id]["total_patients_home_quarantine"] = (
-                total_patients_home_quarantine
-            )
-
-            # Apply Date Filters
-
-            patients_today = patients.filter(
-                last_consultation__created_date__startswith=now().date()
-            )
-
-            # Get Todays Counts
-
-            today_patients_home_quarantine = patients_today.filter(
-                home_quarantine
-            ).count()
-
-            for bed_type_choice in BedTypeChoices:
-                db_value, text = bed_type_choice
-                patient_filters = {
-                    "last_consultation__" + "current_bed__bed__bed_type": db_value
-                }
-                count = patients_today.filter(**patient_filters).count()
-                clean_name = "today_patients_" + "_".join(text.lower().split())
-                district_summary[local_body_object.id][clean_name] = count
-
-            # Update Anything Extra
-            district_summary[local_body_object.id]["today_patients_home_quarantine"] = (
-                today_patients_home_quarantine
-            )
-
-        object_filter = Q(s_type="PatientSummary") & Q(
-            created_date__startswith=now().date()
-        )
-        if (
-            DistrictScopedSummary.objects.filter(district_id=district_object.id)
-            .filter(object_filter)
-            .exists()
-        ):
-            district_summary_old = DistrictScopedSummary.objects.filter(
-                object_filter
-            ).get(district_id=district_object.id)
+        if district_summary_old := existing_summaries.get(district_object.id):
             district_summary_old.created_date = now()
-            district_summary_old.data.pop("modified_date")
-
             district_summary_old.data = district_summary
             latest_modification_date = now()
             district_summary_old.data.update(
@@ -101,4 +118,6 @@ def district_patient_summary():
                 district_id=district_object.id,
                 data=district_summary,
             ).save()
+
+    cache.set(DISTRICT_PATIENT_SUMMARY_LAST_RUN_CACHE_KEY, started_at, timeout=None)
     return True
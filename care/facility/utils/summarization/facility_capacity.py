@@ -1,9 +1,12 @@
-from django.db.models import Sum
+from collections import defaultdict
+
+from django.db.models import Count, Q, Sum
 from django.utils.timezone import localtime, now
 
 from care.facility.api.serializers.facility import FacilitySerializer
 from care.facility.api.serializers.facility_capacity import FacilityCapacitySerializer
 from care.facility.models import (
+    Bed,
     Facility,
     FacilityCapacity,
     FacilityRelatedSummary,
@@ -15,107 +18,146 @@ from care.facility.models.inventory import (
     FacilityInventorySummary,
 )
 
+BULK_BATCH_SIZE = 500
+
+
+def get_patient_counts(is_active: bool):
+    return dict(
+        PatientRegistration.objects.filter(is_active=is_active)
+        .order_by()
+        .values_list("facility_id")
+        .annotate(count=Count("id"))
+    )
 
-def facility_capacity_summary():
-    capacity_objects = FacilityCapacity.objects.all()
-    capacity_summary = {}
-    current_date = localtime(now()).replace(hour=0, minute=0, second=0, microsecond=0)
 
-    for facility_obj in Facility.objects.all():
-        # Calculate Actual Patients Discharged and Live in this Facility
-        patients_in_facility = PatientRegistration.objects.filter(
-            facility_id=facility_obj.id
-        ).select_related("state", "district", "local_body")
-        capacity_summary[facility_obj.id] = FacilitySerializer(facility_obj).data
-        capacity_summary[facility_obj.id]["features"] = list(
-            capacity_summary[facility_obj.id]["features"]
+def get_bed_counts():
+    return dict(
+        Bed.objects.order_by().values_list("facility_id").annotate(count=Count("id"))
+    )
+
+
+def get_inventory_summaries(current_date):
+    """
+    Returns the inventory summary of every facility keyed by facility id,
+    computed with a fixed number of grouped queries.
+    """
+    burn_rates = {
+        (facility_id, item_id): burn_rate
+        for facility_id, item_id, burn_rate in FacilityInventoryBurnRate.objects.values_list(
+            "facility_id", "item_id", "burn_rate"
         )
-        capacity_summary[facility_obj.id]["actual_live_patients"] = (
-            patients_in_facility.filter(is_active=True).count()
+    }
+
+    todays_logs = FacilityInventoryLog.objects.filter(
+        created_date__gte=current_date, probable_accident=False
+    ).order_by()
+    log_totals = {
+        (log["facility_id"], log["item_id"]): log
+        for log in todays_logs.values("facility_id", "item_id").annotate(
+            total_consumed=Sum("quantity_in_default_unit", filter=Q(is_incoming=False)),
+            total_added=Sum("quantity_in_default_unit", filter=Q(is_incoming=True)),
         )
-        discharge_patients = patients_in_facility.filter(is_active=False)
-        capacity_summary[facility_obj.id]["actual_discharged_patients"] = (
-            discharge_patients.count()
+    }
+    end_stocks = {
+        (facility_id, item_id): current_stock
+        for facility_id, item_id, current_stock in todays_logs.order_by(
+            "facility_id", "item_id", "-created_date"
         )
-        capacity_summary[facility_obj.id]["availability"] = []
+        .distinct("facility_id", "item_id")
+        .values_list("facility_id", "item_id", "current_stock")
+    }
+
+    inventory = defaultdict(dict)
+    for summary_obj in FacilityInventorySummary.objects.filter(
+        item__isnull=False
+    ).select_related("item__default_unit"):
+        key = (summary_obj.facility_id, summary_obj.item_id)
+        end_stock = end_stocks.get(key, summary_obj.quantity)
+        totals = log_totals.get(key, {})
+        total_consumed = totals.get("total_consumed") or 0
+        total_added = totals.get("total_added") or 0
+        start_stock = end_stock - total_added + total_consumed
+
+        inventory[summary_obj.facility_id][summary_obj.item_id] = {
+            "item_name": summary_obj.item.name,
+            "stock": summary_obj.quantity,
+            "unit": summary_obj.item.default_unit.name,
+            "is_low": summary_obj.is_low,
+            "burn_rate": burn_rates.get(key),
+            "start_stock": start_stock,
+            "end_stock": end_stock,
+            "total_consumed": total_consumed,
+            "total_added": total_added,
+            "modified_date": summary_obj.modified_date.astimezone().isoformat(),
+        }
+    return inventory
+
 
-        temp_inventory_summary_obj = {}
-        summary_objs = FacilityInventorySummary.objects.filter(
-            facility_id=facility_obj.id
+def facility_capacity_summary():
+    capacity_summary = {}
+    current_date = localtime(now()).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # counted with grouped queries rather than read from the counters of the
+    # facilities, so that the daily summary does not carry their drift
+    live_patients = get_patient_counts(is_active=True)
+    discharged_patients = get_patient_counts(is_active=False)
+    beds = get_bed_counts()
+    inventory = get_inventory_summaries(current_date)
+
+    facilities = Facility.objects.select_related(
+        "ward", "local_body", "district", "state"
+    )
+    for facility_obj in facilities:
+        facility_data = FacilitySerializer(facility_obj).data
+        facility_data["features"] = list(facility_data["features"] or [])
+        facility_data["patient_count"] = live_patients.get(facility_obj.id, 0)
+        facility_data["bed_count"] = beds.get(facility_obj.id, 0)
+        facility_data["actual_live_patients"] = facility_data["patient_count"]
+        facility_data["actual_discharged_patients"] = discharged_patients.get(
+            facility_obj.id, 0
         )
-        for summary_obj in summary_objs:
-            burn_rate = FacilityInventoryBurnRate.objects.filter(
-                facility_id=facility_obj.id, item_id=summary_obj.item.id
-            ).first()
-            log_query = FacilityInventoryLog.objects.filter(
-                facility_id=facility_obj.id,
-                item_id=summary_obj.item.id,
-                created_date__gte=current_date,
-                probable_accident=False,
-            )
-            end_log = log_query.order_by("-created_date").first()
-            end_stock = summary_obj.quantity
-            if end_log:
-                end_stock = end_log.current_stock
-            total_consumed = 0
-            temp1 = log_query.filter(is_incoming=False).aggregate(
-                Sum("quantity_in_default_unit")
-            )
-            if temp1:
-                total_consumed = temp1.get("quantity_in_default_unit__sum", 0) or 0
-            total_added = 0
-            temp2 = log_query.filter(is_incoming=True).aggregate(
-                Sum("quantity_in_default_unit")
-            )
-            if temp2:
-                total_added = temp2.get("quantity_in_default_unit__sum", 0) or 0
-
-            start_stock = end_stock - total_added + total_consumed
-
-            if burn_rate:
-                burn_rate = burn_rate.burn_rate
-            temp_inventory_summary_obj[summary_obj.item.id] = {
-                "item_name": summary_obj.item.name,
-                "stock": summary_obj.quantity,
-                "unit": summary_obj.item.default_unit.name,
-                "is_low": summary_obj.is_low,
-                "burn_rate": burn_rate,
-                "start_stock": start_stock,
-                "end_stock": end_stock,
-                "total_consumed": total_consumed,
-                "total_added": total_added,
-                "modified_date": summary_obj.modified_date.astimezone().isoformat(),
-            }
-        capacity_summary[facility_obj.id]["inventory"] = temp_inventory_summary_obj
-
-    for capacity_object in capacity_objects:
+        facility_data["availability"] = []
+        facility_data["inventory"] = inventory.get(facility_obj.id, {})
+        capacity_summary[facility_obj.id] = facility_data
+
+    for capacity_object in FacilityCapacity.objects.all():
         facility_id = capacity_object.facility_id
         if facility_id not in capacity_summary:
             # This facility is either deleted or not active
             continue
-        if "availability" not in capacity_summary[facility_id]:
-            capacity_summary[facility_id]["availability"] = []
         capacity_summary[facility_id]["availability"].append(
             FacilityCapacitySerializer(capacity_object).data
         )
 
-    for i in capacity_summary:
-        facility_summary_obj = None
-        if FacilityRelatedSummary.objects.filter(
-            s_type="FacilityCapacity",
-            facility_id=i,
-            created_date__gte=current_date,
-        ).exists():
-            facility_summary_obj = FacilityRelatedSummary.objects.get(
-                s_type="FacilityCapacity",
-                facility_id=i,
-                created_date__gte=current_date,
-            )
+    existing_summaries = {}
+    for summary_obj in FacilityRelatedSummary.objects.filter(
+        s_type="FacilityCapacity",
+        created_date__gte=current_date,
+        facility_id__in=capacity_summary.keys(),
+    ).order_by("-created_date"):
+        existing_summaries.setdefault(summary_obj.facility_id, summary_obj)
+
+    modified_date = now()
+    summaries_to_update = []
+    summaries_to_create = []
+    for facility_id, data in capacity_summary.items():
+        if facility_id in existing_summaries:
+            facility_summary_obj = existing_summaries[facility_id]
+            facility_summary_obj.data = data
+            facility_summary_obj.modified_date = modified_date
+            summaries_to_update.append(facility_summary_obj)
         else:
-            facility_summary_obj = FacilityRelatedSummary(
-                s_type="FacilityCapacity", facility_id=i
+            summaries_to_create.append(
+                FacilityRelatedSummary(
+                    s_type="FacilityCapacity", facility_id=facility_id, data=data
+                )
             )
-        facility_summary_obj.data = capacity_summary[i]
-        facility_summary_obj.save()
+
+    FacilityRelatedSummary.objects.bulk_update(
+        summaries_to_update, ["data", "modified_date"], batch_size=BULK_BATCH_SIZE
+    )
+    FacilityRelatedSummary.objects.bulk_create(
+        summaries_to_create, batch_size=BULK_BATCH_SIZE
+    )
 
     return True
@@ -1,84 +1,138 @@
-from django.db.models import Q
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.utils.timezone import now
 
-from care.facility.models import Facility, FacilityRelatedSummary, PatientRegistration
+from care.facility.models import (
+    ConsultationBed,
+    Facility,
+    FacilityRelatedSummary,
+    PatientConsultation,
+    PatientRegistration,
+)
 from care.facility.models.patient_base import BedTypeChoices
 
+PATIENT_SUMMARY_LAST_RUN_CACHE_KEY = "patient_summary:last_run"
+# picks up rows saved just before the previous run but committed after it
+SUMMARY_CHANGES_OVERLAP = timedelta(minutes=5)
 
-def patient_summary():
-    facility_objects = Facility.objects.all()
-    patient_summary = {}
-    for facility_object in facility_objects:
-        facility_id = facility_object.id
-        if facility_id not in patient_summary:
-            patient_summary[facility_id] = {
-                "facility_name": facility_object.name,
-                "district": facility_object.district.name,
-                "facility_external_id": str(facility_object.external_id),
-            }
-
-            patients = PatientRegistration.objects.filter(
-                is_active=True,
-                last_consultation__discharge_date__isnull=True,
-                last_consultation__facility=facility_object,
-            )
 
-            # Get Total Counts
+def get_active_patients():
+    return PatientRegistration.objects.filter(
+        is_active=True,
+        last_consultation__discharge_date__isnull=True,
+    )
 
-            for bed_type_choice in BedTypeChoices:
-                db_value, text = bed_type_choice
-                patient_filters = {
-                    "last_consultation__" + "current_bed__bed__bed_type": db_value
-                }
-                count = patients.filter(**patient_filters).count()
-                clean_name = "total_patients_" + "_".join(text.lower().split())
-                patient_summary[facility_id][clean_name] = count
 
-            home_quarantine = Q(last_consultation__suggestion="HI")
+def get_patient_counts(patients, group_by):
+    """
+    Returns the bed type and home quarantine counts (total and today) of the
+    given patients grouped by `group_by`, in a single query.
+    """
+    today = Q(last_consultation__created_date__startswith=now().date())
+    home_quarantine = Q(last_consultation__suggestion="HI")
+    bed_types = [
+        (
+            "_".join(text.lower().split()),
+            Q(last_consultation__current_bed__bed__bed_type=db_value),
+        )
+        for db_value, text in BedTypeChoices
+    ]
 
-            total_patients_home_quarantine = patients.filter(home_quarantine).count()
-            patient_summary[facility_id]["total_patients_home_quarantine"] = (
-                total_patients_home_quarantine
-            )
+    aggregates = {}
+    for name, bed_type in bed_types:
+        aggregates[f"total_patients_{name}"] = Count("id", filter=bed_type)
+    aggregates["total_patients_home_quarantine"] = Count("id", filter=home_quarantine)
+    for name, bed_type in bed_types:
+        aggregates[f"today_patients_{name}"] = Count("id", filter=bed_type & today)
+    aggregates["today_patients_home_quarantine"] = Count(
+        "id", filter=home_quarantine & today
+    )
 
-            # Apply Date Filters
+    counts = {}
+    for row in patients.order_by().values(group_by).annotate(**aggregates):
+        counts[row.pop(group_by)] = row
+    return counts, dict.fromkeys(aggregates, 0)
 
-            patients_today = patients.filter(
-                last_consultation__created_date__startswith=now().date()
-            )
 
-            # Get Todays Counts
+def get_changes_since(last_run_cache_key):
+    """
+    Returns the time from which changes have to be summarized, or None if a
+    full summarization is due (first run of the day or no previous run).
+    """
+    last_run = cache.get(last_run_cache_key)
+    if last_run is None or last_run.date() != now().date():
+        return None
+    return last_run - SUMMARY_CHANGES_OVERLAP
 
-            today_patients_home_quarantine = patients_today.filter(
-                home_quarantine
-            ).count()
 
-            for bed_type_choice in BedTypeChoices:
-                db_value, text = bed_type_choice
-                patient_filters = {
-                    "last_consultation__" + "current_bed__bed__bed_type": db_value
-                }
-                count = patients_today.filter(**patient_filters).count()
-                clean_name = "today_patients_" + "_".join(text.lower().split())
-                patient_summary[facility_id][clean_name] = count
+def get_changed_facility_ids(since):
+    """
+    Returns the ids of facilities whose patients, consultations or bed
+    assignments were modified since the given time.
+    """
+    facility_ids = set(
+        PatientConsultation._base_manager.filter(  # noqa: SLF001
+            modified_date__gte=since
+        ).values_list("facility_id", flat=True)
+    )
+    facility_ids.update(
+        ConsultationBed._base_manager.filter(  # noqa: SLF001
+            modified_date__gte=since
+        ).values_list("consultation__facility_id", flat=True)
+    )
+    for (
+        facility_id,
+        last_consultation_facility_id,
+    ) in PatientRegistration._base_manager.filter(  # noqa: SLF001
+        modified_date__gte=since
+    ).values_list("facility_id", "last_consultation__facility_id"):
+        facility_ids.update((facility_id, last_consultation_facility_id))
+    facility_ids.discard(None)
+    return facility_ids
 
-            # Update Anything Extra
-            patient_summary[facility_id]["today_patients_home_quarantine"] = (
-                today_patients_home_quarantine
-            )
 
-    for i in list(patient_summary.keys()):
-        object_filter = Q(s_type="PatientSummary") & Q(
-            created_date__startswith=now().date()
+def patient_summary(incremental=False):
+    """
+    Summarizes the active patients of every facility.
+
+    With `incremental`, only facilities with patient, consultation or bed
+    changes since the previous run of the day are recomputed.
+    """
+    started_at = now()
+    facility_objects = Facility.objects.select_related("district")
+    patients = get_active_patients()
+    since = get_changes_since(PATIENT_SUMMARY_LAST_RUN_CACHE_KEY)
+    if incremental and since:
+        changed_facility_ids = get_changed_facility_ids(since)
+        facility_objects = facility_objects.filter(id__in=changed_facility_ids)
+        patients = patients.filter(last_consultation__facility__in=changed_facility_ids)
+
+    counts, empty_counts = get_patient_counts(
+        patients, "last_consultation__facility_id"
+    )
+
+    patient_summary = {}
+    for facility_object in facility_objects:
+        patient_summary[facility_object.id] = {
+            "facility_name": facility_object.name,
+            "district": facility_object.district.name,
+            "facility_external_id": str(facility_object.external_id),
+            **counts.get(facility_object.id, empty_counts),
+        }
+
+    object_filter = Q(s_type="PatientSummary") & Q(
+        created_date__startswith=now().date()
+    )
+    existing_summaries = {
+        summary.facility_id: summary
+        for summary in FacilityRelatedSummary.objects.filter(
+            object_filter, facility_id__in=patient_summary.keys()
         )
-        if (
-            FacilityRelatedSummary.objects.filter(facility_id=i)
-            .filter(object_filter)
-            .exists()
-        ):
-            facility = FacilityRelatedSummary.objects.filter(object_filter).get(
-                facility_id=i
-            )
+    }
+    for i in list(patient_summary.keys()):
+        if facility := existing_summaries.get(i):
             facility.created_date = now()
             facility.data.pop("modified_date")
             if facility.data != patient_summary[i]:
@@ -100,4 +154,6 @@ def patient_summary():
             FacilityRelatedSummary(
                 s_type="PatientSummary", facility_id=i, data=patient_summary[i]
             ).save()
+
+    cache.set(PATIENT_SUMMARY_LAST_RUN_CACHE_KEY, started_at, timeout=None)
     return True
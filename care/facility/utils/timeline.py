@@ -0,0 +1,159 @@
+import binascii
+import heapq
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from care.facility.models.events import EventType, PatientConsultationEvent
+from care.facility.utils.automated_vitals import VirtualEvents
+
+# the rows of a timeline are sorted by (taken_at, kind, id), the stored events
+# before the compactly stored vitals taken at the same time
+KIND_VITALS = 0
+KIND_EVENT = 1
+
+
+def encode_cursor(position: tuple[datetime, int, int]) -> str:
+    taken_at, kind, row_id = position
+    value = f"{taken_at.isoformat()}|{kind}|{row_id}"
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, int]:
+    try:
+        taken_at, kind, row_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(taken_at), int(kind), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValidationError({"cursor": "Invalid cursor"}) from e
+
+
+def before_cursor(position: tuple[datetime, int, int] | None, kind: int) -> Q:
+    """
+    Matches the rows of a kind coming after the position, in the descending
+    order of the timeline.
+    """
+    if position is None:
+        return Q()
+    taken_at, cursor_kind, row_id = position
+    if kind < cursor_kind:
+        return Q(taken_at__lte=taken_at)
+    if kind > cursor_kind:
+        return Q(taken_at__lt=taken_at)
+    return Q(taken_at__lt=taken_at) | Q(taken_at=taken_at, id__lt=row_id)
+
+
+def get_event_type_roots() -> dict[int, EventType]:
+    """
+    Returns the top level event type of every event type, by id.
+    """
+    event_types = {event_type.id: event_type for event_type in EventType.objects.all()}
+    return {
+        event_type_id: event_types[int(event_type.get_path().split("/", 2)[1])]
+        for event_type_id, event_type in event_types.items()
+    }
+
+
+@dataclass
+class TimelineEntry:
+    taken_at: datetime
+    object_model: str
+    object_id: int
+    external_id: str | None
+    event_type: EventType
+    caused_by: object
+    events: list[PatientConsultationEvent] = field(default_factory=list)
+
+
+def group_events(events, roots: dict[int, EventType]) -> list[TimelineEntry]:
+    """
+    Groups the events of every change of an object under the top level event
+    type of their hierarchy, in the order the changes are first seen.
+    """
+    entries = {}
+    for event in events:
+        root = roots[event.event_type_id]
+        key = (event.taken_at, event.object_model, event.object_id, root.id)
+        if key not in entries:
+            entries[key] = TimelineEntry(
+                taken_at=event.taken_at,
+                object_model=event.object_model,
+                object_id=event.object_id,
+                external_id=event.meta.get("external_id"),
+                event_type=root,
+                caused_by=event.caused_by if event.caused_by_id else None,
+            )
+        entries[key].events.append(event)
+    return list(entries.values())
+
+
+class ConsultationTimeline:
+    """
+    The events of a consultation, newest first, paginated with a cursor on
+    (taken_at, id) so that every page is read from the index at the position
+    the previous one ended, however long the consultation is.
+    """
+
+    def __init__(self, queryset, vitals_queryset, event_types=None):
+        self.queryset = queryset.order_by("-taken_at", "-id")
+        if event_types is not None:
+            self.queryset = self.queryset.filter(event_type__in=event_types)
+        self.virtual_events = VirtualEvents(vitals_queryset, event_types, "-taken_at")
+
+    def page(self, cursor: str | None, limit: int):
+        """
+        Returns the entries of the page and the cursor of the next one. The
+        events of a change may continue on the next page, as the entries are
+        paginated by their events.
+        """
+        position = decode_cursor(cursor) if cursor else None
+        events = self.queryset.filter(before_cursor(position, KIND_EVENT))[: limit + 1]
+        vitals = self.virtual_events.rows.filter(before_cursor(position, KIND_VITALS))[
+            : limit + 1
+        ]
+        stored = (((event.taken_at, KIND_EVENT, event.id), [event]) for event in events)
+        virtual = (
+            (
+                (row.taken_at, KIND_VITALS, row.id),
+                list(self.virtual_events.events(row)),
+            )
+            for row in vitals
+        )
+        rows = list(
+            islice(
+                heapq.merge(stored, virtual, key=itemgetter(0), reverse=True),
+                limit + 1,
+            )
+        )
+        page_rows = rows[:limit]
+        next_cursor = encode_cursor(page_rows[-1][0]) if len(rows) > limit else None
+        page_events = [event for _, row_events in page_rows for event in row_events]
+        return group_events(page_events, get_event_type_roots()), next_cursor
+
+
+def get_latest_events(queryset, vitals_queryset, event_types=None) -> list:
+    """
+    Returns the latest event of every event type of the consultation, newest
+    first, read from the index on the latest events of every event type.
+    """
+    latest = (
+        queryset.filter(is_latest=True)
+        .order_by("event_type_id", "-taken_at", "-id")
+        .distinct("event_type_id")
+    )
+    if event_types is not None:
+        latest = latest.filter(event_type__in=event_types)
+    events = {event.event_type_id: event for event in latest}
+    for event in VirtualEvents(vitals_queryset, event_types).latest():
+        stored = events.get(event.event_type_id)
+        if stored is None or stored.taken_at < event.taken_at:
+            events[event.event_type_id] = event
+    return sorted(
+        events.values(),
+        key=lambda event: (event.taken_at, event.event_type_id),
+        reverse=True,
+    )
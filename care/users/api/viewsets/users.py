@@ -1,6 +1,5 @@
 from datetime import timedelta
 
-from django.core.cache import cache
 from django.db.models import F, Q, Subquery
 from django.http import Http404
 from django.utils import timezone
@@ -32,12 +31,6 @@ from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.file_uploads.cover_image import delete_cover_image
 
 
-def remove_facility_user_cache(user_id):
-    key = f"user_facilities:{user_id!s}"
-    cache.delete(key)
-    return True
-
-
 def inverse_choices(choices):
     output = {}
     for choice in choices:
@@ -255,10 +248,7 @@ class UserViewSet(
     @extend_schema(tags=["users"])
     @action(detail=True, methods=["PUT"], permission_classes=[IsAuthenticated])
     def add_facility(self, request, *args, **kwargs):
-        # Remove User Facility Cache
         user = self.get_object()
-        remove_facility_user_cache(user.id)
-        # Cache Deleted
         requesting_user = request.user
         if "facility" not in request.data:
             raise ValidationError({"facility": "required"})
@@ -318,10 +308,7 @@ class UserViewSet(
     @extend_schema(tags=["users"])
     @action(detail=True, methods=["DELETE"], permission_classes=[IsAuthenticated])
     def delete_facility(self, request, *args, **kwargs):
-        # Remove User Facility Cache
         user = self.get_object()
-        remove_facility_user_cache(user.id)
-        # Cache Deleted
         requesting_user = request.user
         if "facility" not in request.data:
             raise ValidationError({"facility": "required"})
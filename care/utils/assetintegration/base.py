@@ -1,11 +1,17 @@
 import json
+import time
 
 import requests
 from django.conf import settings
 from rest_framework import status
 from rest_framework.exceptions import APIException
 
-from care.utils.jwks.token_generator import generate_jwt
+from care.utils.assetintegration.circuit_breaker import is_circuit_open, open_circuit
+from care.utils.assetintegration.session import (
+    get_middleware_session,
+    get_middleware_token,
+    observe_middleware_latency,
+)
 
 
 class BaseAssetIntegration:
@@ -17,7 +23,10 @@ class BaseAssetIntegration:
         self.host = self.meta["local_ip_address"]
         self.middleware_hostname = self.meta["middleware_hostname"]
         self.insecure_connection = self.meta.get("insecure_connection", False)
-        self.timeout = settings.MIDDLEWARE_REQUEST_TIMEOUT
+        self.timeout = (
+            settings.MIDDLEWARE_CONNECT_TIMEOUT,
+            settings.MIDDLEWARE_REQUEST_TIMEOUT,
+        )
 
     def handle_action(self, action):
         pass
@@ -30,7 +39,7 @@ class BaseAssetIntegration:
 
     def get_headers(self):
         return {
-            "Authorization": (self.auth_header_type + generate_jwt()),
+            "Authorization": (self.auth_header_type + get_middleware_token()),
             "Accept": "application/json",
         }
 
@@ -48,16 +57,29 @@ class BaseAssetIntegration:
                 {"error": "Invalid Response"}, response.status_code
             ) from e
 
-    def api_post(self, url, data=None):
-        return self._validate_response(
-            requests.post(
-                url, json=data, headers=self.get_headers(), timeout=self.timeout
+    def _request(self, method, url, **kwargs):
+        if is_circuit_open(self.middleware_hostname):
+            raise APIException({"error": "Middleware is unreachable"}, 503)
+        session = get_middleware_session(self.middleware_hostname)
+        started_at, failed = time.perf_counter(), False
+        try:
+            response = session.request(
+                method, url, headers=self.get_headers(), timeout=self.timeout, **kwargs
             )
-        )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            failed = True
+            open_circuit(self.middleware_hostname)
+            raise APIException({"error": "Middleware is unreachable"}, 504) from e
+        finally:
+            observe_middleware_latency(
+                self.middleware_hostname,
+                time.perf_counter() - started_at,
+                failed=failed,
+            )
+        return self._validate_response(response)
+
+    def api_post(self, url, data=None):
+        return self._request("POST", url, json=data)
 
     def api_get(self, url, data=None):
-        return self._validate_response(
-            requests.get(
-                url, params=data, headers=self.get_headers(), timeout=self.timeout
-            )
-        )
+        return self._request("GET", url, params=data)
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def get_circuit_key(middleware_hostname: str) -> str:
+    return f"middleware_circuit_open:{middleware_hostname}"
+
+
+def is_circuit_open(middleware_hostname: str) -> bool:
+    """
+    Returns whether the middleware failed to respond recently, requests to it
+    should fail right away instead of waiting for another timeout.
+    """
+    return bool(cache.get(get_circuit_key(middleware_hostname)))
+
+
+def open_circuit(middleware_hostname: str):
+    # the circuit closes by itself, the first request after it expires probes
+    # the middleware again
+    cache.set(
+        get_circuit_key(middleware_hostname),
+        value=True,
+        timeout=settings.MIDDLEWARE_CIRCUIT_BREAKER_TIMEOUT,
+    )
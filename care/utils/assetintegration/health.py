@@ -0,0 +1,47 @@
+import logging
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.conf import settings
+
+from care.utils.assetintegration.base import BaseAssetIntegration
+
+logger = logging.getLogger(__name__)
+
+
+def map_concurrently(
+    func: Callable[[Hashable], Any], items: Iterable[Hashable]
+) -> dict[Hashable, Any]:
+    """
+    Calls the function with every item in a bounded thread pool and returns
+    the results keyed by item.
+    """
+    items = list(dict.fromkeys(items))
+    if not items:
+        return {}
+    max_workers = min(len(items), settings.MIDDLEWARE_STATUS_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(items, executor.map(func, items), strict=True))
+
+
+def probe_middleware(middleware_hostname: str) -> bool:
+    try:
+        # To check for uptime of just the middleware, we do not require a specific asset class
+        middleware = BaseAssetIntegration(
+            {"middleware_hostname": middleware_hostname, "local_ip_address": ""}
+        )
+        # Fetching this endpoint to check if the middleware is up
+        return bool(middleware.api_get(middleware.get_url("devices/status")))
+    except Exception as e:
+        logger.warning("Middleware %s is down: %s", middleware_hostname, e)
+        return False
+
+
+def probe_middlewares(middleware_hostnames: Iterable[str]) -> dict[str, bool]:
+    """
+    Probes every distinct middleware concurrently and returns whether each of
+    them is up. Middlewares with an open circuit are reported down without
+    being probed.
+    """
+    return map_concurrently(probe_middleware, middleware_hostnames)
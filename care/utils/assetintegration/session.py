@@ -0,0 +1,126 @@
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from care.utils.instrumentation import (
+    MetricFamily,
+    escape_label,
+    get_histograms,
+    get_series,
+    increment_counter,
+    observe_histogram,
+    observe_http,
+    parse_labels,
+    read_metrics,
+    register_family,
+)
+from care.utils.jwks.token_generator import generate_jwt
+
+# upper bounds (in seconds) of the middleware request latency buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)
+
+MIDDLEWARE_DURATION = "care_middleware_request_duration_seconds"
+MIDDLEWARE_ERRORS = "care_middleware_request_errors_total"
+
+# lifetime of the tokens sent to middlewares, and how long before they
+# expire a new one is generated
+MIDDLEWARE_TOKEN_LIFETIME = 60
+MIDDLEWARE_TOKEN_REFRESH_MARGIN = 15
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+_token: tuple[str, float] | None = None
+
+
+def get_middleware_session(middleware_hostname: str) -> requests.Session:
+    """
+    Returns the session of the middleware, shared by the process so that
+    connections to the middleware are kept alive and reused.
+    """
+    session = _sessions.get(middleware_hostname)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(middleware_hostname)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.MIDDLEWARE_POOL_SIZE,
+                    # gateway errors are retried for reads, connection errors
+                    # are not as they open the circuit of the middleware
+                    max_retries=Retry(
+                        total=settings.MIDDLEWARE_REQUEST_RETRIES,
+                        connect=0,
+                        read=0,
+                        backoff_factor=0.2,
+                        status_forcelist=(502, 503, 504),
+                        raise_on_status=False,
+                    ),
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[middleware_hostname] = session
+    return session
+
+
+def get_middleware_token() -> str:
+    """
+    Returns a token for middleware requests, reused until shortly before it
+    expires.
+    """
+    global _token  # noqa: PLW0603
+    token = _token
+    if token is None or token[1] - time.time() < MIDDLEWARE_TOKEN_REFRESH_MARGIN:
+        token = (
+            generate_jwt(exp=MIDDLEWARE_TOKEN_LIFETIME),
+            time.time() + MIDDLEWARE_TOKEN_LIFETIME,
+        )
+        _token = token
+    return token[0]
+
+
+register_family(
+    MIDDLEWARE_DURATION,
+    MetricFamily(
+        "histogram", "Duration of the requests made to middlewares", LATENCY_BUCKETS
+    ),
+)
+register_family(
+    MIDDLEWARE_ERRORS,
+    MetricFamily(
+        "counter", "Requests to middlewares that failed to connect or timed out"
+    ),
+)
+
+
+def observe_middleware_latency(middleware_hostname: str, seconds: float, failed: bool):
+    observe_http(seconds)
+    labels = f'middleware="{escape_label(middleware_hostname)}"'
+    observe_histogram(MIDDLEWARE_DURATION, labels, seconds)
+    if failed:
+        increment_counter(MIDDLEWARE_ERRORS, labels)
+
+
+def get_middleware_latencies() -> dict[str, dict]:
+    """
+    Returns the latency of the middleware requests made by every process, per
+    middleware, with cumulative counts of requests under each bucket bound.
+    """
+    samples = read_metrics()
+    errors = get_series(samples, MIDDLEWARE_ERRORS)
+    return {
+        parse_labels(labels)["middleware"]: {
+            "count": int(histogram["count"]),
+            "errors": int(errors.get(labels, 0)),
+            "total_seconds": histogram["sum"],
+            "buckets": {
+                bound: int(count) for bound, count in histogram["buckets"].items()
+            },
+        }
+        for labels, histogram in get_histograms(samples, MIDDLEWARE_DURATION).items()
+    }
@@ -1,18 +1,88 @@
+import time
+
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 
 from care.facility.models.facility import FacilityUser
 
+# bumped to invalidate the cached facilities of every user at once
+USER_FACILITIES_GENERATION_KEY = "user_facilities_generation"
+
+# the local cache is emptied when it grows past this many users
+LOCAL_CACHE_MAX_SIZE = 10_000
+
+_local_cache: dict[str, tuple[float, tuple[int, ...]]] = {}
+
+
+def get_user_facilities_version_key(user_id) -> str:
+    return f"user_facilities_version:{user_id}"
+
 
 def get_accessible_facilities(user):
+    """
+    Returns the ids of the facilities linked to the user. The cache key holds
+    the global generation and the version of the user's links, bumped whenever
+    they change, so that outdated entries are never read.
+    """
     user_id = str(user.id)
-    key = "user_facilities:" + user_id
-    hit = cache.get(key)
-    if not hit:
+    local_timeout = settings.USER_FACILITIES_LOCAL_CACHE_TIMEOUT
+    if local_timeout:
+        entry = _local_cache.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return list(entry[1])
+
+    version_key = get_user_facilities_version_key(user_id)
+    versions = cache.get_many([USER_FACILITIES_GENERATION_KEY, version_key])
+    key = (
+        f"user_facilities:{user_id}:"
+        f"{versions.get(USER_FACILITIES_GENERATION_KEY, 0)}:"
+        f"{versions.get(version_key, 0)}"
+    )
+    facility_ids = cache.get(key)
+    if facility_ids is None:
         facility_ids = list(
             FacilityUser.objects.filter(user_id=user_id).values_list(
                 "facility__id", flat=True
             )
         )
-        cache.set(key, facility_ids)
-        return facility_ids
-    return hit
+        cache.set(key, facility_ids, settings.USER_FACILITIES_CACHE_TIMEOUT)
+
+    if local_timeout:
+        if len(_local_cache) >= LOCAL_CACHE_MAX_SIZE:
+            _local_cache.clear()
+        _local_cache[user_id] = (time.monotonic() + local_timeout, tuple(facility_ids))
+    return facility_ids
+
+
+def _bump(key):
+    if not cache.add(key, 1, timeout=None):
+        cache.incr(key)
+
+
+def bump_user_facilities_version(user_id):
+    _bump(get_user_facilities_version_key(user_id))
+    _local_cache.pop(str(user_id), None)
+
+
+def bump_user_facilities_generation():
+    _bump(USER_FACILITIES_GENERATION_KEY)
+    _local_cache.clear()
+
+
+def invalidate_user_facilities(user_ids=None):
+    """
+    Invalidates the cached facilities of the users, or of every user when
+    none are given, once the current transaction is committed so that they
+    are not cached again from a read made before the change is visible.
+    """
+    if user_ids is None:
+        transaction.on_commit(bump_user_facilities_generation)
+        return
+    user_ids = set(user_ids) - {None}
+
+    def bump_versions():
+        for user_id in user_ids:
+            bump_user_facilities_version(user_id)
+
+    transaction.on_commit(bump_versions)
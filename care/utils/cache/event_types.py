@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from care.facility.models.events import EventType
+
+_local_cache: dict[str, tuple[float, tuple[EventType, ...]]] = {}
+
+
+def get_event_type_groups(model: str) -> tuple[EventType, ...]:
+    """
+    Returns the active event types of the model having fields, ordered by id.
+    They are kept in the memory of the process, and are shared by every
+    caller, so they must not be modified.
+    """
+    timeout = settings.EVENT_TYPES_LOCAL_CACHE_TIMEOUT
+    if timeout:
+        entry = _local_cache.get(model)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+    groups = tuple(
+        EventType.objects.filter(
+            model=model, fields__len__gt=0, is_active=True
+        ).order_by("id")
+    )
+    if timeout:
+        _local_cache[model] = (time.monotonic() + timeout, groups)
+    return groups
+
+
+def invalidate_event_type_groups():
+    """
+    Empties the event types cached by the process, right away for the reads
+    of the current transaction and again once it is committed, so that they
+    are not cached again from a read made before the change is visible.
+    """
+    _local_cache.clear()
+    transaction.on_commit(_local_cache.clear)
@@ -0,0 +1,463 @@
+import atexit
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+from celery.signals import task_postrun
+from django.conf import settings
+from django.core.signals import request_finished
+from redis import Redis, RedisError
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of the buckets of the per view histograms
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+@dataclass
+class RequestMetrics:
+    sql_queries: int = 0
+    sql_seconds: float = 0
+    cache_calls: int = 0
+    cache_seconds: float = 0
+    http_calls: int = 0
+    http_seconds: float = 0
+    render_seconds: float = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+# metrics of the request being handled, only set for sampled requests
+_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def observe_sql(seconds: float):
+    if metrics := _request_metrics.get():
+        metrics.sql_queries += 1
+        metrics.sql_seconds += seconds
+
+
+def observe_cache(seconds: float):
+    if metrics := _request_metrics.get():
+        metrics.cache_calls += 1
+        metrics.cache_seconds += seconds
+
+
+def observe_http(seconds: float):
+    if metrics := _request_metrics.get():
+        metrics.http_calls += 1
+        metrics.http_seconds += seconds
+
+
+def observe_render(seconds: float):
+    if metrics := _request_metrics.get():
+        metrics.render_seconds += seconds
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    if _request_metrics.get() is None:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        observe_sql(time.perf_counter() - started_at)
+
+
+def _timed(call, observe):
+    def wrapper(*args, **kwargs):
+        if _request_metrics.get() is None:
+            return call(*args, **kwargs)
+        started_at = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            observe(time.perf_counter() - started_at)
+
+    return wrapper
+
+
+def _wrap_connection(sender, connection, **kwargs):
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def install_hooks():
+    """
+    Times the SQL queries, as well as the redis commands sent by the cache and
+    the redis_om models, while a sampled request is handled. The commands of
+    a pipeline are sent, and counted, together.
+    """
+    global _hooks_installed  # noqa: PLW0603
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from redis.client import Pipeline, Redis
+
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        connection_created.connect(_wrap_connection)
+        for connection in connections.all(initialized_only=True):
+            _wrap_connection(None, connection)
+        Redis.execute_command = _timed(Redis.execute_command, observe_cache)
+        Pipeline.execute = _timed(Pipeline.execute, observe_cache)
+        _hooks_installed = True
+
+
+@contextmanager
+def collect_request_metrics():
+    """
+    Collects the metrics of the queries, redis commands and middleware requests
+    made by the code run in the block, once the hooks are installed.
+    """
+    metrics = RequestMetrics()
+    token = _request_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _request_metrics.reset(token)
+
+
+@dataclass
+class Histogram:
+    bounds: tuple
+    buckets: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0
+
+    def __post_init__(self):
+        self.buckets = self.buckets or [0] * len(self.bounds)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        index = bisect_left(self.bounds, value)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+
+    def cumulative_buckets(self) -> list[tuple[float, int]]:
+        cumulative, buckets = 0, []
+        for bound, count in zip(self.bounds, self.buckets, strict=True):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return buckets
+
+
+@dataclass(frozen=True)
+class MetricFamily:
+    type: str
+    help: str
+    bounds: tuple = ()
+
+
+# name, help and bounds of the histograms kept per view, the duration covers
+# every request while the others only the sampled ones
+VIEW_HISTOGRAMS = {
+    "request_duration_seconds": ("Duration of the requests", DURATION_BUCKETS),
+    "request_sql_queries": ("SQL queries run by a request", COUNT_BUCKETS),
+    "request_sql_seconds": ("Time spent in SQL queries", DURATION_BUCKETS),
+    "request_cache_calls": ("Redis commands sent by a request", COUNT_BUCKETS),
+    "request_cache_seconds": ("Time spent in redis commands", DURATION_BUCKETS),
+    "request_http_calls": ("Middleware requests made by a request", COUNT_BUCKETS),
+    "request_http_seconds": ("Time spent in middleware requests", DURATION_BUCKETS),
+    "request_render_seconds": ("Time spent rendering responses", DURATION_BUCKETS),
+}
+
+_families: dict[str, MetricFamily] = {
+    f"care_{name}": MetricFamily("histogram", description, bounds)
+    for name, (description, bounds) in VIEW_HISTOGRAMS.items()
+}
+
+# returns the metrics of a module by name, cumulative for the counters
+_collectors: list[Callable[[], dict[str, float]]] = []
+
+_histograms: dict[tuple[str, str], Histogram] = {}
+_counters: dict[tuple[str, str], float] = {}
+_histograms_lock = threading.Lock()
+
+
+def register_family(name: str, family: MetricFamily):
+    _families[name] = family
+
+
+def register_collector(collect: Callable[[], dict[str, float]]):
+    """
+    Registers a function returning the values of metrics, of families without
+    labels, that the module keeps itself. They are pushed along with the
+    histograms and counters of the process.
+    """
+    _collectors.append(collect)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_labels(labels: str) -> dict[str, str]:
+    return {
+        name: re.sub(r"\\(.)", lambda m: "\n" if m[1] == "n" else m[1], value)
+        for name, value in LABEL_PATTERN.findall(labels)
+    }
+
+
+def _join_labels(*labels: str) -> str:
+    return ",".join(label for label in labels if label)
+
+
+def _sample(name: str, *labels: str) -> str:
+    labels = _join_labels(*labels)
+    return f"{name}{{{labels}}}" if labels else name
+
+
+def observe_histogram(name: str, labels: str, value: float):
+    with _histograms_lock:
+        histogram = _histograms.get((name, labels))
+        if histogram is None:
+            histogram = _histograms[(name, labels)] = Histogram(_families[name].bounds)
+        histogram.observe(value)
+
+
+def increment_counter(name: str, labels: str, value: float = 1):
+    with _histograms_lock:
+        _counters[(name, labels)] = _counters.get((name, labels), 0) + value
+
+
+def observe_request(view: str, seconds: float, metrics: RequestMetrics | None):
+    labels = f'view="{escape_label(view)}"'
+    observe_histogram("care_request_duration_seconds", labels, seconds)
+    if metrics is None:
+        return
+    for name, value in metrics.as_dict().items():
+        observe_histogram(f"care_request_{name}", labels, value)
+
+
+def _process_samples() -> tuple[dict[str, float], dict[str, float]]:
+    """
+    Returns the cumulative samples of the histograms and counters of the
+    process, and the values of its gauges.
+    """
+    samples, gauges = {}, {}
+    with _histograms_lock:
+        for (name, labels), histogram in _histograms.items():
+            for bound, cumulative in histogram.cumulative_buckets():
+                samples[_sample(f"{name}_bucket", labels, f'le="{bound}"')] = cumulative
+            samples[_sample(f"{name}_bucket", labels, 'le="+Inf"')] = histogram.count
+            samples[_sample(f"{name}_sum", labels)] = histogram.total
+            samples[_sample(f"{name}_count", labels)] = histogram.count
+        for (name, labels), value in _counters.items():
+            samples[_sample(name, labels)] = value
+    for collect in _collectors:
+        for name, value in collect().items():
+            if _families[name].type == "gauge":
+                gauges[name] = value
+            else:
+                samples[name] = value
+    return samples, gauges
+
+
+_redis = None
+# samples of the process as they were last pushed
+_pushed: dict[str, float] = {}
+_pushed_at = 0.0
+_push_lock = threading.Lock()
+
+
+def _get_redis():
+    global _redis  # noqa: PLW0603
+    if _redis is None:
+        _redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+def _gauges_key() -> str:
+    return f"{settings.METRICS_REDIS_KEY}:gauges"
+
+
+def push_metrics(force=False):
+    """
+    Adds what the process recorded since its last push to the totals of every
+    process kept in redis, and sets its gauges there, at most once every
+    METRICS_PUSH_INTERVAL seconds unless forced. A failed push is retried
+    with the next one.
+    """
+    global _pushed_at  # noqa: PLW0603
+    if not force and time.monotonic() - _pushed_at < settings.METRICS_PUSH_INTERVAL:
+        return
+    with _push_lock:
+        samples, gauges = _process_samples()
+        process = escape_label(f"{socket.gethostname()}:{os.getpid()}")
+        try:
+            pipeline = _get_redis().pipeline(transaction=False)
+            for sample, value in samples.items():
+                if delta := value - _pushed.get(sample, 0):
+                    pipeline.hincrbyfloat(settings.METRICS_REDIS_KEY, sample, delta)
+            if gauges:
+                pushed_at = time.time()
+                pipeline.hset(
+                    _gauges_key(),
+                    mapping={
+                        _sample(name, f'process="{process}"'): json.dumps(
+                            [value, pushed_at]
+                        )
+                        for name, value in gauges.items()
+                    },
+                )
+            pipeline.execute()
+        except RedisError:
+            logger.warning("Could not push the metrics of the process", exc_info=True)
+            return
+        _pushed.update(samples)
+        _pushed_at = time.monotonic()
+
+
+def read_metrics() -> dict[str, float]:
+    """
+    Returns the samples of every process, the ones of this process pushed
+    first. Falls back to the samples of this process if redis is unreachable.
+    """
+    push_metrics(force=True)
+    try:
+        conn = _get_redis()
+        samples = {
+            sample: float(value)
+            for sample, value in conn.hgetall(settings.METRICS_REDIS_KEY).items()
+        }
+        stale, stale_before = [], time.time() - settings.METRICS_GAUGE_TIMEOUT
+        for sample, gauge in conn.hgetall(_gauges_key()).items():
+            value, pushed_at = json.loads(gauge)
+            if pushed_at < stale_before:
+                stale.append(sample)
+            else:
+                samples[sample] = value
+        if stale:
+            # gauges of the processes that stopped
+            conn.hdel(_gauges_key(), *stale)
+    except RedisError:
+        logger.warning("Could not read the metrics of every process", exc_info=True)
+        samples, gauges = _process_samples()
+        samples.update(gauges)
+    return samples
+
+
+def reset_metrics():
+    """
+    Empties the metrics of the process along with the ones pushed by every
+    process.
+    """
+    global _pushed_at  # noqa: PLW0603
+    with _histograms_lock:
+        _histograms.clear()
+        _counters.clear()
+    with _push_lock:
+        _pushed.clear()
+        _pushed_at = 0.0
+        _get_redis().delete(settings.METRICS_REDIS_KEY, _gauges_key())
+
+
+def get_series(samples: dict[str, float], name: str) -> dict[str, float]:
+    """
+    Returns the samples of the metric by their labels.
+    """
+    series = {}
+    for sample, value in samples.items():
+        sample_name, _, labels = sample.partition("{")
+        if sample_name == name:
+            series[labels.removesuffix("}")] = value
+    return series
+
+
+def get_histograms(samples: dict[str, float], name: str) -> dict[str, dict]:
+    """
+    Returns the histograms of the metric by their labels, with cumulative
+    counts of the observations under each bucket bound.
+    """
+    buckets = get_series(samples, f"{name}_bucket")
+    sums = get_series(samples, f"{name}_sum")
+    return {
+        labels: {
+            "count": count,
+            "sum": sums.get(labels, 0),
+            "buckets": {
+                str(bound): buckets.get(_join_labels(labels, f'le="{bound}"'), 0)
+                for bound in _families[name].bounds
+            },
+        }
+        for labels, count in get_series(samples, f"{name}_count").items()
+    }
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def render_metrics() -> str:
+    """
+    Renders the metrics of every process in the Prometheus text format.
+    """
+    samples = read_metrics()
+    lines = []
+    for name, family in _families.items():
+        lines += [f"# HELP {name} {family.help}", f"# TYPE {name} {family.type}"]
+        if family.type != "histogram":
+            lines += [
+                f"{_sample(name, labels)} {_format(value)}"
+                for labels, value in sorted(get_series(samples, name).items())
+            ]
+            continue
+        for labels, histogram in sorted(get_histograms(samples, name).items()):
+            bucket_bounds = [
+                *histogram["buckets"].items(),
+                ("+Inf", histogram["count"]),
+            ]
+            for bound, value in bucket_bounds:
+                le = f'le="{bound}"'
+                lines.append(
+                    f"{_sample(f'{name}_bucket', labels, le)} {_format(value)}"
+                )
+            lines += [
+                f"{_sample(f'{name}_sum', labels)} {histogram['sum']}",
+                f"{_sample(f'{name}_count', labels)} {_format(histogram['count'])}",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def push_metrics_at_request_end(**kwargs):
+    push_metrics()
+
+
+def push_metrics_after_task(**kwargs):
+    push_metrics()
+
+
+def connect_metrics_push():
+    """
+    Pushes the metrics of the process at the end of its requests and tasks,
+    and when it exits. Only connected when the instrumentation is enabled.
+    """
+    request_finished.connect(
+        push_metrics_at_request_end, dispatch_uid="push_metrics_at_request_end"
+    )
+    task_postrun.connect(
+        push_metrics_after_task, weak=False, dispatch_uid="push_metrics_after_task"
+    )
+    atexit.register(push_metrics, force=True)
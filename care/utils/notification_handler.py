@@ -4,7 +4,7 @@ import logging
 from celery import shared_task
 from django.apps import apps
 from django.conf import settings
-from pywebpush import WebPushException, webpush
+from django.db.models import Q
 
 from care.facility.models.daily_round import DailyRound
 from care.facility.models.facility import Facility, FacilityUser
@@ -18,9 +18,12 @@ from care.facility.models.patient_investigation import (
 from care.facility.models.shifting import ShiftingRequest
 from care.users.models import User
 from care.utils.sms.send_sms import send_sms
+from care.utils.webpush import send_webpushes
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_BATCH_SIZE = 500
+
 
 class NotificationCreationError(Exception):
     pass
@@ -304,9 +307,6 @@ class NotificationGenerator:
         return True
 
     def generate_system_users(self):
-        users = []
-        extra_users = self.extra_users
-        caused_user = self.caused_by
         facility_users = FacilityUser.objects.filter(facility_id=self.facility.id)
         if self.event != Notification.Event.MESSAGE:
             facility_users.exclude(
@@ -315,16 +315,16 @@ class NotificationGenerator:
                     User.TYPE_VALUE_MAP["StaffReadOnly"],
                 )
             )
-        for facility_user in facility_users:
-            if facility_user.user.id != caused_user.id:
-                users.append(facility_user.user)
-        for user_id in extra_users:
-            user_obj = User.objects.get(id=user_id)
-            if user_obj.id != caused_user.id:
-                users.append(user_obj)
-        return users
+        return list(
+            User.objects.filter(
+                Q(id__in=facility_users.values("user_id")) | Q(id__in=self.extra_users)
+            )
+            .exclude(id=self.caused_by.id)
+            .select_related(None)
+            .only("id", "pf_endpoint", "pf_p256dh", "pf_auth")
+        )
 
-    def generate_message_for_user(self, user, message, medium):
+    def build_message_for_user(self, user, message, medium):
         notification = Notification()
         notification.intended_for = user
         notification.caused_objects = self.caused_objects
@@ -333,35 +333,15 @@ class NotificationGenerator:
         notification.event = self.event
         notification.event_type = self.event_type
         notification.caused_by = self.caused_by
+        return notification
+
+    def generate_message_for_user(self, user, message, medium):
+        notification = self.build_message_for_user(user, message, medium)
         notification.save()
         return notification
 
     def send_webpush_user(self, user, message):
-        try:
-            if user.pf_endpoint and user.pf_p256dh and user.pf_auth:
-                webpush(
-                    subscription_info={
-                        "endpoint": user.pf_endpoint,
-                        "keys": {"p256dh": user.pf_p256dh, "auth": user.pf_auth},
-                    },
-                    data=message,
-                    vapid_private_key=settings.VAPID_PRIVATE_KEY,
-                    vapid_claims={
-                        "sub": "mailto:info@ohc.network",
-                    },
-                )
-        except WebPushException as ex:
-            logger.info("Web Push Failed with Exception: %s", repr(ex))
-            if ex.response and ex.response.json():
-                extra = ex.response.json()
-                logger.info(
-                    "Remote service replied with a %s:%s, %s",
-                    extra.code,
-                    extra.errno,
-                    extra.message,
-                )
-        except Exception as e:
-            logger.info("Error When Doing WebPush: %s", e)
+        send_webpushes([(user, message)])
 
     def generate(self):
         if not self.worker_initiated:
@@ -379,20 +359,30 @@ class NotificationGenerator:
             elif medium == Notification.Medium.SYSTEM.value:
                 if not self.message:
                     self.message = self.generate_system_message()
-                for user in self.generate_system_users():
-                    notification_obj = self.generate_message_for_user(
-                        user, self.message, Notification.Medium.SYSTEM.value
-                    )
-                    if not self.defer_notifications:
-                        self.send_webpush_user(
-                            user,
-                            json.dumps(
-                                {
-                                    "external_id": str(notification_obj.external_id),
-                                    "message": self.message,
-                                    "type": Notification.Event(
-                                        notification_obj.event
-                                    ).name,
-                                }
-                            ),
+                notifications = Notification.objects.bulk_create(
+                    [
+                        self.build_message_for_user(
+                            user, self.message, Notification.Medium.SYSTEM.value
                         )
+                        for user in self.generate_system_users()
+                    ],
+                    batch_size=NOTIFICATION_BATCH_SIZE,
+                )
+                if not self.defer_notifications:
+                    send_webpushes(
+                        [
+                            (
+                                notification.intended_for,
+                                json.dumps(
+                                    {
+                                        "external_id": str(notification.external_id),
+                                        "message": self.message,
+                                        "type": Notification.Event(
+                                            notification.event
+                                        ).name,
+                                    }
+                                ),
+                            )
+                            for notification in notifications
+                        ]
+                    )
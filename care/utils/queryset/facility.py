@@ -1,34 +1,59 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from care.facility.models.bed import Bed
 from care.facility.models.facility import Facility
-from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.facility.models.patient import PatientRegistration
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
 
 
 def get_facility_queryset(user):
     queryset = Facility.objects.all()
-    if user.is_superuser:
-        pass
-    elif hasattr(user, "asset") and user.asset is not None:
-        queryset = queryset.filter(id=user.asset.current_location.facility_id)
-    elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-        queryset = queryset.filter(state=user.state)
-    elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-        queryset = queryset.filter(district=user.district)
-    else:
-        allowed_facilities = get_accessible_facilities(user)
-        queryset = queryset.filter(id__in=allowed_facilities)
-    return queryset
+    scope = get_permission_scope(user)
+    if scope.asset_facility_id is not None:
+        return queryset.filter(id=scope.asset_facility_id)
+    return queryset.filter(scope.facility_filter(""))
 
 
 def get_home_facility_queryset(user):
     queryset = Facility.objects.all()
-    if user.is_superuser:
-        pass
-    elif hasattr(user, "asset") and user.asset is not None:
-        queryset = queryset.filter(id=user.asset.current_location.facility_id)
-    elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
-        queryset = queryset.filter(state=user.state)
-    elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
-        queryset = queryset.filter(district=user.district)
-    else:
-        queryset = queryset.filter(id=user.home_facility_id)
-    return queryset
+    scope = get_permission_scope(user)
+    if scope.asset_facility_id is not None:
+        return queryset.filter(id=scope.asset_facility_id)
+    if scope.level == ScopeLevel.FACILITY:
+        return queryset.filter(id=user.home_facility_id)
+    return queryset.filter(scope.facility_filter(""))
+
+
+def _count_subquery(queryset):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values("facility")
+            .annotate(count=Count("id"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def refresh_facility_counts(queryset) -> int:
+    """
+    Recomputes the `bed_count` and `patient_count` counters of the facilities
+    of the queryset, updating only the ones that do not match.
+    Returns the number of facilities updated.
+    """
+    bed_count = _count_subquery(Bed.objects.filter(facility=OuterRef("pk")))
+    patient_count = _count_subquery(
+        PatientRegistration.objects.filter(facility=OuterRef("pk"), is_active=True)
+    )
+    outdated = queryset.annotate(
+        current_bed_count=bed_count, current_patient_count=patient_count
+    ).filter(
+        ~Q(bed_count=F("current_bed_count"))
+        | ~Q(patient_count=F("current_patient_count"))
+    )
+    return Facility.objects.filter(id__in=outdated.values("id")).update(
+        bed_count=bed_count, patient_count=patient_count
+    )
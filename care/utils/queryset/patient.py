@@ -2,7 +2,7 @@ from django.db.models.query_utils import Q
 
 from care.facility.models.patient import PatientRegistration
 from care.users.models import User
-from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.utils.queryset.scope import get_permission_scope
 
 
 def get_patient_queryset(user):
@@ -30,7 +30,7 @@ def get_patient_notes_queryset(user):
     elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
         queryset = queryset.filter(facility__district=user.district)
     else:
-        allowed_facilities = get_accessible_facilities(user)
+        allowed_facilities = get_permission_scope(user).facility_ids
 
         q_filters = Q(last_consultation__assigned_to=user)
         q_filters |= Q(assigned_to=user)
@@ -0,0 +1,110 @@
+import enum
+from contextvars import ContextVar
+from functools import cached_property
+
+from django.core.signals import request_finished, request_started
+from django.db.models import Q
+from django.dispatch import receiver
+
+from care.users.models import User
+from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+
+
+class ScopeLevel(enum.Enum):
+    ALL = "all"
+    STATE = "state"
+    DISTRICT = "district"
+    FACILITY = "facility"
+
+
+class PermissionScope:
+    """
+    The facilities a user can access: all of them for superusers, the ones of
+    their state or district for lab admins and above, and the linked ones
+    otherwise. Users bound to an asset are further restricted to the facility
+    of the asset by the helpers that allow them.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        if user.is_superuser:
+            self.level = ScopeLevel.ALL
+        elif user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
+            self.level = ScopeLevel.STATE
+        elif user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
+            self.level = ScopeLevel.DISTRICT
+        else:
+            self.level = ScopeLevel.FACILITY
+
+    @property
+    def is_superuser(self) -> bool:
+        return self.level == ScopeLevel.ALL
+
+    @cached_property
+    def asset_facility_id(self) -> int | None:
+        if self.is_superuser or self.user.asset_id is None:
+            return None
+        return self.user.asset.current_location.facility_id
+
+    @cached_property
+    def facility_ids(self) -> frozenset[int]:
+        return frozenset(get_accessible_facilities(self.user))
+
+    def facility_filter(self, field: str = "facility") -> Q:
+        """
+        Returns the filter restricting the facility at `field`, the model
+        itself when empty, to the facilities of the scope.
+        """
+        prefix = f"{field}__" if field else ""
+        if self.level == ScopeLevel.ALL:
+            return Q()
+        if self.level == ScopeLevel.STATE:
+            return Q(**{f"{prefix}state_id": self.user.state_id})
+        if self.level == ScopeLevel.DISTRICT:
+            return Q(**{f"{prefix}district_id": self.user.district_id})
+        return Q(**{f"{prefix}id__in": self.facility_ids})
+
+    def has_facility(self, facility, allow_asset=True) -> bool:
+        """
+        Checks that the facility is in the scope, without querying the
+        database once the linked facilities are known.
+        """
+        if facility.deleted:
+            return False
+        if self.is_superuser:
+            return True
+        if allow_asset and self.asset_facility_id is not None:
+            return facility.id == self.asset_facility_id
+        if self.level == ScopeLevel.STATE:
+            return facility.state_id == self.user.state_id
+        if self.level == ScopeLevel.DISTRICT:
+            return facility.district_id == self.user.district_id
+        return facility.id in self.facility_ids
+
+
+# scopes resolved during the request being handled, by user
+_scopes: ContextVar[dict | None] = ContextVar("permission_scopes", default=None)
+
+
+@receiver(request_started)
+def start_scopes(**kwargs):
+    _scopes.set({})
+
+
+@receiver(request_finished)
+def clear_scopes(**kwargs):
+    _scopes.set(None)
+
+
+def get_permission_scope(user) -> PermissionScope:
+    """
+    Returns the scope of the user, resolved once per request. Outside of
+    requests the scope is resolved on every call.
+    """
+    scopes = _scopes.get()
+    if scopes is None:
+        return PermissionScope(user)
+    scope = scopes.get(user.id)
+    if scope is None:
+        scope = scopes[user.id] = PermissionScope(user)
+    return scope
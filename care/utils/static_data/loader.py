@@ -0,0 +1,145 @@
+import hashlib
+import logging
+import re
+import time
+from collections.abc import Iterable
+
+from redis_om.model.encoders import jsonable_encoder
+from redis_om.model.migrations.migrator import schema_hash_key
+
+from care.utils.static_data.models.base import BaseRedisModel
+
+logger = logging.getLogger(__name__)
+
+BULK_LOAD_BATCH_SIZE = 5000
+
+
+def _get_document(obj: BaseRedisModel):
+    # same encoding as HashModel.save
+    document = jsonable_encoder(obj.dict())
+    return {k: v for k, v in document.items() if v is not None}
+
+
+def _get_primary_key_name(model: type[BaseRedisModel]):
+    # same lookup as RedisModel.key
+    primary_key = model._meta.primary_key  # noqa: SLF001
+    if hasattr(primary_key.field, "name"):
+        return primary_key.field.name
+    return primary_key.name
+
+
+def _drop_stale_indexes(model: type[BaseRedisModel], keep: set[int]):
+    """
+    Drops the versioned indexes of the model, along with their documents,
+    except for the given versions.
+    """
+    conn = model.db()
+    version_prefix = f"{model._meta.index_name}:v"  # noqa: SLF001
+    for index_name in conn.execute_command("FT._LIST"):
+        if not index_name.startswith(version_prefix):
+            continue
+        version = index_name.removeprefix(version_prefix)
+        if version.isdigit() and int(version) not in keep:
+            conn.execute_command("FT.DROPINDEX", index_name, "DD")
+
+
+def _legacy_documents_key(model: type[BaseRedisModel]):
+    return f"{model._meta.index_name}:legacy_documents"  # noqa: SLF001
+
+
+def _drop_legacy_documents(model: type[BaseRedisModel]):
+    """
+    Deletes the documents written before the data was versioned, once the
+    processes reading them have noticed the switch to a versioned index.
+    """
+    conn = model.db()
+    if not conn.delete(_legacy_documents_key(model)):
+        return
+    prefix = model.make_versioned_key(None, "")
+    versioned_key = re.compile(rf"{re.escape(prefix)}v\d+:")
+    pipeline = conn.pipeline(transaction=False)
+    for key in conn.scan_iter(match=f"{prefix}*", count=BULK_LOAD_BATCH_SIZE):
+        if not versioned_key.match(key):
+            pipeline.delete(key)
+        if len(pipeline) >= BULK_LOAD_BATCH_SIZE:
+            pipeline.execute()
+    pipeline.execute()
+
+
+def bulk_load(
+    model: type[BaseRedisModel],
+    objects: Iterable[BaseRedisModel],
+    batch_size: int = BULK_LOAD_BATCH_SIZE,
+) -> int:
+    """
+    Loads the objects into a new version of the model's index, writing them
+    in pipelined batches, and points the live index alias to it once every
+    object is written. Searches keep hitting the previous version until then.
+
+    The previous version, or the documents loaded before the data was
+    versioned, are kept around for processes that have not yet noticed the
+    switch; anything older is dropped.
+
+    Returns the number of objects loaded.
+    """
+    conn = model.db()
+    started_at = time.monotonic()
+
+    version = conn.incr(f"{model._meta.index_name}:version")  # noqa: SLF001
+    index_name = model.versioned_index_name(version)
+    schema = model.versioned_redisearch_schema(version)
+    conn.execute_command(f"FT.CREATE {index_name} {schema}")
+
+    try:
+        count = 0
+        pipeline = conn.pipeline(transaction=False)
+        pk_pattern = model._meta.primary_key_pattern  # noqa: SLF001
+        pk_name = _get_primary_key_name(model)
+        for obj in objects:
+            pk = getattr(obj, pk_name)
+            key = model.make_versioned_key(version, pk_pattern.format(pk=pk))
+            pipeline.hset(key, mapping=_get_document(obj))
+            count += 1
+            if count % batch_size == 0:
+                pipeline.execute()
+        pipeline.execute()
+
+        alias = model._meta.index_name  # noqa: SLF001
+        previous_version = model.get_live_version(refresh=True)
+        if previous_version is not None:
+            _drop_legacy_documents(model)
+
+        with conn.pipeline(transaction=True) as swap:
+            if alias in conn.execute_command("FT._LIST"):
+                # index created by Migrator before the data was versioned, it is
+                # replaced by the alias in the same transaction so that searches
+                # always find an index, and its documents are kept until the
+                # next load for the processes still reading them
+                swap.execute_command("FT.DROPINDEX", alias)
+                swap.set(_legacy_documents_key(model), 1)
+            swap.execute_command("FT.ALIASUPDATE", alias, index_name)
+            swap.set(model.live_version_key(), version)
+            swap.set(
+                schema_hash_key(alias),
+                hashlib.sha1(schema.encode("utf-8")).hexdigest(),  # noqa: S324
+            )
+            swap.execute()
+    except Exception:
+        # the index of a load that did not go live is dropped with its
+        # documents, the index of a load killed mid-way is dropped by the next
+        conn.execute_command("FT.DROPINDEX", index_name, "DD")
+        raise
+    model.get_live_version(refresh=True)
+
+    _drop_stale_indexes(model, keep={version, previous_version})
+
+    elapsed = time.monotonic() - started_at
+    logger.info(
+        "Loaded %s %s objects as version %s in %.2fs (%.0f rows/sec)",
+        count,
+        model.__name__,
+        version,
+        elapsed,
+        count / elapsed if elapsed else count,
+    )
+    return count
@@ -1,23 +1,99 @@
+import time
 from abc import ABC
+from collections.abc import Iterable
 
 from django.conf import settings
 from redis_om import HashModel, get_redis_connection
 from redis_om.model.migrations.migrator import schema_hash_key
 
+# seconds for which a process keeps using the live version it last read
+LIVE_VERSION_CACHE_TTL = 60
+
+_live_versions: dict[str, tuple[float, int]] = {}
+
 
 class BaseRedisModel(HashModel, ABC):
     class Meta:
         database = get_redis_connection(url=settings.REDIS_URL)
         global_key_prefix = "care_static_data"
 
+    @classmethod
+    def live_version_key(cls):
+        return f"{cls._meta.index_name}:live_version"
+
+    @classmethod
+    def get_live_version(cls, refresh=False) -> int | None:
+        """
+        Returns the version of the data currently served by the index alias,
+        or None if the data was loaded without a version. None is not cached,
+        so that the first versioned load is seen right away.
+        """
+        key = cls.live_version_key()
+        cached = _live_versions.get(key)
+        if refresh or cached is None or cached[0] < time.monotonic():
+            version = cls.db().get(key)
+            if not version:
+                _live_versions.pop(key, None)
+                return None
+            cached = (time.monotonic() + LIVE_VERSION_CACHE_TTL, int(version))
+            _live_versions[key] = cached
+        return cached[1]
+
+    @classmethod
+    def versioned_index_name(cls, version: int):
+        return f"{cls._meta.index_name}:v{version}"
+
+    @classmethod
+    def make_versioned_key(cls, version: int | None, part: str):
+        global_prefix = cls._meta.global_key_prefix.strip(":")
+        model_prefix = cls._meta.model_key_prefix.strip(":")
+        if version is None:
+            return f"{global_prefix}:{model_prefix}:{part}"
+        return f"{global_prefix}:{model_prefix}:v{version}:{part}"
+
+    @classmethod
+    def make_key(cls, part: str):
+        return cls.make_versioned_key(cls.get_live_version(), part)
+
+    @classmethod
+    def get_many(cls, pks: Iterable) -> dict:
+        """
+        Fetches the objects with the given primary keys in a single round trip.
+        Primary keys without an object are left out of the result.
+        """
+        pks = list(dict.fromkeys(pks))
+        pipeline = cls.db().pipeline(transaction=False)
+        for pk in pks:
+            pipeline.hgetall(cls.make_primary_key(pk))
+        return {
+            pk: cls.parse_obj(document)
+            for pk, document in zip(pks, pipeline.execute(), strict=True)
+            if document
+        }
+
+    @classmethod
+    def versioned_redisearch_schema(cls, version: int | None):
+        hash_prefix = cls.make_versioned_key(
+            version, cls._meta.primary_key_pattern.format(pk="")
+        )
+        return " ".join(
+            [f"ON HASH PREFIX 1 {hash_prefix} SCHEMA", *cls.schema_for_fields()]
+        )
+
+    @classmethod
+    def redisearch_schema(cls):
+        return cls.versioned_redisearch_schema(cls.get_live_version())
+
 
 def index_exists(model: HashModel = None):
     """
     Checks the existence of a redisearch index.
-    If no model is passed, it checks for the existence of any index.
+    If a model is passed, checks that its index was created or its alias
+    points to a loaded version, the versioned index of an unfinished load
+    does not count. Otherwise, it checks for the existence of any index.
     """
 
     conn = get_redis_connection(url=settings.REDIS_URL)
     if model:
-        return conn.exists(schema_hash_key(model.Meta.index_name))
+        return conn.exists(schema_hash_key(model._meta.index_name))  # noqa: SLF001
     return len(conn.execute_command("FT._LIST"))
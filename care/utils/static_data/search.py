@@ -0,0 +1,156 @@
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from itertools import islice
+from typing import Any
+
+# words are split like the redisearch tokenizer, except that dots inside a
+# word are kept so that disease codes (eg. ME24.A1) stay a single token
+TOKEN_PATTERN = re.compile(r"\w+(?:\.\w+)*")
+
+# same number of words as care.utils.static_data.helpers.query_builder
+MAX_QUERY_WORDS = 4
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class PrefixSearchIndex:
+    """
+    In-process prefix search over a fixed set of documents.
+
+    The tokens of every document are kept in a sorted list, with the ids of
+    the documents containing each token in a flat array, so that the
+    documents matching a prefix are a contiguous range found by bisection.
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[tuple[str, dict[str, Any]]],
+        exact_field: str | None = None,
+    ):
+        """
+        `documents` are (searchable text, document) pairs, the documents are
+        returned as is by `search`. Documents whose `exact_field` equals the
+        query are ranked first.
+        """
+        self.documents: list[dict[str, Any]] = []
+        self.document_tokens: list[tuple[str, ...]] = []
+        self.exact_field = exact_field
+
+        postings: dict[str, list[int]] = {}
+        for text, document in documents:
+            document_id = len(self.documents)
+            tokens = tuple(dict.fromkeys(tokenize(text)))
+            self.documents.append(document)
+            self.document_tokens.append(tokens)
+            for token in tokens:
+                postings.setdefault(token, []).append(document_id)
+
+        self.tokens = sorted(postings)
+        self.offsets = array("I", [0])
+        self.postings = array("I")
+        for token in self.tokens:
+            self.postings.extend(postings[token])
+            self.offsets.append(len(self.postings))
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _token_range(self, prefix: str) -> tuple[int, int]:
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + "\U0010ffff", lo=start)
+        return self.offsets[start], self.offsets[end]
+
+    def _matches(self, document_id: int, prefix: str) -> bool:
+        return any(
+            token.startswith(prefix) for token in self.document_tokens[document_id]
+        )
+
+    def _rank(self, document_id: int, words: list[str], query: str):
+        document = self.documents[document_id]
+        exact = (
+            self.exact_field is not None
+            and str(document.get(self.exact_field, "")).lower() == query
+        )
+        tokens = self.document_tokens[document_id]
+        whole_words = sum(word in tokens for word in words)
+        return (not exact, -whole_words, len(tokens), document_id)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        where: Callable[[dict[str, Any]], bool] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Returns up to `limit` documents that have a token starting with each
+        of the last words of the query, and satisfy `where`.
+        """
+        words = tokenize(query)[-MAX_QUERY_WORDS:]
+        if words:
+            # start from the word matching the fewest documents
+            start, end = min(
+                (self._token_range(word) for word in words),
+                key=lambda token_range: token_range[1] - token_range[0],
+            )
+            candidates = (
+                document_id
+                for document_id in dict.fromkeys(self.postings[start:end])
+                if all(self._matches(document_id, word) for word in words)
+            )
+        else:
+            candidates = range(len(self.documents))
+
+        if where is not None:
+            candidates = (
+                document_id
+                for document_id in candidates
+                if where(self.documents[document_id])
+            )
+        if not words:
+            return [
+                self.documents[document_id] for document_id in islice(candidates, limit)
+            ]
+
+        normalized_query = query.strip().lower()
+        ranked = heapq.nsmallest(
+            limit,
+            candidates,
+            key=lambda document_id: self._rank(document_id, words, normalized_query),
+        )
+        return [self.documents[document_id] for document_id in ranked]
+
+
+class LazySearchIndex:
+    """
+    Builds the search index with the given function on first use, once per
+    process.
+    """
+
+    def __init__(self, build: Callable[[], PrefixSearchIndex]):
+        self.build = build
+        self._index: PrefixSearchIndex | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> PrefixSearchIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self.build()
+        return self._index
+
+    def warm(self):
+        """
+        Builds the index in a background thread so that the first search
+        does not have to wait for it.
+        """
+        threading.Thread(target=self.get, daemon=True).start()
+
+    def reset(self):
+        with self._lock:
+            self._index = None
@@ -0,0 +1,144 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+from django.conf import settings
+from django.test import modify_settings, override_settings
+from redis.client import Redis
+from rest_framework.test import APITestCase
+
+from care.utils import instrumentation
+from care.utils.assetintegration.session import observe_middleware_latency
+from care.utils.tests.test_utils import TestUtils
+
+
+@modify_settings(
+    MIDDLEWARE={"prepend": "config.middlewares.RequestInstrumentationMiddleware"}
+)
+class RequestInstrumentationTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district, is_staff=True)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.enterContext(
+            override_settings(
+                METRICS_REDIS_KEY=f"care-test-metrics-{uuid.uuid4()}",
+                METRICS_TOKEN="metrics-token",
+            )
+        )
+        instrumentation.reset_metrics()
+        self.addCleanup(instrumentation.reset_metrics)
+
+    def get_metrics(self):
+        response = self.client.get(
+            "/metrics", headers={"Authorization": "Bearer metrics-token"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode().splitlines()
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_sampled_requests_are_recorded_per_view(self):
+        self.client.get("/api/v1/facility/")
+        self.client.get("/api/v1/facility/")
+        self.client.get(f"/api/v1/facility/{self.facility.external_id}/")
+
+        metrics = self.get_metrics()
+        self.assertIn(
+            'care_request_duration_seconds_count{view="FacilityViewSet.list"} 2',
+            metrics,
+        )
+        self.assertIn(
+            'care_request_sql_queries_count{view="FacilityViewSet.retrieve"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'care_request_render_seconds_count{view="FacilityViewSet.list"} 2',
+            metrics,
+        )
+        queries = next(
+            line
+            for line in metrics
+            if line.startswith(
+                'care_request_sql_queries_sum{view="FacilityViewSet.list"}'
+            )
+        )
+        self.assertGreater(float(queries.split()[-1]), 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_only_duration_is_recorded_for_requests_not_sampled(self):
+        self.client.get("/api/v1/facility/")
+
+        metrics = self.get_metrics()
+        self.assertIn(
+            'care_request_duration_seconds_count{view="FacilityViewSet.list"} 1',
+            metrics,
+        )
+        self.assertFalse(
+            any(line.startswith("care_request_sql_queries_count") for line in metrics)
+        )
+
+    def test_redis_and_middleware_calls_are_recorded(self):
+        instrumentation.install_hooks()
+        redis = Redis(connection_pool=MagicMock())
+        with instrumentation.collect_request_metrics() as metrics:
+            redis.execute_command("PING")
+            observe_middleware_latency("metrics.local", 0.2, failed=False)
+
+        self.assertEqual(metrics.cache_calls, 1)
+        self.assertEqual(metrics.http_calls, 1)
+        self.assertEqual(metrics.http_seconds, 0.2)
+
+        # nothing is recorded outside of a sampled request
+        redis.execute_command("PING")
+        self.assertEqual(metrics.cache_calls, 1)
+
+    @override_settings(REQUEST_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_metrics_of_every_process_are_added_up(self):
+        self.client.get("/api/v1/facility/")
+        instrumentation.push_metrics(force=True)
+        # pushed by another worker
+        instrumentation._get_redis().hincrbyfloat(  # noqa: SLF001
+            settings.METRICS_REDIS_KEY,
+            'care_request_duration_seconds_count{view="FacilityViewSet.list"}',
+            2,
+        )
+
+        metrics = self.get_metrics()
+        self.assertIn(
+            'care_request_duration_seconds_count{view="FacilityViewSet.list"} 3',
+            metrics,
+        )
+        # the process pushes only what it recorded since its last push
+        self.assertIn(
+            'care_request_duration_seconds_count{view="FacilityViewSet.list"} 3',
+            self.get_metrics(),
+        )
+        self.assertTrue(
+            any(
+                line.startswith('care_audit_log_queue_depth{process="')
+                for line in metrics
+            )
+        )
+
+    def test_metrics_are_only_pushed_when_enabled(self):
+        self.assertFalse(settings.ENABLE_REQUEST_INSTRUMENTATION)
+        with patch.object(instrumentation, "push_metrics") as push_metrics:
+            self.client.get("/api/v1/facility/")
+        push_metrics.assert_not_called()
+
+    def test_metrics_require_the_token(self):
+        # even for a superuser
+        for url in ("/metrics", "/middleware/latency"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 403)
+            response = self.client.get(url, headers={"Authorization": "Bearer x"})
+            self.assertEqual(response.status_code, 403)
+
+        with override_settings(METRICS_TOKEN=""):
+            response = self.client.get("/metrics", headers={"Authorization": "Bearer "})
+            self.assertEqual(response.status_code, 403)
@@ -0,0 +1,82 @@
+import uuid
+from unittest.mock import patch
+
+import requests
+import requests_mock
+from django.test import TestCase, override_settings
+from freezegun import freeze_time
+from rest_framework.exceptions import APIException
+
+from care.utils.assetintegration import session
+from care.utils.assetintegration.base import BaseAssetIntegration
+from care.utils.instrumentation import reset_metrics
+from care.utils.tests.test_utils import OverrideCache
+
+
+class MiddlewareSessionTestCase(TestCase):
+    def setUp(self):
+        self.enterContext(
+            override_settings(METRICS_REDIS_KEY=f"care-test-metrics-{uuid.uuid4()}")
+        )
+        reset_metrics()
+        self.addCleanup(reset_metrics)
+
+    def test_session_is_shared_per_middleware(self):
+        first = session.get_middleware_session("session-a.local")
+        self.assertIs(first, session.get_middleware_session("session-a.local"))
+        self.assertIsNot(first, session.get_middleware_session("session-b.local"))
+
+    def test_connection_errors_are_not_retried(self):
+        adapter = session.get_middleware_session("session-a.local").get_adapter(
+            "https://session-a.local/"
+        )
+        self.assertEqual(adapter.max_retries.connect, 0)
+        self.assertEqual(adapter.max_retries.read, 0)
+
+    @patch("care.utils.assetintegration.session._token", None)
+    @patch("care.utils.assetintegration.session.generate_jwt", side_effect=["a", "b"])
+    def test_token_is_reused_until_it_expires(self, generate_jwt):
+        with freeze_time("2024-01-01 00:00:00") as frozen_time:
+            self.assertEqual(session.get_middleware_token(), "a")
+            frozen_time.tick(30)
+            self.assertEqual(session.get_middleware_token(), "a")
+            frozen_time.tick(20)
+            self.assertEqual(session.get_middleware_token(), "b")
+        self.assertEqual(generate_jwt.call_count, 2)
+
+    @OverrideCache
+    @requests_mock.Mocker()
+    def test_latency_is_recorded_per_middleware(self, mock_requests):
+        mock_requests.get("https://latency.local/devices/status", json=[])
+        mock_requests.get(
+            "https://latency-down.local/devices/status", exc=requests.ConnectTimeout
+        )
+        for hostname in ("latency.local", "latency-down.local"):
+            middleware = BaseAssetIntegration(
+                {"middleware_hostname": hostname, "local_ip_address": ""}
+            )
+            try:
+                middleware.api_get(middleware.get_url("devices/status"))
+            except APIException:
+                pass
+
+        latencies = session.get_middleware_latencies()
+        self.assertEqual(latencies["latency.local"]["count"], 1)
+        self.assertEqual(latencies["latency.local"]["errors"], 0)
+        self.assertEqual(latencies["latency.local"]["buckets"]["20"], 1)
+        self.assertEqual(latencies["latency-down.local"]["errors"], 1)
+
+    @OverrideCache
+    @requests_mock.Mocker()
+    def test_request_made_while_handling_an_error_is_not_failed(self, mock_requests):
+        mock_requests.get("https://latency-handler.local/devices/status", json=[])
+        middleware = BaseAssetIntegration(
+            {"middleware_hostname": "latency-handler.local", "local_ip_address": ""}
+        )
+        try:
+            raise ValueError
+        except ValueError:
+            middleware.api_get(middleware.get_url("devices/status"))
+
+        latencies = session.get_middleware_latencies()
+        self.assertEqual(latencies["latency-handler.local"]["errors"], 0)
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from rest_framework.test import APITestCase
+
+from care.facility.models import FacilityUser
+from care.users.models import User
+from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.utils.queryset import scope as permission_scope
+from care.utils.queryset.scope import ScopeLevel, get_permission_scope
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class PermissionScopeTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.other_district = cls.create_district(cls.state)
+        cls.other_facility = cls.create_facility(
+            cls.super_user,
+            cls.other_district,
+            cls.create_local_body(cls.other_district),
+        )
+        cls.user = cls.create_user(
+            "doctor",
+            cls.district,
+            home_facility=cls.facility,
+            user_type=User.TYPE_VALUE_MAP["Doctor"],
+        )
+        cls.patient = cls.create_patient(cls.district, cls.facility)
+        cls.consultation = cls.create_consultation(cls.patient, cls.facility)
+
+    def test_levels(self):
+        district_admin = self.create_user(
+            "district_admin",
+            self.district,
+            user_type=User.TYPE_VALUE_MAP["DistrictAdmin"],
+        )
+        state_admin = self.create_user(
+            "state_admin", self.district, user_type=User.TYPE_VALUE_MAP["StateAdmin"]
+        )
+
+        scope = get_permission_scope(self.user)
+        self.assertEqual(scope.level, ScopeLevel.FACILITY)
+        self.assertTrue(scope.has_facility(self.facility))
+        self.assertFalse(scope.has_facility(self.other_facility))
+
+        scope = get_permission_scope(district_admin)
+        self.assertEqual(scope.level, ScopeLevel.DISTRICT)
+        self.assertTrue(scope.has_facility(self.facility))
+        self.assertFalse(scope.has_facility(self.other_facility))
+
+        scope = get_permission_scope(state_admin)
+        self.assertEqual(scope.level, ScopeLevel.STATE)
+        self.assertTrue(scope.has_facility(self.other_facility))
+
+        scope = get_permission_scope(self.super_user)
+        self.assertTrue(scope.is_superuser)
+        self.assertTrue(scope.has_facility(self.other_facility))
+        self.other_facility.deleted = True
+        self.assertFalse(scope.has_facility(self.other_facility))
+
+    def test_scope_is_resolved_once_per_request(self):
+        self.client.force_authenticate(self.user)
+        with patch.object(
+            permission_scope,
+            "get_accessible_facilities",
+            wraps=get_accessible_facilities,
+        ) as accessible_facilities:
+            response = self.client.get(
+                f"/api/v1/consultation/{self.consultation.external_id}/daily_rounds/"
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(accessible_facilities.call_count, 1)
+
+            self.client.get(
+                f"/api/v1/consultation/{self.consultation.external_id}/daily_rounds/"
+            )
+            self.assertEqual(accessible_facilities.call_count, 2)
+
+        # outside of requests the scope is not kept
+        self.assertIsNot(
+            get_permission_scope(self.user), get_permission_scope(self.user)
+        )
+
+    @OverrideCache
+    def test_cached_facilities_are_invalidated_on_change(self):
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            facility_user = FacilityUser.objects.create(
+                facility=self.other_facility, user=self.user, created_by=self.user
+            )
+        self.assertEqual(
+            sorted(get_accessible_facilities(self.user)),
+            sorted([self.facility.id, self.other_facility.id]),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            facility_user.delete()
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+from freezegun import freeze_time
+
+from care.utils.static_data.cache import LRUCache
+
+
+class LRUCacheTestCase(SimpleTestCase):
+    def test_get_many_returns_only_cached_keys(self):
+        cache = LRUCache(maxsize=10, ttl=60)
+        cache.set_many({1: "a", 2: "b"})
+        self.assertEqual(cache.get_many([1, 2, 3]), {1: "a", 2: "b"})
+
+    def test_least_recently_used_key_is_evicted(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set_many({1: "a", 2: "b"})
+        cache.get_many([1])
+        cache.set_many({3: "c"})
+        self.assertEqual(cache.get_many([1, 2, 3]), {1: "a", 3: "c"})
+
+    def test_entries_expire_after_ttl(self):
+        cache = LRUCache(maxsize=10, ttl=60)
+        with freeze_time("2024-01-01 00:00:00"):
+            cache.set_many({1: "a"})
+        with freeze_time("2024-01-01 00:00:59"):
+            self.assertEqual(cache.get_many([1]), {1: "a"})
+        with freeze_time("2024-01-01 00:01:01"):
+            self.assertEqual(cache.get_many([1]), {})
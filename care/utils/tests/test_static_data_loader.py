@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock, call, patch
+
+from django.test import SimpleTestCase
+
+from care.facility.static_data.icd11 import ICD11
+from care.utils.static_data.loader import bulk_load
+
+
+class StaticDataLoaderTestCase(SimpleTestCase):
+    def setUp(self):
+        self.conn = MagicMock()
+        patcher = patch.object(ICD11, "db", return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.alias = ICD11._meta.index_name  # noqa: SLF001
+
+    def test_unversioned_data_is_not_cached(self):
+        self.conn.get.side_effect = [None, "3"]
+        self.assertIsNone(ICD11.get_live_version())
+        self.assertEqual(ICD11.get_live_version(), 3)
+
+    def test_legacy_index_is_replaced_by_the_alias_atomically(self):
+        self.conn.incr.return_value = 1
+        self.conn.get.return_value = None
+        self.conn.execute_command.side_effect = lambda command, *args: (
+            [self.alias] if command == "FT._LIST" else None
+        )
+        swap = self.conn.pipeline.return_value.__enter__.return_value
+
+        bulk_load(ICD11, [])
+
+        self.assertNotIn(
+            call("FT.DROPINDEX", self.alias, "DD"),
+            self.conn.execute_command.call_args_list,
+        )
+        self.assertEqual(
+            swap.execute_command.call_args_list,
+            [
+                call("FT.DROPINDEX", self.alias),
+                call("FT.ALIASUPDATE", self.alias, ICD11.versioned_index_name(1)),
+            ],
+        )
+        # the documents of the legacy index are kept until the next load
+        self.conn.scan_iter.assert_not_called()
+
+    def test_index_of_a_failed_load_is_dropped(self):
+        self.conn.incr.return_value = 2
+        self.conn.pipeline.return_value.execute.side_effect = TimeoutError
+
+        with self.assertRaises(TimeoutError):
+            bulk_load(
+                ICD11,
+                [ICD11(id=1, label="label", chapter="", has_code=1, vec="label")],
+            )
+
+        self.conn.execute_command.assert_called_with(
+            "FT.DROPINDEX", ICD11.versioned_index_name(2), "DD"
+        )
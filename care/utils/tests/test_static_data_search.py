@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+
+from care.utils.static_data.search import PrefixSearchIndex
+
+
+class PrefixSearchIndexTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.index = PrefixSearchIndex(
+            (
+                (text, {"name": text.split()[0], "type": medicine_type})
+                for text, medicine_type in [
+                    ("PANADOL paracetamol GSK", "brand"),
+                    ("paracetamol paracetamol", "generic"),
+                    ("DOLO paracetamol Micro Labs", "brand"),
+                    ("ME24.A1 Haemorrhage of anus and rectum", "brand"),
+                ]
+            ),
+            exact_field="name",
+        )
+
+    def search(self, query, **kwargs):
+        return [document["name"] for document in self.index.search(query, 10, **kwargs)]
+
+    def test_every_word_is_matched_as_a_prefix(self):
+        self.assertEqual(self.search("dol para"), ["DOLO"])
+        self.assertEqual(self.search("haem rect"), ["ME24.A1"])
+        self.assertEqual(self.search("haem dolo"), [])
+
+    def test_disease_codes_are_a_single_token(self):
+        self.assertEqual(self.search("ME24.A"), ["ME24.A1"])
+
+    def test_exact_field_match_is_ranked_first(self):
+        self.assertEqual(self.search("paracetamol")[0], "paracetamol")
+
+    def test_where_filters_documents(self):
+        self.assertEqual(
+            self.search("para", where=lambda document: document["type"] == "brand"),
+            ["PANADOL", "DOLO"],
+        )
+
+    def test_empty_query_returns_documents_up_to_limit(self):
+        self.assertEqual(len(self.index.search("", 2)), 2)
@@ -0,0 +1,110 @@
+from django.test import override_settings
+from freezegun import freeze_time
+from rest_framework.test import APITestCase
+
+from care.facility.models import FacilityUser
+from care.utils.cache import cache_allowed_facilities
+from care.utils.cache.cache_allowed_facilities import (
+    get_accessible_facilities,
+    invalidate_user_facilities,
+)
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class UserFacilitiesCacheTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.other_facility = cls.create_facility(
+            cls.super_user, cls.district, cls.local_body
+        )
+        cls.user = cls.create_user("nurse", cls.district, home_facility=cls.facility)
+        cls.other_user = cls.create_user("other", cls.district)
+
+    def setUp(self):
+        cache_allowed_facilities._local_cache.clear()  # noqa: SLF001
+
+    @OverrideCache
+    def test_link_moved_to_another_user(self):
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+        self.assertEqual(get_accessible_facilities(self.other_user), [])
+
+        facility_user = FacilityUser.objects.get(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            facility_user.user = self.other_user
+            facility_user.save()
+
+        self.assertEqual(get_accessible_facilities(self.user), [])
+        self.assertEqual(get_accessible_facilities(self.other_user), [self.facility.id])
+
+    @OverrideCache
+    def test_facility_destroy(self):
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+
+        self.client.force_authenticate(self.super_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                f"/api/v1/facility/{self.facility.external_id}/"
+            )
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(get_accessible_facilities(self.user), [])
+
+    @OverrideCache
+    def test_m2m_changes(self):
+        self.assertEqual(get_accessible_facilities(self.other_user), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_facility.users.add(
+                self.other_user, through_defaults={"created_by": self.super_user}
+            )
+        self.assertEqual(
+            get_accessible_facilities(self.other_user), [self.other_facility.id]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_facility.users.clear()
+        self.assertEqual(get_accessible_facilities(self.other_user), [])
+
+    @OverrideCache
+    def test_generation_invalidates_every_user(self):
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+        # links changed without signals, as by a raw query
+        FacilityUser.objects.filter(user=self.user).update(facility=self.other_facility)
+        self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_user_facilities()
+        self.assertEqual(get_accessible_facilities(self.user), [self.other_facility.id])
+
+    @OverrideCache
+    @override_settings(USER_FACILITIES_LOCAL_CACHE_TIMEOUT=5)
+    def test_local_cache(self):
+        with freeze_time("2024-01-01 00:00:00") as frozen_time:
+            self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
+            FacilityUser.objects.filter(user=self.user).update(
+                facility=self.other_facility
+            )
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    get_accessible_facilities(self.user), [self.facility.id]
+                )
+
+            # changes made in this process are seen right away
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_user_facilities({self.user.id})
+            self.assertEqual(
+                get_accessible_facilities(self.user), [self.other_facility.id]
+            )
+
+            # changes made by other processes once the entry expires
+            FacilityUser.objects.filter(user=self.user).update(facility=self.facility)
+            cache_allowed_facilities.cache.clear()
+            self.assertEqual(
+                get_accessible_facilities(self.user), [self.other_facility.id]
+            )
+            frozen_time.tick(6)
+            self.assertEqual(get_accessible_facilities(self.user), [self.facility.id])
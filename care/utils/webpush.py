@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from pywebpush import WebPushException, webpush
+from requests.adapters import HTTPAdapter
+
+from care.users.models import User
+
+logger = logging.getLogger(__name__)
+
+# push services reply with these once the subscription has expired or the
+# user has unsubscribed, the subscription will never work again
+EXPIRED_SUBSCRIPTION_STATUSES = (404, 410)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+WEBPUSH_TIMEOUT = 10
+WEBPUSH_RETRY_BACKOFF = 0.5
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_webpush_session() -> requests.Session:
+    """
+    Returns the session shared by the web pushes of the process, so that
+    connections to the push services are reused.
+    """
+    global _session  # noqa: PLW0603
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_maxsize=settings.WEBPUSH_CONCURRENCY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_subscription_info(user: User) -> dict | None:
+    if user.pf_endpoint and user.pf_p256dh and user.pf_auth:
+        return {
+            "endpoint": user.pf_endpoint,
+            "keys": {"p256dh": user.pf_p256dh, "auth": user.pf_auth},
+        }
+    return None
+
+
+def deliver_webpush(subscription_info: dict, message: str) -> bool:
+    """
+    Sends the message to the subscription, retrying with backoff when the push
+    service is unavailable. Returns False if the subscription has expired.
+    """
+    for attempt in range(settings.WEBPUSH_RETRIES + 1):
+        if attempt:
+            time.sleep(WEBPUSH_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            webpush(
+                subscription_info=subscription_info,
+                data=message,
+                vapid_private_key=settings.VAPID_PRIVATE_KEY,
+                vapid_claims={
+                    "sub": "mailto:info@ohc.network",
+                },
+                timeout=WEBPUSH_TIMEOUT,
+                requests_session=get_webpush_session(),
+            )
+            return True
+        except WebPushException as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code in EXPIRED_SUBSCRIPTION_STATUSES:
+                return False
+            logger.info("Web Push Failed with Exception: %s", repr(e))
+            if status_code not in RETRY_STATUSES:
+                return True
+        except requests.RequestException as e:
+            logger.info("Error When Doing WebPush: %s", e)
+    return True
+
+
+def send_webpushes(pushes: list[tuple[User, str]]):
+    """
+    Sends the (user, message) web pushes concurrently, and removes the
+    subscriptions that have expired from the users.
+    """
+    pushes = [
+        (subscription_info, message)
+        for user, message in pushes
+        if (subscription_info := get_subscription_info(user))
+    ]
+    if not pushes:
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(settings.WEBPUSH_CONCURRENCY, len(pushes))
+    ) as executor:
+        delivered = list(executor.map(lambda push: deliver_webpush(*push), pushes))
+
+    expired_endpoints = {
+        subscription_info["endpoint"]
+        for (subscription_info, _), is_delivered in zip(pushes, delivered, strict=True)
+        if not is_delivered
+    }
+    if expired_endpoints:
+        User.objects.filter(pf_endpoint__in=expired_endpoints).update(
+            pf_endpoint=None, pf_p256dh=None, pf_auth=None
+        )
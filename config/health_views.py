@@ -1,7 +1,14 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from care.users.api.serializers.user import UserBaseMinimumSerializer
+from care.utils.assetintegration.session import get_middleware_latencies
+from care.utils.instrumentation import render_metrics
 from config.authentication import (
     MiddlewareAssetAuthentication,
     MiddlewareAuthentication,
@@ -20,3 +27,42 @@ class MiddlewareAssetAuthenticationVerifyView(APIView):
 
     def get(self, request):
         return Response(UserBaseMinimumSerializer(request.user).data)
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allows the requests bearing METRICS_TOKEN, denies every request while it
+    is not set.
+    """
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        return bool(token) and hmac.compare_digest(
+            request.headers.get("Authorization", "").encode(),
+            f"Bearer {token}".encode(),
+        )
+
+
+class MiddlewareLatencyView(APIView):
+    """
+    Latency of the requests made by every process to each middleware.
+    """
+
+    authentication_classes = ()
+    permission_classes = (HasMetricsToken,)
+
+    def get(self, request):
+        return Response(get_middleware_latencies())
+
+
+class MetricsView(APIView):
+    """
+    Request and middleware latency histograms and audit queue counters of
+    every process, in the Prometheus text format.
+    """
+
+    authentication_classes = ()
+    permission_classes = (HasMetricsToken,)
+
+    def get(self, request):
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
@@ -1,6 +1,17 @@
+import json
 import logging
+import random
 import time
 
+from django.conf import settings
+
+from care.utils.instrumentation import (
+    collect_request_metrics,
+    install_hooks,
+    observe_render,
+    observe_request,
+)
+
 
 class RequestTimeLoggingMiddleware:
     def __init__(self, get_response):
@@ -13,3 +24,67 @@ class RequestTimeLoggingMiddleware:
         duration = time.time() - request.start_time
         self.logger.info("Request to %s took %.4f seconds", request.path, duration)
         return response
+
+
+def get_view_name(request, view_func) -> str:
+    """
+    Returns the name the metrics of a view are recorded under, the viewset and
+    action for DRF views.
+    """
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    method = request.method.lower()
+    action = (getattr(view_func, "actions", None) or {}).get(method, method)
+    return f"{view_class.__name__}.{action}"
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Records the duration of the requests per view, and for a sample of them
+    the SQL queries, redis commands and middleware requests they made and the
+    time spent rendering the response. The histograms are exposed at /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.logger = logging.getLogger("request_instrumentation_middleware")
+        install_hooks()
+
+    def __call__(self, request):
+        started_at = time.perf_counter()
+        if random.random() < settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE:  # noqa: S311
+            with collect_request_metrics() as metrics:
+                response = self.get_response(request)
+        else:
+            metrics = None
+            response = self.get_response(request)
+        duration = time.perf_counter() - started_at
+
+        view = getattr(request, "instrumented_view", "unresolved")
+        observe_request(view, duration, metrics)
+        if metrics is not None and settings.REQUEST_INSTRUMENTATION_LOGGING:
+            self.logger.info(
+                json.dumps(
+                    {
+                        "view": view,
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "duration_seconds": duration,
+                        **metrics.as_dict(),
+                    }
+                )
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.instrumented_view = get_view_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        # called right before the response, DRF ones included, is rendered
+        started_at = time.perf_counter()
+        response.add_post_render_callback(
+            lambda _: observe_render(time.perf_counter() - started_at)
+        )
+        return response
@@ -88,6 +88,23 @@ CACHES = {
         },
     }
 }
+# how long the facilities linked to a user are cached for, the entries are
+# also invalidated as the links change
+USER_FACILITIES_CACHE_TIMEOUT = env.int(
+    "USER_FACILITIES_CACHE_TIMEOUT", default=60 * 60 * 24
+)
+# how long the facilities linked to a user are also kept in the memory of the
+# process, links changed by other processes are seen after at most as long,
+# 0 disables it
+USER_FACILITIES_LOCAL_CACHE_TIMEOUT = env.int(
+    "USER_FACILITIES_LOCAL_CACHE_TIMEOUT", default=0
+)
+# how long the event types are kept in the memory of the process, they are
+# invalidated as they change in the process, and event types changed by other
+# processes are seen after at most as long, 0 disables it
+EVENT_TYPES_LOCAL_CACHE_TIMEOUT = env.int(
+    "EVENT_TYPES_LOCAL_CACHE_TIMEOUT", default=60 * 5
+)
 
 # URLS
 # ------------------------------------------------------------------------------
@@ -201,6 +218,31 @@ MIDDLEWARE = [
 if env.bool("ENABLE_REQUEST_TIME_LOGGING", default=False):
     MIDDLEWARE.insert(0, "config.middlewares.RequestTimeLoggingMiddleware")
 
+# per view SQL, redis and middleware request metrics, exposed at /metrics
+ENABLE_REQUEST_INSTRUMENTATION = env.bool(
+    "ENABLE_REQUEST_INSTRUMENTATION", default=False
+)
+if ENABLE_REQUEST_INSTRUMENTATION:
+    MIDDLEWARE.insert(0, "config.middlewares.RequestInstrumentationMiddleware")
+# share of the requests whose queries, redis commands and middleware requests
+# are recorded, the duration of every request is
+REQUEST_INSTRUMENTATION_SAMPLE_RATE = env.float(
+    "REQUEST_INSTRUMENTATION_SAMPLE_RATE", default=0.1
+)
+# log the metrics of the sampled requests as JSON
+REQUEST_INSTRUMENTATION_LOGGING = env.bool(
+    "REQUEST_INSTRUMENTATION_LOGGING", default=False
+)
+# the metrics of every process are added up in this redis hash, pushed at
+# most every METRICS_PUSH_INTERVAL seconds at the end of requests and tasks
+METRICS_REDIS_KEY = env("METRICS_REDIS_KEY", default="care_metrics")
+METRICS_PUSH_INTERVAL = env.float("METRICS_PUSH_INTERVAL", default=10)
+# gauges of the processes that did not push them for this long are left out
+METRICS_GAUGE_TIMEOUT = env.int("METRICS_GAUGE_TIMEOUT", default=5 * 60)
+# bearer token of the scrapers of /metrics and /middleware/latency, they are
+# not served while it is not set
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
 # STATIC
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#static-files
@@ -348,6 +390,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "request_instrumentation_middleware": {
+            "handlers": ["time_logging"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
 }
@@ -461,6 +508,15 @@ HEALTHY_DJANGO = [
 # Audit logs
 # ------------------------------------------------------------------------------
 AUDIT_LOG_ENABLED = env.bool("AUDIT_LOG_ENABLED", default=False)
+# destination of the audit records, one of the sinks of care.audit_log.sinks:
+# the logger, a file at AUDIT_LOG_FILE, the database or memory
+AUDIT_LOG_SINK = env("AUDIT_LOG_SINK", default="care.audit_log.sinks.LoggerSink")
+AUDIT_LOG_FILE = env("AUDIT_LOG_FILE", default="audit.log")
+# the records are queued in process and written in batches by a background
+# thread every interval (0 disables it, leaving the flush at request end)
+AUDIT_LOG_QUEUE_SIZE = env.int("AUDIT_LOG_QUEUE_SIZE", default=10000)
+AUDIT_LOG_BATCH_SIZE = env.int("AUDIT_LOG_BATCH_SIZE", default=500)
+AUDIT_LOG_FLUSH_INTERVAL = env.float("AUDIT_LOG_FLUSH_INTERVAL", default=1.0)
 AUDIT_LOG = {
     "globals": {
         "exclude": {
@@ -528,6 +584,10 @@ VAPID_PUBLIC_KEY = env(
 VAPID_PRIVATE_KEY = env(
     "VAPID_PRIVATE_KEY", default="7mf3OFreFsgFF4jd8A71ZGdVaj8kpJdOto4cFbfAS-s"
 )
+# Number of web pushes of a notification sent concurrently
+WEBPUSH_CONCURRENCY = env.int("WEBPUSH_CONCURRENCY", 16)
+# Number of retries of web pushes the push service could not accept
+WEBPUSH_RETRIES = env.int("WEBPUSH_RETRIES", 2)
 SEND_SMS_NOTIFICATION = False
 
 # Cloud and Buckets
@@ -625,6 +685,8 @@ MIN_ENCOUNTER_DATE = env(
 
 # for exporting csv
 CSV_REQUEST_PARAMETER = "csv"
+# for exporting csv in the background, see CSVExportMixin
+CSV_ASYNC_REQUEST_PARAMETER = "async"
 
 # current hosted domain
 CURRENT_DOMAIN = env("CURRENT_DOMAIN", default="localhost:8000")
@@ -648,6 +710,41 @@ TASK_SUMMARIZE_PATIENT = env.bool("TASK_SUMMARIZE_PATIENT", default=True)
 TASK_SUMMARIZE_DISTRICT_PATIENT = env.bool(
     "TASK_SUMMARIZE_DISTRICT_PATIENT", default=True
 )
+# only recompute patient summaries of facilities and districts with changes
+# since the previous run, the first run of each day is always a full one
+TASK_SUMMARIZE_PATIENT_INCREMENTAL = env.bool(
+    "TASK_SUMMARIZE_PATIENT_INCREMENTAL", default=True
+)
+
+# store the vitals of the automated rounds posted by monitors in the narrow
+# AutomatedVitals table instead of DailyRound
+AUTOMATED_VITALS_COMPACT_STORAGE = env.bool(
+    "AUTOMATED_VITALS_COMPACT_STORAGE", default=False
+)
+# days after which the compactly stored vitals are rolled up into hourly
+# averages, and after which they are deleted (0 keeps them)
+AUTOMATED_VITALS_ROLLUP_AFTER_DAYS = env.int("AUTOMATED_VITALS_ROLLUP_AFTER_DAYS", 7)
+AUTOMATED_VITALS_RETENTION_DAYS = env.int("AUTOMATED_VITALS_RETENTION_DAYS", 0)
+
+# search backend of the ICD11 and Medibase autocomplete, "redis" (redisearch)
+# or "memory" (in-process index built from the database on first use)
+STATIC_DATA_SEARCH_BACKEND = env("STATIC_DATA_SEARCH_BACKEND", default="redis")
+
+# Maximum number of days of the date range of a patient CSV export
+PATIENT_CSV_EXPORT_LIMIT = env.int("PATIENT_CSV_EXPORT_LIMIT", 31)
 
 # Timeout for middleware request (in seconds)
 MIDDLEWARE_REQUEST_TIMEOUT = env.int("MIDDLEWARE_REQUEST_TIMEOUT", 20)
+# Timeout for connecting to a middleware (in seconds), kept short as a
+# middleware that cannot be reached is left to the circuit breaker
+MIDDLEWARE_CONNECT_TIMEOUT = env.int("MIDDLEWARE_CONNECT_TIMEOUT", 5)
+# Number of middlewares queried concurrently by the asset status monitor
+MIDDLEWARE_STATUS_CONCURRENCY = env.int("MIDDLEWARE_STATUS_CONCURRENCY", 16)
+# Seconds for which requests to a middleware that could not be reached fail
+# right away instead of waiting for another timeout
+MIDDLEWARE_CIRCUIT_BREAKER_TIMEOUT = env.int("MIDDLEWARE_CIRCUIT_BREAKER_TIMEOUT", 120)
+# Number of connections kept alive to each middleware
+MIDDLEWARE_POOL_SIZE = env.int("MIDDLEWARE_POOL_SIZE", 16)
+# Number of retries of middleware reads that got a gateway error, with
+# exponential backoff
+MIDDLEWARE_REQUEST_RETRIES = env.int("MIDDLEWARE_REQUEST_RETRIES", 2)
@@ -48,6 +48,15 @@ CACHES = {
 # for testing retelimit use override_settings decorator
 SILENCED_SYSTEM_CHECKS = ["django_ratelimit.E003", "django_ratelimit.W001"]
 
+# audit records are written at the end of the requests, not from a thread
+AUDIT_LOG_FLUSH_INTERVAL = 0
+
+# metrics pushed by the requests of the tests are kept apart
+METRICS_REDIS_KEY = "care_test_metrics"
+
+# event types are rolled back with the tests, the ones cached would outlive them
+EVENT_TYPES_LOCAL_CACHE_TIMEOUT = 0
+
 # https://whitenoise.evans.io/en/stable/django.html#whitenoise-makes-my-tests-run-slow
 WHITENOISE_AUTOREFRESH = True
 
@@ -21,8 +21,10 @@ from care.users.reset_password_views import (
 )
 from config import api_router
 from config.health_views import (
+    MetricsView,
     MiddlewareAssetAuthenticationVerifyView,
     MiddlewareAuthenticationVerifyView,
+    MiddlewareLatencyView,
 )
 
 from .auth_views import AnnotatedTokenVerifyView, TokenObtainPairView, TokenRefreshView
@@ -68,6 +70,8 @@ urlpatterns = [
     # Health check urls
     path("middleware/verify", MiddlewareAuthenticationVerifyView.as_view()),
     path("middleware/verify-asset", MiddlewareAssetAuthenticationVerifyView.as_view()),
+    path("middleware/latency", MiddlewareLatencyView.as_view()),
+    path("metrics", MetricsView.as_view()),
     path("health/", include("healthy_django.urls", namespace="healthy_django")),
     # OpenID Connect
     path(".well-known/jwks.json", PublicJWKsView.as_view(), name="jwks-json"),
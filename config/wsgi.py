@@ -18,6 +18,7 @@ import os
 import sys
 from pathlib import Path
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 # This allows easy placement of apps within the interior
@@ -34,6 +35,15 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 # file. This includes Django's development server, if the WSGI_APPLICATION
 # setting points here.
 application = get_wsgi_application()
+
+# build the in-process search indexes while the worker starts serving requests
+if settings.STATIC_DATA_SEARCH_BACKEND == "memory":
+    from care.facility.static_data.icd11 import icd11_search_index
+    from care.facility.static_data.medibase import medibase_search_index
+
+    icd11_search_index.warm()
+    medibase_search_index.warm()
+
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication  # noqa: ERA001
 # application = HelloWorldApplication(application)  # noqa: ERA001